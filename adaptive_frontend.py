@@ -0,0 +1,154 @@
+import time
+import numpy as np
+from latency import latency_tracker
+from config import (
+    ROI_TRACKING_ENABLED, ROI_MARGIN, ROI_MAX_SIDE, ROI_MIN_FRACTION,
+    MOTION_GATING_ENABLED, MOTION_THRESHOLD, MOTION_MAX_SKIP,
+)
+
+class AdaptiveFrontEnd:
+    """Cuts per-frame inference cost in front of GestureRecognizer.
+
+    Frames with no motion since the last inference are skipped and the last
+    result is reused. Otherwise only a downscaled crop around the last hand
+    is sent to MediaPipe, falling back to the full frame when the hand is lost.
+    Landmarks are mapped back to full-frame coordinates, so the gesture
+    rules and drawing code see the same values as without cropping.
+    """
+
+    def __init__(self, gesture_recognizer, roi_enabled=ROI_TRACKING_ENABLED, margin=ROI_MARGIN,
+                 max_side=ROI_MAX_SIDE, min_fraction=ROI_MIN_FRACTION, motion_enabled=MOTION_GATING_ENABLED,
+                 motion_threshold=MOTION_THRESHOLD, max_skip=MOTION_MAX_SKIP, motion_size=(64, 48),
+                 latency=latency_tracker):
+        self.gesture_recognizer = gesture_recognizer
+        self.latency = latency  # LatencyTracker for the convert/process/classify stages, or None
+        self.roi_enabled = roi_enabled
+        self.margin = margin  # Fraction of the hand box added on every side
+        self.max_side = max_side  # Longer side of a crop handed to MediaPipe, in pixels
+        self.min_fraction = min_fraction  # Smallest crop, as a fraction of the frame size
+        self.motion_enabled = motion_enabled
+        self.motion_threshold = motion_threshold  # Mean absolute grey-level change that counts as motion
+        self.max_skip = max_skip  # Force an inference after this many consecutive skips
+        self.motion_size = motion_size
+
+        self.roi = None  # (x0, y0, x1, y1) in pixels, or None for the full frame
+        self._reference = None  # Small grey frame from the last inference
+        self._motion_buffer = None
+        self._skipped_in_row = 0
+        self._last_result = (None, "NONE")
+        self.stats = {"frames": 0, "inferences": 0, "skipped": 0, "roi": 0, "full": 0, "lost": 0}
+
+    def reset(self):
+        self.roi = None
+        self._reference = None
+        self._skipped_in_row = 0
+        self._last_result = (None, "NONE")
+
+    def process(self, frame):
+        """Return (landmarks, gesture, inferred) for a BGR frame"""
+        self.stats["frames"] += 1
+
+        if self.motion_enabled and not self._has_motion(frame):
+            self.stats["skipped"] += 1
+            self._skipped_in_row += 1
+            return self._last_result + (False,)
+        self._skipped_in_row = 0
+
+        hand_landmarks = None
+        if self.roi_enabled and self.roi is not None:
+            self.stats["roi"] += 1
+            hand_landmarks = self._infer(frame, self.roi)
+            if hand_landmarks is None:
+                # Tracking lost; retry this frame at full size instead of dropping it
+                self.stats["lost"] += 1
+                self.roi = None
+
+        if hand_landmarks is None:
+            self.stats["full"] += 1
+            hand_landmarks = self._infer(frame, None)
+
+        gesture = "NONE"
+        if hand_landmarks is not None:
+            start = time.monotonic()
+            gesture = self.gesture_recognizer.determine_gesture(hand_landmarks)
+            if self.latency is not None:
+                self.latency.record_since("classify", start)
+            if self.roi_enabled:
+                self._update_roi(hand_landmarks, frame.shape)
+
+        self._last_result = (hand_landmarks, gesture)
+        return hand_landmarks, gesture, True
+
+    def summary(self):
+        stats = self.stats
+        saved = stats["skipped"] / stats["frames"] * 100 if stats["frames"] else 0.0
+        return (
+            f"{stats['frames']} frames, {stats['inferences']} inferences "
+            f"({stats['skipped']} skipped for no motion, {saved:.1f}% saved), "
+            f"{stats['roi']} ROI crops, {stats['full']} full frames, {stats['lost']} tracking losses"
+        )
+
+    def _has_motion(self, frame):
+        import cv2  # Imported on first use, on the inference thread, not at startup on the GUI thread
+
+        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self._motion_buffer = cv2.resize(grey, self.motion_size, dst=self._motion_buffer, interpolation=cv2.INTER_AREA)
+
+        if self._reference is None or self._skipped_in_row >= self.max_skip:
+            return True
+        # Compare against the frame of the last inference so slow drift still adds up
+        return cv2.norm(self._motion_buffer, self._reference, cv2.NORM_L1) / self._motion_buffer.size >= self.motion_threshold
+
+    def _infer(self, frame, roi):
+        import cv2
+
+        start = time.monotonic()
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = roi if roi is not None else (0, 0, width, height)
+        crop = frame[y0:y1, x0:x1]
+
+        crop_h, crop_w = crop.shape[:2]
+        scale = min(1.0, self.max_side / max(crop_h, crop_w))
+        if roi is not None and scale < 1.0:
+            crop = cv2.resize(crop, (int(crop_w * scale), int(crop_h * scale)), interpolation=cv2.INTER_AREA)
+
+        self.stats["inferences"] += 1
+        if self.motion_enabled:
+            self._reference = self._motion_buffer.copy()
+        rgb_crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        converted = time.monotonic()
+        results = self.gesture_recognizer.hands.process(rgb_crop)
+        if self.latency is not None:
+            self.latency.record_since("convert", start, converted)
+            self.latency.record_since("process", converted)
+        if not results.multi_hand_landmarks:
+            return None
+
+        hand_landmarks = results.multi_hand_landmarks[0]
+        if roi is not None:
+            # Map crop-normalized coordinates back onto the full frame
+            for landmark in hand_landmarks.landmark:
+                landmark.x = (landmark.x * crop_w + x0) / width
+                landmark.y = (landmark.y * crop_h + y0) / height
+                landmark.z = landmark.z * crop_w / width
+        return hand_landmarks
+
+    def _update_roi(self, hand_landmarks, shape):
+        height, width = shape[:2]
+        xs = np.fromiter((landmark.x for landmark in hand_landmarks.landmark), dtype=np.float64) * width
+        ys = np.fromiter((landmark.y for landmark in hand_landmarks.landmark), dtype=np.float64) * height
+        hx0, hx1, hy0, hy1 = xs.min(), xs.max(), ys.min(), ys.max()
+
+        # Keep the crop fixed while the hand stays inside it so MediaPipe's own tracking stays stable
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            inset_x, inset_y = (x1 - x0) * self.margin / 4, (y1 - y0) * self.margin / 4
+            if hx0 >= x0 + inset_x and hx1 <= x1 - inset_x and hy0 >= y0 + inset_y and hy1 <= y1 - inset_y:
+                return
+
+        center_x, center_y = (hx0 + hx1) / 2, (hy0 + hy1) / 2
+        half_w = max((hx1 - hx0) * (0.5 + self.margin), width * self.min_fraction / 2)
+        half_h = max((hy1 - hy0) * (0.5 + self.margin), height * self.min_fraction / 2)
+        x0, x1 = int(max(0, center_x - half_w)), int(min(width, center_x + half_w))
+        y0, y1 = int(max(0, center_y - half_h)), int(min(height, center_y + half_h))
+        self.roi = (x0, y0, x1, y1) if x1 > x0 and y1 > y0 else None
@@ -0,0 +1,63 @@
+import numpy as np
+from config import (
+    ANALOG_DEAD_ZONE, ANALOG_FULL_SCALE, ANALOG_MAX_HEADING_RATE, ANALOG_MAX_PITCH_RATE,
+    ANALOG_SMOOTHING, ANALOG_RECENTER_S,
+)
+
+PALM = [0, 5, 9, 13, 17]  # Wrist and finger bases; steadier than any fingertip
+WRIST, MIDDLE_MCP = 0, 9
+
+class AnalogViewControl:
+    """Maps how far the hand is from a neutral point to heading and pitch rates.
+
+    The neutral point is where the palm is when the hand appears, after
+    being gone for recenter_after seconds. Displacement is measured in hand
+    lengths (wrist to middle finger base), so the same movement works near
+    and far from the camera. The displacement is smoothed exponentially per
+    frame; inside the dead zone the rate is zero, and from there it rises
+    linearly to the maximum at full_scale. Smoothing the position rather
+    than the rate lets the view stop within a frame or two of the hand
+    coming back, and at once when the hand is lost.
+    """
+
+    def __init__(self, dead_zone=ANALOG_DEAD_ZONE, full_scale=ANALOG_FULL_SCALE,
+                 max_heading_rate=ANALOG_MAX_HEADING_RATE, max_pitch_rate=ANALOG_MAX_PITCH_RATE,
+                 smoothing=ANALOG_SMOOTHING, recenter_after=ANALOG_RECENTER_S):
+        self.dead_zone = dead_zone  # Hand lengths
+        self.full_scale = full_scale  # Hand lengths at which the rate reaches its maximum
+        self.max_rates = np.array([max_heading_rate, max_pitch_rate], dtype=np.float64)  # Degrees per second
+        self.smoothing = smoothing  # Share of a position change taken per frame
+        self.recenter_after = recenter_after
+        self.neutral = None
+        self.last_seen = None
+        self.offset = np.zeros(2)  # Smoothed displacement from neutral, in hand lengths
+        self.rates = np.zeros(2)  # (heading, pitch) in degrees per second
+
+    def reset(self):
+        self.neutral = None
+        self.last_seen = None
+        self.offset[:] = 0.0
+        self.rates[:] = 0.0
+
+    def update(self, points, timestamp):
+        """Feed one frame's (21, 3) landmarks, or None without a hand; returns (heading_rate, pitch_rate)"""
+        if points is None:
+            self.offset[:] = 0.0
+            self.rates[:] = 0.0
+            return 0.0, 0.0
+
+        palm = points[PALM, :2].mean(axis=0)
+        if self.neutral is None or timestamp - self.last_seen > self.recenter_after:
+            self.neutral = palm
+            self.offset[:] = 0.0
+        self.last_seen = timestamp
+
+        hand_length = max(float(np.hypot(*(points[MIDDLE_MCP, :2] - points[WRIST, :2]))), 1e-3)
+        displacement = (palm - self.neutral) / hand_length
+        self.offset += (displacement - self.offset) * self.smoothing
+
+        span = max(self.full_scale - self.dead_zone, 1e-6)
+        strength = np.clip((np.abs(self.offset) - self.dead_zone) / span, 0.0, 1.0)
+        # Image y grows downwards, so raising the hand (negative dy) pitches up
+        self.rates[:] = np.sign(self.offset) * strength * self.max_rates * (1.0, -1.0)
+        return float(self.rates[0]), float(self.rates[1])
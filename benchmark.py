@@ -0,0 +1,556 @@
+"""Performance benchmarks for the gesture kiosk.
+
+Run with Qt's offscreen platform so no display or webcam is needed:
+
+    QT_QPA_PLATFORM=offscreen python benchmark.py gui-frame
+    QT_QPA_PLATFORM=offscreen python benchmark.py gui-frame --session sessions/forward
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+def synthetic_frames(count, width=640, height=480, seed=0):
+    """Generate BGR frames that look like a noisy webcam feed"""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        # Shift the base image so consecutive frames differ like real motion
+        frames.append(np.roll(base, i * 4, axis=1))
+    return frames
+
+def summarize(name, samples_ms):
+    samples = np.asarray(samples_ms)
+    print(
+        f"{name:<28} mean {samples.mean():7.2f} ms  "
+        f"p50 {np.percentile(samples, 50):7.2f} ms  "
+        f"p95 {np.percentile(samples, 95):7.2f} ms  "
+        f"max {samples.max():7.2f} ms"
+    )
+
+def legacy_update_camera_feed(gesture_view, gesture_recognizer, frame):
+    """The GUI-thread callback as it was before inference moved to a worker"""
+    import cv2
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage, QPixmap
+
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    height, width, channel = rgb_frame.shape
+    bytes_per_line = 3 * width
+    processed_frame = rgb_frame.copy()
+
+    results = gesture_recognizer.hands.process(rgb_frame)
+    if results.multi_hand_landmarks:
+        for hand_landmarks in results.multi_hand_landmarks:
+            gesture_recognizer.draw(processed_frame, hand_landmarks)
+            gesture_recognizer.determine_gesture(hand_landmarks)
+
+    processed_q_image = QImage(processed_frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
+    processed_pixmap = QPixmap.fromImage(processed_q_image)
+    gesture_view.setPixmap(processed_pixmap.scaled(240, 180, Qt.KeepAspectRatio, Qt.FastTransformation))
+    return results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+
+def bench_gui_frame(args):
+    """Compare GUI-thread time per frame before and after the inference worker"""
+    from PyQt5.QtWidgets import QApplication, QLabel
+    from gesture_recognizer import GestureRecognizer
+    from preview import PreviewRenderer
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    gesture_view = QLabel()
+    gesture_view.setFixedSize(320, 240)
+    gesture_recognizer = GestureRecognizer()
+    if args.session:
+        # A recorded session has a real hand in frame, so landmark inference and drawing are timed too
+        from recording import Recording
+        recording = Recording(args.session)
+        frames = [np.array(recording.frames[i]) for i in range(min(args.frames, len(recording)))]
+        source = f"frames of {args.session}"
+    else:
+        frames = synthetic_frames(args.frames, args.width, args.height)
+        source = "synthetic frames"
+
+    before = []
+    landmarks = []
+    for frame in frames:
+        start = time.perf_counter()
+        landmarks.append(legacy_update_camera_feed(gesture_view, gesture_recognizer, frame))
+        before.append((time.perf_counter() - start) * 1000)
+
+    # Inference happens on the worker thread; the GUI thread only renders the preview and its landmarks
+    renderer = PreviewRenderer(gesture_view, (240, 180), gesture_recognizer)
+    after = []
+    for frame, hand_landmarks in zip(frames, landmarks):
+        start = time.perf_counter()
+        renderer.render(frame, hand_landmarks)
+        after.append((time.perf_counter() - start) * 1000)
+
+    height, width = frames[0].shape[:2]
+    hands = sum(hand_landmarks is not None for hand_landmarks in landmarks)
+    print(f"GUI-thread frame time over {len(frames)} {source} of {width}x{height}, hand found in {hands}")
+    if not hands:
+        print("No hand in any frame: MediaPipe only ran palm detection, so 'before' understates inline "
+              "inference; pass --session with a recording (replay.py record) for the full path")
+    summarize("before (inline inference)", before)
+    summarize("after (preview only)", after)
+    app.processEvents()
+
+def worker_preview_paint(gesture_view, frame):
+    """Preview path before PreviewRenderer: full-size convert on the worker, scale on the GUI thread"""
+    import cv2
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtGui import QImage, QPixmap
+
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    height, width, channel = rgb_frame.shape
+    q_image = QImage(rgb_frame.data, width, height, 3 * width, QImage.Format_RGB888)
+    gesture_view.setPixmap(QPixmap.fromImage(q_image).scaled(240, 180, Qt.KeepAspectRatio, Qt.FastTransformation))
+
+def measure_frames(render, frames):
+    """Time each call and record the bytes Python allocated transiently while it ran"""
+    import tracemalloc
+
+    times, allocated = [], []
+    tracemalloc.start()
+    for frame in frames:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        render(frame)
+        times.append((time.perf_counter() - start) * 1000)
+        allocated.append(tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+    return times, allocated
+
+def bench_preview(args):
+    """Compare per-frame time and allocations of the old and new preview paths"""
+    from PyQt5.QtWidgets import QApplication, QLabel
+    from preview import PreviewRenderer
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    gesture_view = QLabel()
+    gesture_view.setFixedSize(320, 240)
+    frames = synthetic_frames(args.frames, args.width, args.height)
+    renderer = PreviewRenderer(gesture_view, (240, 180))
+    renderer.render(frames[0])  # Buffers are allocated once, on the first frame
+
+    old_times, old_bytes = measure_frames(lambda frame: worker_preview_paint(gesture_view, frame), frames)
+    new_times, new_bytes = measure_frames(renderer.render, frames)
+
+    print(f"Preview rendering over {args.frames} synthetic frames of {args.width}x{args.height}")
+    summarize("before (full-size convert)", old_times)
+    summarize("after (PreviewRenderer)", new_times)
+    print(f"{'python bytes/frame before':<28} {np.mean(old_bytes):10.0f}")
+    print(f"{'python bytes/frame after':<28} {np.mean(new_bytes):10.0f}")
+    app.processEvents()
+
+def bench_pool(args):
+    """Compare in-process inference with the shared-memory process pool across cameras"""
+    import cv2
+    from gesture_recognizer import GestureRecognizer
+    from inference_pool import InferencePool
+
+    frames = synthetic_frames(args.frames, args.width, args.height)
+
+    # Baseline: one Hands model per camera, all in this process
+    recognizers = [GestureRecognizer() for _ in range(args.cameras)]
+    start = time.perf_counter()
+    for frame in frames:
+        for gesture_recognizer in recognizers:
+            gesture_recognizer.infer(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    single_s = time.perf_counter() - start
+
+    with InferencePool(frames[0].shape, cameras=args.cameras, workers=args.workers) as pool:
+        # Warm up every camera's model before timing
+        for camera_id in range(args.cameras):
+            pool.submit(camera_id, -1, frames[0])
+        while pool.stats["completed"] < pool.stats["submitted"]:
+            pool.get_result(timeout=30)
+        pool.stats.update(submitted=0, dropped=0, completed=0, stale=0)
+
+        latencies = []
+        start = time.perf_counter()
+        for seq, frame in enumerate(frames):
+            for camera_id in range(args.cameras):
+                while not pool.free_slots(camera_id):
+                    result = pool.get_result(timeout=5)
+                    if result is not None:
+                        latencies.append((time.monotonic() - result["timestamp"]) * 1000)
+                pool.submit(camera_id, seq, frame)
+        while pool.stats["completed"] < pool.stats["submitted"]:
+            result = pool.get_result(timeout=5)
+            if result is not None:
+                latencies.append((time.monotonic() - result["timestamp"]) * 1000)
+        pool_s = time.perf_counter() - start
+        workers, stats = pool.workers, dict(pool.stats)
+
+    total = args.frames * args.cameras
+    print(f"{total} frames ({args.cameras} cameras x {args.frames}) of {args.width}x{args.height}, {os.cpu_count()} cores")
+    print(f"in-process          {total / single_s:7.1f} fps")
+    print(f"pool ({workers} workers)    {total / pool_s:7.1f} fps  ({single_s / pool_s:.2f}x)")
+    summarize("pool submit-to-result", latencies)
+    print(f"pool stats: {stats}")
+
+def synthetic_hands(count, seed=0):
+    """Random (N, 21, 3) landmark sets spread around plausible hand poses"""
+    rng = np.random.default_rng(seed)
+    wrist = rng.uniform(0.3, 0.7, (count, 1, 3))
+    return wrist + rng.normal(0.0, 0.15, (count, 21, 3))
+
+def legacy_determine_gesture(points, threshold):
+    """Scalar rule chain as it was before vectorization, for agreement checks"""
+    wrist, thumb_tip = points[0], points[4]
+    index_tip, middle_tip, ring_tip, pinky_tip = points[8], points[12], points[16], points[20]
+    index_base, middle_base, ring_base, pinky_base = points[5], points[9], points[13], points[17]
+
+    index_extended = index_tip[1] < index_base[1] - threshold * 0.8
+    middle_extended = middle_tip[1] < middle_base[1] - threshold * 0.8
+    ring_extended = ring_tip[1] < ring_base[1] - threshold * 0.8
+    pinky_extended = pinky_tip[1] < pinky_base[1] - threshold * 0.8
+    any_extended = any([index_extended, middle_extended, ring_extended, pinky_extended])
+
+    if index_extended and middle_extended and not ring_extended and not pinky_extended:
+        if index_tip[1] < wrist[1] - threshold * 0.8:
+            return "FORWARD"
+    if index_tip[1] > index_base[1] + threshold * 0.8 and middle_tip[1] > middle_base[1] + threshold * 0.8:
+        if not ring_extended and not pinky_extended:
+            if abs(index_tip[1] - middle_tip[1]) < threshold:
+                return "BACKWARD"
+    if thumb_tip[1] < wrist[1] - threshold and not any_extended:
+        return "UP"
+    if thumb_tip[1] > wrist[1] + threshold and not any_extended:
+        return "DOWN"
+    if thumb_tip[0] < wrist[0] - threshold and not any_extended:
+        return "LEFT"
+    if thumb_tip[0] > wrist[0] + threshold and not any_extended:
+        return "RIGHT"
+    return "NONE"
+
+class _Landmark:
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+class _HandLandmarks:
+    """Mimics the MediaPipe NormalizedLandmarkList that determine_gesture reads"""
+    def __init__(self, points):
+        self.landmark = [_Landmark(*point) for point in points.tolist()]
+
+def bench_classify(args):
+    """Compare determine_gesture in a loop against one classify_batch call"""
+    from gesture_recognizer import GestureRecognizer
+    from gesture_classifier import RuleClassifier
+
+    # The rules explicitly, even when config.py names a trained model, since they are compared against the scalar rules
+    gesture_recognizer = GestureRecognizer(classifier=RuleClassifier(args.threshold), load_model=False)
+    points = synthetic_hands(args.hands)
+    hands = [_HandLandmarks(p) for p in points]
+
+    start = time.perf_counter()
+    looped = [gesture_recognizer.determine_gesture(hand) for hand in hands]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = gesture_recognizer.classify_batch(points)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_determine_gesture(p, args.threshold) for p in points]
+    legacy_s = time.perf_counter() - start
+    agree = np.mean(np.asarray(legacy) == batched) * 100
+    assert list(batched) == looped
+
+    labels, counts = np.unique(batched, return_counts=True)
+    print(f"Classified {args.hands} hands at threshold {args.threshold}")
+    print(f"determine_gesture loop  {loop_s * 1000:9.2f} ms  ({loop_s / args.hands * 1e6:.2f} us/hand)")
+    print(f"classify_batch          {batch_s * 1000:9.2f} ms  ({batch_s / args.hands * 1e6:.3f} us/hand)")
+    print(f"scalar rules on arrays  {legacy_s * 1000:9.2f} ms  ({legacy_s / args.hands * 1e6:.2f} us/hand)")
+    print(f"speedup                 {loop_s / batch_s:9.1f}x")
+    print(f"agreement with scalar rules: {agree:.2f}%")
+    print("labels: " + ", ".join(f"{label}={count}" for label, count in zip(labels, counts)))
+
+def labelled_hands(count, seed=0):
+    """Synthetic hands around one template pose per gesture, rescaled and tilted like different users"""
+    from gesture_features import GESTURES, classify_batch
+
+    rng = np.random.default_rng(seed)
+    # Template per gesture: the mean of random hands the rules give that label
+    pool = synthetic_hands(50000, seed)
+    pool_labels = classify_batch(pool, 0.1)
+    names = GESTURES[1:]
+    templates = np.stack([pool[pool_labels == name].mean(axis=0) for name in names])
+    templates -= templates[:, :1]
+
+    labels = names[rng.integers(0, len(names), count)]
+    points = templates[np.argmax(labels[:, np.newaxis] == names[np.newaxis, :], axis=1)]
+    points = points * 2.0 + rng.normal(0.0, 0.01, points.shape)
+
+    angle = rng.normal(0.0, 0.15, count)
+    rotation = np.zeros((count, 3, 3))
+    rotation[:, 0, 0] = rotation[:, 1, 1] = np.cos(angle)
+    rotation[:, 0, 1], rotation[:, 1, 0] = -np.sin(angle), np.sin(angle)
+    rotation[:, 2, 2] = 1.0
+    scale = rng.uniform(0.4, 1.6, (count, 1, 1))
+    return points @ rotation.transpose(0, 2, 1) * scale + rng.uniform(0.3, 0.7, (count, 1, 3)), labels
+
+def bench_classifier(args):
+    """Per-frame predict cost and accuracy of the rules against a trained nearest-centroid model"""
+    from gesture_classifier import NearestCentroidClassifier, RuleClassifier
+
+    points, labels = labelled_hands(args.hands)
+    split = len(points) * 4 // 5
+    classifiers = {
+        "rules": RuleClassifier(args.threshold),
+        "nearest-centroid": NearestCentroidClassifier().fit(points[:split], labels[:split]),
+    }
+    test = points[split:]
+    print(f"{split} training hands, {len(test)} test hands (scaled 0.4-1.6x, tilted ~9 deg)")
+    for name, classifier in classifiers.items():
+        samples = []
+        for hand in test[:args.frames]:
+            start = time.perf_counter()
+            classifier.predict(hand)
+            samples.append((time.perf_counter() - start) * 1e6)
+        start = time.perf_counter()
+        predicted = classifier.predict_batch(test)
+        batch_us = (time.perf_counter() - start) / len(test) * 1e6
+        accuracy = np.mean(predicted == labels[split:]) * 100
+        samples = np.asarray(samples)
+        print(f"{name:<18} predict p50 {np.percentile(samples, 50):6.1f} us  p95 {np.percentile(samples, 95):6.1f} us  "
+              f"batch {batch_us:6.3f} us/hand  accuracy {accuracy:6.2f}%")
+
+# Navigation scripts StreetView formatted and sent for every gesture before the nav controller
+LEGACY_WALK_SCRIPT = """
+if (panorama) {
+    let position = panorama.getPosition();
+    let pov = panorama.getPov();
+    let heading = pov.heading;
+
+    // Calculate new position ~10 meters forward in current heading direction
+    let latLng = google.maps.geometry.spherical.computeOffset(
+        position,
+        10,  // meters
+        HEADING
+    );
+
+    // Create a Street View Service
+    let sv = new google.maps.StreetViewService();
+
+    // Find nearest panorama
+    sv.getPanorama({
+        location: latLng,
+        radius: 50,
+        preference: google.maps.StreetViewPreference.NEAREST
+    }, function(data, status) {
+        if (status === 'OK') {
+            panorama.setPosition(data.location.latLng);
+        }
+    });
+}
+"""
+
+LEGACY_TURN_SCRIPT = """
+if (panorama) {
+    let pov = panorama.getPov();
+    let targetHeading = (pov.heading + HEADING_DELTA + 360) % 360;
+    let targetPitch = Math.max(Math.min(pov.pitch + PITCH_DELTA, 90), -90);
+
+    // Animate the transition
+    let steps = 10;  // Number of animation steps
+    let headingStep = ((targetHeading - pov.heading + 180) % 360 - 180) / steps;
+    let pitchStep = (targetPitch - pov.pitch) / steps;
+    let currentStep = 0;
+
+    function animate() {
+        if (currentStep < steps) {
+            pov.heading = (pov.heading + headingStep + 360) % 360;
+            pov.pitch += pitchStep;
+            panorama.setPov({
+                heading: pov.heading,
+                pitch: pov.pitch
+            });
+            currentStep++;
+            requestAnimationFrame(animate);
+        }
+    }
+
+    animate();
+}
+"""
+
+def legacy_route_step_script(route, index, towards):
+    lat, lng = route[index]
+    next_lat, next_lng = route[towards]
+    return f"""
+    if (panorama) {{
+        let point = new google.maps.LatLng({lat}, {lng});
+        let nextPoint = null;
+
+        // Calculate heading towards next point if available
+        if ({towards} < {len(route)}) {{
+            let nextLat = {next_lat};
+            let nextLng = {next_lng};
+            nextPoint = new google.maps.LatLng(nextLat, nextLng);
+        }}
+
+        // Get current heading for smooth transition
+        let currentPov = panorama.getPov();
+        let newHeading = currentPov.heading;
+
+        if (nextPoint) {{
+            newHeading = google.maps.geometry.spherical.computeHeading(point, nextPoint);
+        }}
+
+        panorama.setPosition(point);
+        panorama.setPov({{
+            heading: newHeading,
+            pitch: currentPov.pitch
+        }});
+    }}
+    """
+
+def legacy_navigation_script(gesture, route, index):
+    """The script the old StreetView.move_* methods built for one gesture"""
+    if gesture in ("FORWARD", "BACKWARD") and route is not None:
+        return legacy_route_step_script(route, index, index + 1 if gesture == "FORWARD" else index - 1)
+    if gesture in ("FORWARD", "BACKWARD"):
+        return LEGACY_WALK_SCRIPT.replace("HEADING", "heading" if gesture == "FORWARD" else "(heading + 180) % 360")
+    deltas = {"UP": (0, 10), "DOWN": (0, -10), "LEFT": (-10, 0), "RIGHT": (10, 0)}[gesture]
+    return LEGACY_TURN_SCRIPT.replace("HEADING_DELTA", str(deltas[0])).replace("PITCH_DELTA", str(deltas[1]))
+
+def navigation_command(gesture, route, index):
+    """The nav controller call StreetView sends for one gesture"""
+    if gesture in ("FORWARD", "BACKWARD") and route is not None:
+        lat, lng = route.position(index)
+        return f"nav.goTo({lat:.7f}, {lng:.7f}, {route.heading(index, gesture == 'BACKWARD'):.2f})"
+    return {
+        "FORWARD": "nav.walk(1)", "BACKWARD": "nav.walk(-1)",
+        "UP": "nav.pitch(10)", "DOWN": "nav.pitch(-10)",
+        "LEFT": "nav.rotate(-10)", "RIGHT": "nav.rotate(10)",
+    }[gesture]
+
+# Just enough of google.maps for the navigation scripts to run without network access
+FAKE_MAPS_JS = """
+const google = {maps: {
+    LatLng: function(lat, lng) { this.lat = () => lat; this.lng = () => lng; },
+    StreetViewService: function() {
+        this.getPanorama = (request, callback) => callback({location: {latLng: request.location}}, 'OK');
+    },
+    StreetViewPreference: {NEAREST: 'nearest'},
+    geometry: {spherical: {
+        computeOffset: (from, meters, heading) => from,
+        computeHeading: (from, to) => 90
+    }}
+}};
+const panorama = {
+    pov: {heading: 0, pitch: 0},
+    position: new google.maps.LatLng(40.91439, -73.12453),
+    getPov: function() { return {heading: this.pov.heading, pitch: this.pov.pitch}; },
+    setPov: function(pov) { this.pov = pov; },
+    getPosition: function() { return this.position; },
+    setPosition: function(position) { this.position = position; }
+};
+const streetViewService = new google.maps.StreetViewService();
+"""
+
+def time_page_scripts(page, scripts):
+    """Run scripts one at a time and time each until its result callback arrives"""
+    from PyQt5.QtCore import QEventLoop
+
+    loop = QEventLoop()
+    samples = []
+    for script in scripts:
+        start = time.perf_counter()
+        page.runJavaScript(script, lambda result: (samples.append((time.perf_counter() - start) * 1000), loop.quit()))
+        loop.exec_()
+    return samples
+
+def bench_dispatch(args):
+    """Compare per-gesture navigation dispatch: generated scripts against nav controller calls"""
+    gestures = ["FORWARD", "BACKWARD", "UP", "DOWN", "LEFT", "RIGHT"]
+    from route import Route
+
+    points = [(40.91439 + i * 1e-4, -73.12453 + i * 1e-4) for i in range(args.route_points)]
+    routes = {"before": points, "after": Route(points)}
+    plan = [(gestures[i % len(gestures)], i % 2 == 1, 1 + i % (len(points) - 2)) for i in range(args.gestures)]
+
+    results = {}
+    for name, build in (("before", legacy_navigation_script), ("after", navigation_command)):
+        route = routes[name]
+        start = time.perf_counter()
+        scripts = [build(gesture, route if on_route else None, index) for gesture, on_route, index in plan]
+        format_us = (time.perf_counter() - start) / len(plan) * 1e6
+        results[name] = (scripts, format_us)
+        print(f"{name:<7} script {np.mean([len(s) for s in scripts]):7.0f} bytes/gesture, "
+              f"built in {format_us:6.2f} us")
+
+    try:
+        from PyQt5.QtCore import QEventLoop
+        from PyQt5.QtWebEngineWidgets import QWebEnginePage
+        from PyQt5.QtWidgets import QApplication
+        from street_view import NAV_CONTROLLER_JS
+    except ImportError as e:
+        print(f"QtWebEngine unavailable ({e}); skipping in-page timings")
+        return
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    page = QWebEnginePage()
+    loop = QEventLoop()
+    page.loadFinished.connect(loop.quit)
+    page.setHtml(f"<html><body><script>{FAKE_MAPS_JS}</script><script>{NAV_CONTROLLER_JS}</script></body></html>")
+    loop.exec_()
+
+    for name, (scripts, _) in results.items():
+        time_page_scripts(page, scripts[:20])  # Warm up
+        summarize(f"runJavaScript {name}", time_page_scripts(page, scripts))
+    app.processEvents()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    gui_frame = subparsers.add_parser("gui-frame", help=bench_gui_frame.__doc__)
+    gui_frame.add_argument("--frames", type=int, default=200)
+    gui_frame.add_argument("--width", type=int, default=640)
+    gui_frame.add_argument("--height", type=int, default=480)
+    gui_frame.add_argument("--session", help="Recorded session (replay.py record) to use instead of synthetic frames")
+    gui_frame.set_defaults(func=bench_gui_frame)
+
+    preview = subparsers.add_parser("preview", help=bench_preview.__doc__)
+    preview.add_argument("--frames", type=int, default=300)
+    preview.add_argument("--width", type=int, default=640)
+    preview.add_argument("--height", type=int, default=480)
+    preview.set_defaults(func=bench_preview)
+
+    pool = subparsers.add_parser("pool", help=bench_pool.__doc__)
+    pool.add_argument("--cameras", type=int, default=2)
+    pool.add_argument("--workers", type=int, default=None)
+    pool.add_argument("--frames", type=int, default=100)
+    pool.add_argument("--width", type=int, default=640)
+    pool.add_argument("--height", type=int, default=480)
+    pool.set_defaults(func=bench_pool)
+
+    classify = subparsers.add_parser("classify", help=bench_classify.__doc__)
+    classify.add_argument("--hands", type=int, default=100000)
+    classify.add_argument("--threshold", type=float, default=0.1)
+    classify.set_defaults(func=bench_classify)
+
+    classifier = subparsers.add_parser("classifier", help=bench_classifier.__doc__)
+    classifier.add_argument("--hands", type=int, default=20000)
+    classifier.add_argument("--frames", type=int, default=2000)
+    classifier.add_argument("--threshold", type=float, default=0.1)
+    classifier.set_defaults(func=bench_classifier)
+
+    dispatch = subparsers.add_parser("dispatch", help=bench_dispatch.__doc__)
+    dispatch.add_argument("--gestures", type=int, default=600)
+    dispatch.add_argument("--route-points", type=int, default=200)
+    dispatch.set_defaults(func=bench_dispatch)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
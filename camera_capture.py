@@ -0,0 +1,198 @@
+"""Open the camera with a capture profile and probe what each profile really delivers.
+
+    python camera_capture.py                       # Probe every profile in config.py
+    python camera_capture.py --profile low_latency --profile driver_default --seconds 10 --json
+
+Set CAPTURE_PROFILE in config.py to the profile with the best delivered fps
+and the least buffered lag on the kiosk's camera.
+"""
+import argparse
+import json
+import sys
+import time
+import cv2
+import numpy as np
+from config import CAMERA_INDEX, CAPTURE_PROFILE, CAPTURE_PROFILES
+
+BACKENDS = {
+    "any": cv2.CAP_ANY,
+    "v4l2": cv2.CAP_V4L2,
+    "dshow": cv2.CAP_DSHOW,
+    "msmf": cv2.CAP_MSMF,
+    "avfoundation": cv2.CAP_AVFOUNDATION,
+    "gstreamer": cv2.CAP_GSTREAMER,
+    "ffmpeg": cv2.CAP_FFMPEG,
+}
+
+def fourcc_to_str(value):
+    value = int(value)
+    if value <= 0:
+        return None
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
+def negotiated_settings(cap):
+    """What the device and backend actually agreed to, read back from the capture"""
+    return {
+        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": cap.get(cv2.CAP_PROP_FPS),
+        "fourcc": fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC)),
+        "buffer_size": int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+        "backend": cap.getBackendName(),
+    }
+
+def mismatches(profile, negotiated):
+    """Profile settings the device didn't honour, as readable messages"""
+    problems = []
+    for key in ("width", "height", "fourcc", "buffer_size"):
+        value = negotiated.get(key)
+        if key in profile and value is not None and value not in (0, -1) and value != profile[key]:
+            problems.append(f"{key} {profile[key]} requested, got {negotiated[key]}")
+    if "fps" in profile and negotiated["fps"] and abs(negotiated["fps"] - profile["fps"]) > 0.5:
+        problems.append(f"fps {profile['fps']} requested, got {negotiated['fps']:g}")
+    if "buffer_size" in profile and negotiated["buffer_size"] <= 0:
+        problems.append("buffer_size not supported by this backend")
+    return problems
+
+def open_capture(profile, index=CAMERA_INDEX):
+    """Open a camera with a profile dict from CAPTURE_PROFILES.
+
+    Returns (cap, negotiated, problems); cap is None if the camera could not
+    be opened. The FOURCC is set before the size because V4L2 picks the
+    sizes on offer per pixel format.
+    """
+    backend = profile.get("backend", "any")
+    if backend not in BACKENDS:
+        return None, {}, [f"unknown backend {backend!r}, expected one of {sorted(BACKENDS)}"]
+    cap = cv2.VideoCapture(index, BACKENDS[backend])
+    if not cap.isOpened():
+        return None, {}, [f"camera {index} could not be opened with backend {backend}"]
+
+    if "fourcc" in profile:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile["fourcc"]))
+    if "width" in profile:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile["width"])
+    if "height" in profile:
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile["height"])
+    if "fps" in profile:
+        cap.set(cv2.CAP_PROP_FPS, profile["fps"])
+    if "buffer_size" in profile:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, profile["buffer_size"])
+
+    negotiated = negotiated_settings(cap)
+    return cap, negotiated, mismatches(profile, negotiated)
+
+def probe(profile, index=CAMERA_INDEX, seconds=5.0, warmup=1.0, stall_ms=250.0):
+    """Measure one profile: delivered fps, read blocking time and frames buffered behind the newest one.
+
+    Buffered lag is found by stalling for stall_ms, as a busy consumer
+    would, and then counting reads that return at once: those frames were
+    already waiting in the driver or backend queue, and each one is a frame
+    period of latency a reader pays before it sees the live image.
+    """
+    cap, negotiated, problems = open_capture(profile, index)
+    if cap is None:
+        return {"opened": False, "problems": problems}
+    try:
+        shape = None
+        end = time.monotonic() + warmup
+        while time.monotonic() < end:
+            ret, frame = cap.read()
+            if ret:
+                shape = frame.shape
+
+        read_ms, arrivals, age_ms = [], [], []
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            start = time.monotonic()
+            ret, frame = cap.read()
+            done = time.monotonic()
+            if not ret:
+                continue
+            read_ms.append((done - start) * 1000)
+            arrivals.append(done)
+            # Backends that stamp frames with the monotonic clock (V4L2) give the true capture-to-read age
+            stamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            age = done * 1000 - stamp_ms
+            if stamp_ms > 0 and 0 <= age < 2000:
+                age_ms.append(age)
+
+        intervals = np.diff(arrivals) * 1000 if len(arrivals) > 1 else np.empty(0)
+        fps = (len(arrivals) - 1) / (arrivals[-1] - arrivals[0]) if len(arrivals) > 1 else 0.0
+        frame_ms = 1000 / fps if fps else None
+
+        buffered = []
+        for _ in range(3):
+            time.sleep(stall_ms / 1000)
+            stale = 0
+            while stale < 16:
+                start = time.monotonic()
+                ret, _ = cap.read()
+                if not ret or frame_ms is None or (time.monotonic() - start) * 1000 > frame_ms / 3:
+                    break
+                stale += 1
+            buffered.append(stale)
+    finally:
+        cap.release()
+
+    if shape is not None and (shape[1], shape[0]) != (negotiated["width"], negotiated["height"]):
+        problems.append(f"frames are {shape[1]}x{shape[0]}, not the negotiated {negotiated['width']}x{negotiated['height']}")
+    stale_frames = int(np.median(buffered)) if buffered else None
+    return {
+        "opened": True,
+        "negotiated": negotiated,
+        "problems": problems,
+        "frames": len(arrivals),
+        "delivered_fps": fps,
+        "interval_p95_ms": float(np.percentile(intervals, 95)) if len(intervals) else None,
+        "read_p50_ms": float(np.percentile(read_ms, 50)) if read_ms else None,
+        "read_p95_ms": float(np.percentile(read_ms, 95)) if read_ms else None,
+        "capture_to_read_p50_ms": float(np.percentile(age_ms, 50)) if age_ms else None,
+        "capture_to_read_p95_ms": float(np.percentile(age_ms, 95)) if age_ms else None,
+        "stale_frames_after_stall": stale_frames,
+        "buffered_lag_ms": stale_frames * frame_ms if stale_frames is not None and frame_ms else None,
+    }
+
+def print_probe(name, result):
+    print(f"{name}:")
+    if not result["opened"]:
+        print(f"  not opened: {'; '.join(result['problems'])}")
+        return
+    n = result["negotiated"]
+    print(f"  negotiated {n['width']}x{n['height']} {n['fourcc']} at {n['fps']:g} fps, "
+          f"buffer {n['buffer_size']}, backend {n['backend']}")
+    for problem in result["problems"]:
+        print(f"  ! {problem}")
+    print(f"  delivered {result['delivered_fps']:.1f} fps over {result['frames']} frames, "
+          f"interval p95 {result['interval_p95_ms'] or 0:.1f} ms")
+    print(f"  read() p50 {result['read_p50_ms'] or 0:.1f} ms, p95 {result['read_p95_ms'] or 0:.1f} ms")
+    if result["capture_to_read_p50_ms"] is not None:
+        print(f"  capture to read p50 {result['capture_to_read_p50_ms']:.1f} ms, "
+              f"p95 {result['capture_to_read_p95_ms']:.1f} ms")
+    if result["buffered_lag_ms"] is not None:
+        print(f"  {result['stale_frames_after_stall']} stale frames after a stall, "
+              f"about {result['buffered_lag_ms']:.0f} ms of buffered lag")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", action="append", choices=sorted(CAPTURE_PROFILES),
+                        help="Profile to probe; repeatable, default all")
+    parser.add_argument("--camera", type=int, default=CAMERA_INDEX)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Measurement time per profile")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Reads discarded while exposure settles")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.profile or CAPTURE_PROFILES:
+        results[name] = probe(CAPTURE_PROFILES[name], args.camera, args.seconds, args.warmup)
+        if not args.json:
+            marker = " (CAPTURE_PROFILE)" if name == CAPTURE_PROFILE else ""
+            print_probe(name + marker, results[name])
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return 0 if any(result["opened"] for result in results.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
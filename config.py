@@ -4,3 +4,105 @@ GOOGLE_MAPS_API_KEY = "your_api_key_here"
 WINDOW_TITLE = "Gesture Path Kiosk"
 WINDOW_SIZE = (1024, 768)
 
+# Adaptive inference front end: crop around the last hand and skip still frames
+ROI_TRACKING_ENABLED = True
+ROI_MARGIN = 0.25  # Fraction of the hand box added on every side of the crop
+ROI_MAX_SIDE = 256  # Crops are downscaled so their longer side is at most this many pixels
+ROI_MIN_FRACTION = 0.3  # Crops never shrink below this fraction of the frame
+MOTION_GATING_ENABLED = True
+MOTION_THRESHOLD = 3.0  # Mean absolute grey-level change (0-255) that counts as motion
+MOTION_MAX_SKIP = 15  # Run inference at least this often even without motion
+
+# Gesture decision engine: weighted voting with hysteresis and hold-to-repeat
+GESTURE_WINDOW = 6  # Recent classifications that vote on the current gesture
+GESTURE_RECENCY_DECAY = 0.8  # Each older frame's vote is worth this much of the next newer one
+GESTURE_ENTER_SCORE = 0.45  # Vote share needed to start a gesture (two fresh frames in a row)
+GESTURE_EXIT_SCORE = 0.35  # Vote share below which a held gesture ends (three frames without it)
+GESTURE_ENTER_SCORES = {}  # Per-gesture overrides of GESTURE_ENTER_SCORE, e.g. {"BACKWARD": 0.55}
+GESTURE_EXIT_SCORES = {}  # Per-gesture overrides of GESTURE_EXIT_SCORE
+GESTURE_REPEAT_DELAY = 0.6  # Seconds a gesture must be held before it starts repeating
+GESTURE_REPEAT_RATES = {  # Repeats per second while a gesture is held; 0 disables repeating
+    "FORWARD": 1.5,
+    "BACKWARD": 1.5,
+    "UP": 4.0,
+    "DOWN": 4.0,
+    "LEFT": 4.0,
+    "RIGHT": 4.0,
+}
+
+# Draw per-stage latency (p50/p95) over the gesture preview
+LATENCY_OVERLAY_ENABLED = False
+
+# Multi-camera inference pool (inference_pool.py)
+INFERENCE_POOL_WORKERS = None  # Worker processes, at most one per camera; None uses one per camera as cores allow
+INFERENCE_POOL_SLOTS_PER_WORKER = 2  # Shared-memory frame slots per camera before frames are dropped
+
+# Session recordings (recording.py)
+RECORDING_JPEG_QUALITY = 90  # Frames are stored as JPEG at this quality; None stores raw frames (~27 MB/s at 640x480@30)
+
+# Trained gesture classifier (.npz from train_classifier.py); None uses the threshold rules
+GESTURE_CLASSIFIER_PATH = None
+
+# Route resampling (route.py)
+ROUTE_SPACING_M = 10.0  # Distance between route points, so each FORWARD is one panorama step
+ROUTE_MERGE_PANORAMAS = False  # Look up every point's panorama and merge points that share one
+ROUTE_RESOLVE_IN_FLIGHT = 4  # Concurrent panorama lookups while merging
+ROUTE_PANORAMA_RADIUS = 50  # Meters to search around a point for its panorama
+
+# Panorama prefetching along the active route (panorama_prefetch.py)
+PREFETCH_LOOKAHEAD = 3  # Route points ahead whose panoramas are resolved after each step
+PREFETCH_MAX_IN_FLIGHT = 2  # Panorama lookups allowed at once
+
+# On-disk cache for directions and panorama lookups (geo_cache.py)
+GEO_CACHE_PATH = "geo_cache.sqlite3"  # None disables the cache
+GEO_CACHE_TTL = 7 * 24 * 3600  # Seconds before a cached lookup is fetched again
+GEO_CACHE_MAX_ENTRIES = 5000  # Least recently used entries are evicted beyond this
+GEO_CACHE_PRECISION = 4  # Decimal places coordinates are rounded to for keys (~11 m)
+GEO_CACHE_ACCESS_FLUSH_INTERVAL = 30.0  # Seconds between writes of batched access times; puts and close also write them
+
+# Street View POV animation
+POV_MAX_LEAD_DEG = 45  # How far rapid turn gestures can push the target ahead of the view
+POV_MAX_COMMAND_AGE_MS = 300  # Turn commands older than this when they reach the page are dropped
+
+# Maps backend (maps_backend.py): "google" for the real API, "standin" for the local server in maps_standin.py
+MAPS_BACKEND = "google"
+MAPS_STANDIN_URL = "http://127.0.0.1:8765"
+
+# Startup timing (startup.py)
+STARTUP_LOG_PATH = "startup_times.jsonl"  # One JSON line of phase timings per launch; None disables
+
+# Web view profile shared by the map and street view (web_profile.py)
+WEB_PROFILE_NAME = "gesture_path"  # Persistent profile name; None uses the off-the-record default profile
+WEB_CACHE_DIR = "web_cache"  # HTTP cache and storage directory; None uses Qt's per-user data location
+WEB_CACHE_MAX_MB = 500  # Disk HTTP cache limit; Chromium evicts the oldest entries beyond it
+
+# Metrics for fleet monitoring (metrics.py)
+METRICS_PORT = None  # e.g. 9108 for Prometheus text on http://METRICS_HOST:METRICS_PORT/metrics; None opens no port
+METRICS_HOST = "127.0.0.1"  # Local only; use "0.0.0.0" to let a scraper on the network reach it
+METRICS_FILE_PATH = None  # Snapshot file, e.g. "metrics.prom"; None disables
+METRICS_FILE_INTERVAL = 15  # Seconds between snapshots
+METRICS_FILE_MAX_BYTES = 1024 * 1024  # The file rolls over to .1, .2, ... beyond this size
+METRICS_FILE_BACKUPS = 3
+
+# Camera capture profiles (camera_capture.py); probe them with `python camera_capture.py`
+CAMERA_INDEX = 0
+CAPTURE_PROFILE = "low_latency"  # Profile CameraThread opens the camera with
+CAPTURE_PROFILES = {
+    # Keys, all optional: width, height, fps, fourcc, buffer_size, backend
+    # (backend is one of camera_capture.BACKENDS; fourcc is four characters such as "MJPG")
+    "driver_default": {},
+    "low_latency": {"width": 640, "height": 480, "fps": 30, "fourcc": "MJPG", "buffer_size": 1},
+    "low_latency_v4l2": {"width": 640, "height": 480, "fps": 30, "fourcc": "MJPG", "buffer_size": 1, "backend": "v4l2"},
+    "yuyv_640": {"width": 640, "height": 480, "fps": 30, "fourcc": "YUYV", "buffer_size": 1},
+    "hd_mjpeg": {"width": 1280, "height": 720, "fps": 30, "fourcc": "MJPG", "buffer_size": 1},
+}
+
+# Continuous analog view control (analog_control.py): hand position sets the turn rate
+ANALOG_CONTROL_ENABLED = False  # When on, UP/DOWN/LEFT/RIGHT gestures are replaced by analog turning
+ANALOG_DEAD_ZONE = 0.3  # Hand lengths the palm can drift from neutral without turning
+ANALOG_FULL_SCALE = 1.5  # Hand lengths from neutral for the maximum rate
+ANALOG_MAX_HEADING_RATE = 90  # Degrees per second
+ANALOG_MAX_PITCH_RATE = 45  # Degrees per second
+ANALOG_SMOOTHING = 0.5  # Share of a hand movement taken per frame; lower is steadier but slower
+ANALOG_RECENTER_S = 0.5  # A hand gone this long is re-centred where it reappears
+ANALOG_SEND_HZ = 60  # Rate updates sent to the street view per second
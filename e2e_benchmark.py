@@ -0,0 +1,600 @@
+"""Headless end-to-end benchmarks of the gesture-to-navigation path.
+
+    QT_QPA_PLATFORM=offscreen python e2e_benchmark.py --baseline e2e_baseline.json
+    python e2e_benchmark.py --session sessions/forward --legacy --json results.json
+
+Runs MainWindow with a frame feeder in place of CameraThread and both web
+views on the local maps stand-in, and records every script StreetView sends
+to page().runJavaScript. Synthetic frames go through a scripted hand model
+so gestures are known exactly; recorded sessions go through MediaPipe.
+Scenarios ending in _legacy drive the old update_camera_feed path, with
+inference inline on a GUI-thread timer, for a before/after comparison.
+Exits with status 1 when a threshold, or the baseline, is exceeded.
+On hosts without OpenGL, where QtWebEngine fails to start offscreen, use
+QT_QPA_PLATFORM=minimal.
+"""
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+import threading
+import time
+from types import SimpleNamespace
+import cv2
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import main  # Imports QtWebEngine, which has to happen before the QApplication exists
+from PyQt5.QtCore import Qt, QEventLoop, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+from gesture_features import GESTURES, NUM_LANDMARKS
+from gesture_recognizer import GestureRecognizer
+from latency import latency_tracker
+from maps_backend import StandInMapsBackend
+from maps_standin import StandIn, serve_in_background
+from recording import Recording
+from startup import startup_timer
+
+# Limits a run must stay within; "max" metrics fail above the value, "min" metrics below it
+DEFAULT_THRESHOLDS = {
+    "dispatch_p95_ms": ("max", 50.0),   # Capture of the deciding frame until runJavaScript is called
+    "onset_p95_ms": ("max", 250.0),     # First frame showing a gesture until its command is dispatched
+    "preview_p95_ms": ("max", 15.0),    # update_camera_feed render time on the GUI thread
+    "gui_lag_p95_ms": ("max", 30.0),    # How late a 10 ms GUI timer fires
+    "missed_fraction": ("max", 0.05),   # Gesture segments that never produced a command
+    "wrong_commands": ("max", 0),       # Commands that don't match the gesture that was shown
+    "inference_fps": ("min", 15.0),     # Frames run through the hand model per second
+}
+
+# Command each gesture should dispatch, as the start of the script after nav.expect(...)
+EXPECTED_COMMANDS = {
+    "FORWARD": ("nav.walk(1)", "nav.goTo("),
+    "BACKWARD": ("nav.walk(-1)", "nav.goTo("),
+    "UP": ("nav.pitch(10,",),
+    "DOWN": ("nav.pitch(-10,",),
+    "LEFT": ("nav.rotate(-10,",),
+    "RIGHT": ("nav.rotate(10,",),
+}
+
+SCENARIOS = {
+    "look": ["LEFT", "RIGHT", "UP", "DOWN"],  # View control through the POV scheduler
+    "walk": ["FORWARD", "BACKWARD"],          # Free walking with nav.walk, no route
+    "route": ["FORWARD"],                     # Stepping along a loaded route with prefetching
+    "analog": [],                             # Analog turning from hand position (analog_script)
+    "look_legacy": ["LEFT", "RIGHT", "UP", "DOWN"],  # As look, through the old update_camera_feed path
+    "walk_legacy": ["FORWARD", "BACKWARD"],          # As walk, through the old update_camera_feed path
+}
+LEGACY_SUFFIX = "_legacy"  # Scenarios run through LegacyCameraFeed; reference only, so thresholds don't apply
+
+# Analog scenario: palm offsets from neutral, as fractions of the frame, and the turn direction each should give
+ANALOG_MOVES = [((0.15, 0.0), (1, 0)), ((-0.15, 0.0), (-1, 0)), ((0.0, -0.15), (0, 1)), ((0.0, 0.15), (0, -1))]
+
+NAV_EXPECT = re.compile(r"nav\.expect\((\d+)[^)]*\);\s*")
+
+def template_hand(gesture):
+    """(21, 3) landmarks that the threshold rules classify as `gesture`"""
+    points = np.zeros((NUM_LANDMARKS, 3), dtype=np.float64)
+    points[:] = (0.5, 0.62, 0.0)  # Every joint curled near the palm: a fist
+    points[0] = (0.5, 0.8, 0.0)  # Wrist
+    points[[5, 9, 13, 17], 1] = 0.6  # Finger bases
+    thumb = {"UP": (0.5, 0.6), "DOWN": (0.5, 0.95), "LEFT": (0.3, 0.8), "RIGHT": (0.7, 0.8)}
+    if gesture in thumb:
+        points[4, :2] = thumb[gesture]
+    elif gesture == "FORWARD":
+        points[[8, 12], 1] = 0.4
+    elif gesture == "BACKWARD":
+        points[[8, 12], 1] = 0.75
+    return points
+
+def synthetic_frame(label, index, width=640, height=480, shift=(0.0, 0.0)):
+    """A BGR frame with the label index and hand shift in its top rows and a moving bar so there is always motion"""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:8, :, 2] = 10 + 30 * label
+    frame[:8, :, 1] = 128 + int(round(shift[0] * 100))  # Hand offset in hundredths of the frame
+    frame[:8, :, 0] = 128 + int(round(shift[1] * 100))
+    x = (index * 16) % width
+    frame[8:, x:x + 40] = 255
+    return frame
+
+class ScriptedHands:
+    """Stands in for MediaPipe Hands: reads the label from a synthetic frame and returns its template hand"""
+
+    def __init__(self):
+        self.templates = {i: template_hand(name) for i, name in enumerate(GESTURES)}
+
+    def process(self, rgb_frame):
+        label = int(round((int(rgb_frame[0, 0, 0]) - 10) / 30))
+        if label <= 0 or label >= len(GESTURES):
+            return SimpleNamespace(multi_hand_landmarks=None)
+        dx, dy = (int(rgb_frame[0, 0, 1]) - 128) / 100, (int(rgb_frame[0, 0, 2]) - 128) / 100
+        hand = SimpleNamespace(landmark=[SimpleNamespace(x=x + dx, y=y + dy, z=z) for x, y, z in self.templates[label]])
+        return SimpleNamespace(multi_hand_landmarks=[hand])
+
+class ScriptedRecognizer(GestureRecognizer):
+    """GestureRecognizer on ScriptedHands, for synthetic frames"""
+
+    def load(self):
+        if self.hands is None:
+            self.hands = ScriptedHands()
+
+    def draw(self, frame, hand_landmarks):
+        import cv2
+        height, width = frame.shape[:2]
+        for landmark in hand_landmarks.landmark:
+            cv2.circle(frame, (int(landmark.x * width), int(landmark.y * height)), 3, (26, 188, 156), -1)
+
+class FrameFeeder(QThread):
+    """Takes CameraThread's place: writes queued frames into the FrameRing at a fixed rate"""
+    capture_started = pyqtSignal(bool)
+    played = pyqtSignal()
+
+    def __init__(self, frame_ring, fps=30.0):
+        super().__init__()
+        self.frame_ring = frame_ring
+        self.fps = fps
+        self.running = True
+        self.timestamps = []  # Ring timestamp of every frame of the last play()
+        self._job = None
+        self._ready = threading.Event()
+
+    def play(self, frames, labels):
+        """Queue frames, with the gesture index each one shows (-1 if unknown), for the feeder thread"""
+        self._job = (frames, labels)
+        self._ready.set()
+
+    def run(self):
+        self.capture_started.emit(True)
+        while self.running:
+            if not self._ready.wait(0.1):
+                continue
+            self._ready.clear()
+            frames, _ = self._job
+            self.timestamps = []
+            start = time.monotonic()
+            for i, frame in enumerate(frames):
+                if not self.running:
+                    break
+                delay = start + i / self.fps - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                captured = time.monotonic()
+                self.frame_ring.write(frame, captured)
+                self.timestamps.append(captured)
+            self.played.emit()
+        self.frame_ring.close()
+
+    def stop(self):
+        self.running = False
+        self.wait()
+
+class LegacyCameraFeed:
+    """The GUI-thread path from before inference moved to a worker, for before/after runs.
+
+    As the old MainWindow.update_camera_feed did, a 50 ms QTimer takes the
+    newest frame, runs the hand model inline, draws the landmarks, converts
+    and scales the full frame into the preview, and dispatches the first
+    gesture seen once the 0.5 s cooldown has passed. start() stops the
+    inference worker for good, so legacy scenarios run last.
+    """
+
+    def __init__(self, window, probe, interval_ms=50, cooldown=0.5):
+        self.window = window
+        self.probe = probe  # Each callback's GUI-thread time goes to probe.preview_ms
+        self.cooldown = cooldown
+        self.consumer = window.frame_ring.consumer()
+        self.last_gesture_time = 0.0
+        self.inferences = 0
+        self.timer = QTimer()
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.update_camera_feed)
+
+    def start(self):
+        window = self.window
+        window.frame_notifier.frame_available.disconnect(window.update_camera_feed)
+        window.inference_worker.stop()
+        window.inference_worker.wait()
+        self.consumer.cursor = window.frame_ring.head + 1
+        self.timer.start()
+
+    def stop(self):
+        """Hand the preview back to the FrameNotifier; the inference worker stays stopped"""
+        self.timer.stop()
+        self.window.frame_notifier.frame_available.connect(self.window.update_camera_feed)
+
+    def update_camera_feed(self):
+        start = time.perf_counter()
+        seq, frame = self.consumer.read(timeout=0)
+        if frame is None:
+            return
+        recognizer = self.window.gesture_recognizer
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        height, width = rgb_frame.shape[:2]
+        processed_frame = rgb_frame.copy()
+
+        now = time.monotonic()
+        if now - self.last_gesture_time >= self.cooldown:
+            self.inferences += 1
+            results = recognizer.hands.process(rgb_frame)
+            if results.multi_hand_landmarks:
+                hand_landmarks = results.multi_hand_landmarks[0]
+                recognizer.draw(processed_frame, hand_landmarks)
+                gesture = recognizer.determine_gesture(hand_landmarks)
+                if gesture != "NONE":
+                    trace = {"capture": self.window.frame_ring.timestamp(seq) or now, "decided": time.monotonic()}
+                    self.window.handle_gesture(gesture, trace)
+                    self.last_gesture_time = now
+
+        image = QImage(processed_frame.data, width, height, 3 * width, QImage.Format_RGB888)
+        self.window.gesture_view.setPixmap(QPixmap.fromImage(image).scaled(240, 180, Qt.KeepAspectRatio,
+                                                                           Qt.FastTransformation))
+        self.probe.preview_ms.append((time.perf_counter() - start) * 1000)
+
+def gesture_script(gestures, repeats, hold_frames, gap_frames):
+    """Frame labels: each gesture held for hold_frames, then no hand for gap_frames, `repeats` times over"""
+    index = {name: i for i, name in enumerate(GESTURES)}
+    labels = []
+    for _ in range(repeats):
+        for name in gestures:
+            labels += [index[name]] * hold_frames + [0] * gap_frames
+    return np.asarray(labels, dtype=np.int64)
+
+def analog_script(repeats, hold_frames, gap_frames):
+    """Frame labels and hand shifts: a still fist moved to each ANALOG_MOVES offset and back, `repeats` times over"""
+    fist = list(GESTURES).index("UP")  # Any visible hand will do; UP is ignored while analog control is on
+    labels, shifts = [], []
+    for _ in range(repeats):
+        for shift, _ in ANALOG_MOVES:
+            labels += [fist] * (2 * hold_frames)
+            shifts += [(0.0, 0.0)] * hold_frames + [shift] * hold_frames
+        labels += [fist] * hold_frames + [0] * gap_frames
+        shifts += [(0.0, 0.0)] * (hold_frames + gap_frames)
+    return np.asarray(labels, dtype=np.int64), shifts
+
+def percentile(samples, q):
+    return float(np.percentile(samples, q)) if len(samples) else None
+
+def latency_stats(prefix, samples_ms):
+    stats = {f"{prefix}_count": len(samples_ms)}
+    for q in (50, 95, 99):
+        stats[f"{prefix}_p{q}_ms"] = percentile(samples_ms, q)
+    stats[f"{prefix}_max_ms"] = float(np.max(samples_ms)) if len(samples_ms) else None
+    return stats
+
+class Probe:
+    """Instruments a running MainWindow: dispatched scripts, preview renders and GUI timer lag"""
+
+    def __init__(self, window):
+        self.window = window
+        self.dispatches = []  # (dispatch time, capture time of the deciding frame, command)
+        self.other_scripts = 0
+        self.view_rates = []  # (dispatch time, heading rate, pitch rate) from analog control
+        self.preview_ms = []
+        self.gui_lag_ms = []
+
+        page = window.street_view.page()
+        self._run_javascript = page.runJavaScript
+        page.runJavaScript = self.run_javascript
+
+        renderer = window.preview_renderer
+        self._render = renderer.render
+        renderer.render = self.render
+
+        self._last_tick = None
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(10)
+
+    def run_javascript(self, script, *callback):
+        now = time.monotonic()
+        match = NAV_EXPECT.match(script)
+        token = int(match.group(1)) if match else 0
+        # run_navigation registers the gesture's trace under its token before dispatching
+        entry = self.window.street_view._nav_traces.get(token) if token else None
+        if entry is not None:
+            self.dispatches.append((now, entry[0]["capture"], script[match.end():]))
+        elif script.startswith("nav.setVelocity("):
+            heading, pitch = script[len("nav.setVelocity("):].split(",")[:2]
+            self.view_rates.append((now, float(heading), float(pitch)))
+        else:
+            self.other_scripts += 1
+        return self._run_javascript(script, *callback)
+
+    def render(self, frame, landmarks):
+        start = time.perf_counter()
+        result = self._render(frame, landmarks)
+        self.preview_ms.append((time.perf_counter() - start) * 1000)
+        return result
+
+    def tick(self):
+        now = time.monotonic()
+        if self._last_tick is not None:
+            self.gui_lag_ms.append(max(0.0, (now - self._last_tick) * 1000 - 10))
+        self._last_tick = now
+
+    def reset(self):
+        self.dispatches.clear()
+        self.other_scripts = 0
+        self.view_rates.clear()
+        self.preview_ms.clear()
+        self.gui_lag_ms.clear()
+        self._last_tick = None
+
+def match_segments(labels, timestamps, dispatches):
+    """Pair each shown gesture with the commands its frames produced.
+
+    Returns first-command latencies from each gesture's first frame, the
+    number of gestures with no command, and the number of wrong commands.
+    """
+    segments = []  # (onset time, gesture name)
+    for i, label in enumerate(labels[:len(timestamps)]):
+        if i == 0 or label != labels[i - 1]:
+            segments.append((timestamps[i], str(GESTURES[label]) if label >= 0 else None))
+    onsets = [onset for onset, _ in segments]
+
+    first = {}
+    wrong = 0
+    for dispatched, captured, command in dispatches:
+        k = bisect.bisect_right(onsets, captured) - 1
+        # Decisions lag the frames, so a command may come from a frame just after its gesture ended
+        while k > 0 and segments[k][1] in ("NONE", None):
+            k -= 1
+        name = segments[k][1] if k >= 0 else None
+        if name in EXPECTED_COMMANDS and not command.startswith(EXPECTED_COMMANDS[name]):
+            wrong += 1
+        elif k >= 0 and k not in first:
+            first[k] = dispatched
+    shown = [k for k, (_, name) in enumerate(segments) if name in EXPECTED_COMMANDS]
+    onset_ms = [(first[k] - segments[k][0]) * 1000 for k in shown if k in first]
+    missed = sum(1 for k in shown if k not in first)
+    return onset_ms, missed, len(shown), wrong
+
+def match_analog(shifts, timestamps, view_rates):
+    """Pair each analog move with the rates it produced.
+
+    Returns latencies from the first moved frame to the first rate turning
+    the right way, from the first frame back at neutral to the rate
+    returning to zero, the number of moves with no turn, and the number of
+    rates turning against the move in progress.
+    """
+    directions = {shift: direction for shift, direction in ANALOG_MOVES}
+    segments = []  # (start time, end time, turn direction or None at neutral)
+    for i, shift in enumerate(shifts[:len(timestamps)]):
+        if i == 0 or shift != shifts[i - 1]:
+            segments.append([timestamps[i], timestamps[i], directions.get(tuple(shift))])
+        segments[-1][1] = timestamps[i]
+
+    onset_ms, stop_ms, missed, wrong = [], [], 0, 0
+    for k, (start, end, direction) in enumerate(segments):
+        later = [rate for rate in view_rates if rate[0] >= start]
+        if direction is None:
+            if k > 0 and segments[k - 1][2] is not None:
+                stopped = next((t for t, heading, pitch in later if heading == 0 and pitch == 0), None)
+                if stopped is not None and stopped <= end:
+                    stop_ms.append((stopped - start) * 1000)
+            continue
+        # Allow a few frames of pipeline delay past the move's last frame
+        during = [(t, heading, pitch) for t, heading, pitch in later if t <= end + 0.1]
+        turning = [t for t, heading, pitch in during if np.sign(heading) == direction[0] and np.sign(pitch) == direction[1]]
+        wrong += sum(1 for _, heading, pitch in during
+                     if np.sign(heading) == -direction[0] != 0 or np.sign(pitch) == -direction[1] != 0)
+        if turning:
+            onset_ms.append((turning[0] - start) * 1000)
+        else:
+            missed += 1
+    shown = sum(1 for _, _, direction in segments if direction is not None)
+    return onset_ms, stop_ms, missed, shown, wrong
+
+def run_scenario(app, window, feeder, probe, frames, labels, timeout, shifts=None, legacy=None):
+    """Play frames through the running window, or through a started LegacyCameraFeed, and measure what comes out"""
+    probe.reset()
+    latency_tracker.reset()
+    front_end = window.inference_worker.front_end
+    stats_before = dict(front_end.stats)
+    legacy_before = legacy.inferences if legacy is not None else 0
+
+    loop = QEventLoop()
+    feeder.played.connect(loop.quit)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    started = time.monotonic()
+    feeder.play(frames, labels)
+    loop.exec_()
+    feeder.played.disconnect(loop.quit)
+    elapsed = time.monotonic() - started
+
+    # Let the last decisions reach the page
+    drain = time.monotonic() + 0.3
+    while time.monotonic() < drain:
+        app.processEvents(QEventLoop.AllEvents, 20)
+
+    if legacy is not None:
+        inferences = legacy.inferences - legacy_before
+    else:
+        inferences = front_end.stats["inferences"] - stats_before["inferences"]
+    if shifts is not None:
+        onset_ms, stop_ms, missed, shown, wrong = match_analog(shifts, feeder.timestamps, probe.view_rates)
+    else:
+        onset_ms, missed, shown, wrong = match_segments(labels, feeder.timestamps, probe.dispatches)
+    result = {
+        "frames": len(feeder.timestamps),
+        "seconds": elapsed,
+        "feed_fps": len(feeder.timestamps) / elapsed if elapsed else None,
+        "inference_fps": inferences / elapsed if elapsed else None,
+        "skipped_no_motion": front_end.stats["skipped"] - stats_before["skipped"],
+        "gestures_shown": shown,
+        "commands": len(probe.dispatches),
+        "commands_per_s": len(probe.dispatches) / elapsed if elapsed else None,
+        "missed_fraction": missed / shown if shown else 0.0,
+        "wrong_commands": wrong,
+        "other_scripts": probe.other_scripts,
+    }
+    result.update(latency_stats("dispatch", [(d - c) * 1000 for d, c, _ in probe.dispatches]))
+    result.update(latency_stats("onset", onset_ms))
+    if shifts is not None:
+        result["view_rates"] = len(probe.view_rates)
+        result.update(latency_stats("stop", stop_ms))
+    result.update(latency_stats("preview", probe.preview_ms))
+    result.update(latency_stats("gui_lag", probe.gui_lag_ms))
+    applied = latency_tracker.summary().get("total", {})
+    if applied.get("count"):
+        # Only with a real QtWebEngine: capture until the page confirmed the move
+        result["applied_p95_ms"] = applied["p95_ms"]
+    return result
+
+def check(results, thresholds, baseline=None, tolerance=0.25, slack_ms=10.0):
+    """Every threshold or baseline regression, as readable messages"""
+    failures = []
+    for scenario, result in results.items():
+        for metric, (kind, limit) in thresholds.items():
+            value = result.get(metric)
+            if value is None or scenario.endswith(LEGACY_SUFFIX):
+                continue
+            if (kind == "max" and value > limit) or (kind == "min" and value < limit):
+                failures.append(f"{scenario}: {metric} = {value:.3g}, {kind} {limit:.3g}")
+
+        previous = (baseline or {}).get(scenario, {})
+        for metric, (kind, _) in thresholds.items():
+            value, before = result.get(metric), previous.get(metric)
+            if value is None or before is None:
+                continue
+            # Timings get absolute slack too: a p95 over a few dozen commands moves by
+            # several ms with scheduler noise, more so on small kiosk CPUs
+            slack = slack_ms if metric.endswith("_ms") else 0.0
+            if kind == "max" and value > before * (1 + tolerance) + slack:
+                failures.append(f"{scenario}: {metric} regressed from {before:.3g} to {value:.3g}")
+            elif kind == "min" and value < before * (1 - tolerance):
+                failures.append(f"{scenario}: {metric} regressed from {before:.3g} to {value:.3g}")
+    return failures
+
+def parse_limits(items, kind):
+    limits = {}
+    for item in items or ():
+        metric, _, value = item.partition("=")
+        limits[metric] = (kind, float(value))
+    return limits
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run with synthetic frames; repeatable, default all")
+    parser.add_argument("--session", action="append", help="Recorded session to play through MediaPipe instead")
+    parser.add_argument("--legacy", action="store_true", help="Also play each session through the old update_camera_feed path")
+    parser.add_argument("--repeats", type=int, default=5, help="Times each scenario's gesture list is shown")
+    parser.add_argument("--hold-frames", type=int, default=12, help="Frames each gesture is held")
+    parser.add_argument("--gap-frames", type=int, default=8, help="Frames with no hand between gestures")
+    parser.add_argument("--fps", type=float, default=30.0, help="Rate frames are fed at")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stand-in maps server latency")
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--max", action="append", metavar="METRIC=VALUE", help="Override or add a maximum")
+    parser.add_argument("--min", action="append", metavar="METRIC=VALUE", help="Override or add a minimum")
+    parser.add_argument("--baseline", help="Earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression against the baseline")
+    parser.add_argument("--slack-ms", type=float, default=10.0, help="Absolute slack on timings against the baseline")
+    parser.add_argument("--json", help="Write results here ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    thresholds.update(parse_limits(args.max, "max"))
+    thresholds.update(parse_limits(args.min, "min"))
+
+    # Scenario name -> (frames, labels, hand shifts for the analog scenario)
+    runs = {}
+    if args.session:
+        for path in args.session:
+            recording = Recording(path)
+            name = os.path.basename(os.path.normpath(path))
+            runs[name] = (recording.frames, np.asarray(recording.labels, dtype=np.int64), None)
+            if args.legacy:
+                runs[name + LEGACY_SUFFIX] = runs[name]
+        recognizer = GestureRecognizer(load_model=False)
+    else:
+        for name in args.scenario or SCENARIOS:
+            if name == "analog":
+                labels, shifts = analog_script(args.repeats, args.hold_frames, args.gap_frames)
+                frames = [synthetic_frame(label, i, shift=shift) for i, (label, shift) in enumerate(zip(labels, shifts))]
+                runs[name] = (frames, labels, shifts)
+                continue
+            labels = gesture_script(SCENARIOS[name], args.repeats, args.hold_frames, args.gap_frames)
+            runs[name] = ([synthetic_frame(label, i) for i, label in enumerate(labels)], labels, None)
+        recognizer = ScriptedRecognizer(load_model=False)
+        # NONE frames have no hand at all, so only the other templates need to classify correctly
+        names = [str(name) for name in recognizer.classify_batch(np.stack([template_hand(name) for name in GESTURES[1:]]))]
+        if names != GESTURES[1:].tolist():
+            print(f"Template hands classify as {names}, expected {GESTURES[1:].tolist()}")
+            return 1
+
+    server, url = serve_in_background(StandIn({"directions": args.latency_ms, "panorama": args.latency_ms,
+                                               "tile": args.latency_ms}))
+    main.STARTUP_LOG_PATH = None  # Keep benchmark launches out of the kiosk's startup log
+    app = QApplication.instance() or QApplication(sys.argv)
+    feeders = []
+    window = main.MainWindow(lambda ring: feeders.append(FrameFeeder(ring, args.fps)) or feeders[-1],
+                             recognizer, StandInMapsBackend(url), geo_cache_path=None)
+    window.show()
+
+    deadline = time.monotonic() + args.startup_timeout
+    while not startup_timer.completed and time.monotonic() < deadline:
+        app.processEvents(QEventLoop.AllEvents, 50)
+    if not startup_timer.completed:
+        print("Startup did not finish in time; running anyway")
+    if isinstance(recognizer, ScriptedRecognizer):
+        window.inference_worker.front_end.roi_enabled = False  # Scripted hands have no real position to track
+    feeder, probe = feeders[0], Probe(window)
+
+    results = {}
+    legacy = None
+    # Legacy runs last: the old path stops the inference worker
+    for name in sorted(runs, key=lambda name: name.endswith(LEGACY_SUFFIX)):
+        frames, labels, shifts = runs[name]
+        if name.endswith(LEGACY_SUFFIX) and legacy is None:
+            legacy = LegacyCameraFeed(window, probe)
+            legacy.start()
+        if name == "route":
+            lat, lng = window.street_view.default_lat, window.street_view.default_lng
+            window.street_view.load_route([[lat, lng], [lat + 0.01, lng]], "benchmark")
+        window.set_analog_control(shifts is not None)
+        results[name] = run_scenario(app, window, feeder, probe, frames, labels, len(frames) / args.fps + 10, shifts,
+                                     legacy)
+        if name == "route":
+            window.street_view.has_active_route = False
+    window.set_analog_control(False)
+    if legacy is not None:
+        legacy.stop()
+
+    window.close()
+    server.shutdown()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+    failures = check(results, thresholds, baseline, args.tolerance, args.slack_ms)
+    report = {
+        "startup": startup_timer.report(),
+        "scenarios": results,
+        "thresholds": {metric: {kind: limit} for metric, (kind, limit) in thresholds.items()},
+        "failures": failures,
+    }
+
+    for name, result in results.items():
+        print(f"{name}: {result['frames']} frames, {result['commands']} commands for {result['gestures_shown']} gestures, "
+              f"{result['inference_fps']:.1f} inferences/s")
+        for prefix in ("dispatch", "onset", "stop", "preview", "gui_lag"):
+            if result.get(f"{prefix}_count"):
+                print(f"  {prefix:<9} p50 {result[f'{prefix}_p50_ms']:7.2f} ms  p95 {result[f'{prefix}_p95_ms']:7.2f} ms"
+                      f"  max {result[f'{prefix}_max_ms']:7.2f} ms")
+    for failure in failures:
+        print(f"FAIL {failure}")
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark())
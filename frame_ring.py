@@ -0,0 +1,123 @@
+import threading
+import time
+import numpy as np
+
+class FrameRing:
+    """Preallocated ring of frame buffers shared by one camera and many consumers.
+
+    The camera owner fills buffers in place and commits them; each consumer
+    gets read-only views into the ring, so a frame is never copied per consumer.
+    A view stays valid until the producer wraps around to its slot, which
+    `is_valid(seq)` reports.
+    """
+
+    def __init__(self, capacity=8):
+        if capacity < 2:
+            raise ValueError("FrameRing needs at least two slots")
+        self.capacity = capacity
+        self._buffers = None
+        self._seqs = np.full(capacity, -1, dtype=np.int64)  # Sequence number held by each slot
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._head = -1  # Sequence number of the newest committed frame
+        self._cond = threading.Condition()
+        self._listeners = []  # Called with the sequence number after every commit, on the producer thread
+        self.closed = False
+
+    @property
+    def head(self):
+        return self._head
+
+    def allocate(self, shape, dtype=np.uint8):
+        with self._cond:
+            self._buffers = np.empty((self.capacity,) + tuple(shape), dtype=dtype)
+            self._seqs.fill(-1)
+
+    def next_buffer(self):
+        """Return the writable buffer for the next frame, or None before allocation"""
+        if self._buffers is None:
+            return None
+        with self._cond:
+            slot = (self._head + 1) % self.capacity
+            # Invalidate the slot first so readers never pick up a half-written frame
+            self._seqs[slot] = -1
+            return self._buffers[slot]
+
+    def commit(self, timestamp=None):
+        """Publish the buffer returned by next_buffer() and wake waiting consumers"""
+        with self._cond:
+            self._head += 1
+            seq = self._head
+            slot = seq % self.capacity
+            self._seqs[slot] = seq
+            self._timestamps[slot] = time.monotonic() if timestamp is None else timestamp
+            self._cond.notify_all()
+        for listener in self._listeners:
+            listener(seq)
+        return seq
+
+    def subscribe(self, listener):
+        """Have listener(seq) called after each commit, for consumers that can't block in read()"""
+        self._listeners.append(listener)
+
+    def write(self, frame, timestamp=None):
+        """Copy a frame into the ring, (re)allocating if the frame shape changed"""
+        if self._buffers is None or self._buffers.shape[1:] != frame.shape:
+            self.allocate(frame.shape, frame.dtype)
+        np.copyto(self.next_buffer(), frame)
+        return self.commit(timestamp)
+
+    def is_valid(self, seq):
+        return seq >= 0 and self._seqs[seq % self.capacity] == seq
+
+    def timestamp(self, seq):
+        return self._timestamps[seq % self.capacity] if self.is_valid(seq) else None
+
+    def consumer(self, policy="latest"):
+        return FrameConsumer(self, policy)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+class FrameConsumer:
+    """Independent read cursor into a FrameRing with its own drop policy"""
+    LATEST = "latest"  # Always jump to the newest frame, dropping any backlog
+    SEQUENTIAL = "sequential"  # Read every frame in order while it is still in the ring
+
+    def __init__(self, ring, policy=LATEST):
+        if policy not in (self.LATEST, self.SEQUENTIAL):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.ring = ring
+        self.policy = policy
+        self.cursor = ring.head + 1  # Next sequence number to read; only new frames are seen
+        self.consumed = 0
+        self.dropped = 0
+
+    def read(self, timeout=None):
+        """Wait for the next frame and return (seq, read-only view), or (None, None)"""
+        ring = self.ring
+        with ring._cond:
+            ready = ring._cond.wait_for(lambda: ring._head >= self.cursor or ring.closed, timeout)
+            if not ready or ring._head < self.cursor:
+                return None, None
+
+            head = ring._head
+            if self.policy == self.LATEST:
+                seq = head
+            else:
+                # The oldest slot is the next one the producer will overwrite, so skip it
+                seq = max(self.cursor, head - ring.capacity + 2)
+
+            self.dropped += seq - self.cursor
+            self.consumed += 1
+            self.cursor = seq + 1
+
+            view = ring._buffers[seq % ring.capacity].view()
+            view.flags.writeable = False
+            return seq, view
+
+    def discard(self):
+        """Count the last frame read as dropped, for a view whose slot was recycled before it was used up"""
+        self.consumed -= 1
+        self.dropped += 1
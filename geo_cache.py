@@ -0,0 +1,128 @@
+import json
+import sqlite3
+import time
+from config import (
+    GEO_CACHE_PATH, GEO_CACHE_TTL, GEO_CACHE_MAX_ENTRIES, GEO_CACHE_PRECISION, GEO_CACHE_ACCESS_FLUSH_INTERVAL,
+)
+
+class GeoCache:
+    """SQLite cache for directions and panorama lookups.
+
+    Keys are coordinates rounded to `precision` decimal places, so clicks a
+    few meters apart share an entry. Entries expire after `ttl` seconds and
+    the least recently used ones are evicted beyond `max_entries`. Used from
+    the GUI thread only, so hits never commit: their access times are kept in
+    memory and written in one transaction every `flush_interval` seconds, on
+    the next put, or on close.
+    """
+
+    def __init__(self, path=GEO_CACHE_PATH, ttl=GEO_CACHE_TTL, max_entries=GEO_CACHE_MAX_ENTRIES,
+                 precision=GEO_CACHE_PRECISION, flush_interval=GEO_CACHE_ACCESS_FLUSH_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.precision = precision
+        self.flush_interval = flush_interval
+        self._accessed = {}  # (kind, key) -> access time not written yet
+        self._last_flush = time.monotonic()
+        self.stats = {}  # Per kind: hits, misses, expired, stored
+        self.evictions = 0
+
+        self._db = sqlite3.connect(path)
+        # WAL with NORMAL sync: commits append to the log without an fsync each
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.commit()
+
+    def _count(self, kind, outcome):
+        counts = self.stats.setdefault(kind, {"hits": 0, "misses": 0, "expired": 0, "stored": 0})
+        counts[outcome] += 1
+
+    def point_key(self, lat, lng):
+        return f"{lat:.{self.precision}f},{lng:.{self.precision}f}"
+
+    def get(self, kind, key):
+        """Cached value (decoded JSON) or None on a miss"""
+        row = self._db.execute("SELECT value, created FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        now = time.time()
+        if row is None:
+            self._count(kind, "misses")
+            return None
+        value, created = row
+        if now - created > self.ttl:
+            self._db.execute("DELETE FROM entries WHERE kind = ? AND key = ?", (kind, key))
+            self._db.commit()
+            self._count(kind, "expired")
+            self._count(kind, "misses")
+            return None
+        self._accessed[(kind, key)] = now
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+        self._count(kind, "hits")
+        return json.loads(value)
+
+    def flush(self):
+        """Write batched access times in one transaction"""
+        self._last_flush = time.monotonic()
+        if not self._accessed:
+            return
+        self._db.executemany(
+            "UPDATE entries SET accessed = ? WHERE kind = ? AND key = ?",
+            [(accessed, kind, key) for (kind, key), accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+        self._db.commit()
+
+    def put(self, kind, key, value):
+        now = time.time()
+        self.flush()  # Eviction below goes by access time, so it has to be current
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries (kind, key, value, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (kind, key, json.dumps(value), now, now),
+        )
+        excess = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries ORDER BY accessed LIMIT ?)", (excess,)
+            )
+            self.evictions += excess
+        self._db.commit()
+        self._count(kind, "stored")
+
+    def get_route(self, origin, destination):
+        """Cached [[lat, lng], ...] route between two (lat, lng) points"""
+        return self.get("route", self.point_key(*origin) + "|" + self.point_key(*destination))
+
+    def put_route(self, origin, destination, points):
+        self.put("route", self.point_key(*origin) + "|" + self.point_key(*destination), points)
+
+    def get_panorama(self, lat, lng, radius, source="default"):
+        """Cached panorama lookup near a point: dict with pano, lat and lng"""
+        return self.get("panorama", f"{self.point_key(lat, lng)}|{radius}|{source}")
+
+    def put_panorama(self, lat, lng, radius, panorama, source="default"):
+        self.put("panorama", f"{self.point_key(lat, lng)}|{radius}|{source}", panorama)
+
+    def summary(self):
+        summary = {}
+        for kind, counts in self.stats.items():
+            lookups = counts["hits"] + counts["misses"]
+            summary[kind] = dict(counts, hit_rate=counts["hits"] / lookups if lookups else None)
+        summary["entries"] = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        summary["evictions"] = self.evictions
+        return summary
+
+    def close(self):
+        self.flush()
+        self._db.close()
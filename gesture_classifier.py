@@ -0,0 +1,101 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from gesture_features import GESTURES, NUM_LANDMARKS, WRIST, classify_batch, classify_hand
+
+def normalize_landmarks(points):
+    """Turn (N, 21, 3) landmarks into (N, 63) vectors independent of hand position and size.
+
+    Landmarks are moved so the wrist is at the origin and scaled by the hand's
+    mean distance from its centroid. Orientation is kept on purpose: the
+    thumb-direction gestures are defined by where the thumb points.
+    """
+    points = np.asarray(points, dtype=np.float32)
+    if points.ndim == 2:
+        points = points[np.newaxis]
+    centered = points - points[:, WRIST:WRIST + 1]
+    spread = np.linalg.norm(centered - centered.mean(axis=1, keepdims=True), axis=2).mean(axis=1)
+    centered /= np.maximum(spread, 1e-6)[:, np.newaxis, np.newaxis]
+    return centered.reshape(len(points), NUM_LANDMARKS * 3)
+
+def confusion_matrix(labels, predicted):
+    """Rows are ground-truth gestures, columns are predicted gestures, both indexed like GESTURES"""
+    matrix = np.zeros((len(GESTURES), len(GESTURES)), dtype=np.int64)
+    labelled = labels >= 0
+    np.add.at(matrix, (labels[labelled], predicted[labelled]), 1)
+    return matrix
+
+class GestureClassifier(ABC):
+    """Interface for anything that labels hand landmarks with gesture names"""
+
+    @abstractmethod
+    def predict_batch(self, points):
+        """Label a (N, 21, 3) array of hands and return an array of gesture names"""
+
+    def predict(self, points):
+        """Label a single (21, 3) hand"""
+        return str(self.predict_batch(points)[0])
+
+class RuleClassifier(GestureClassifier):
+    """The hand-coded threshold rules from gesture_features"""
+
+    def __init__(self, threshold=0.1):
+        self.threshold = threshold
+
+    def predict_batch(self, points):
+        return classify_batch(points, self.threshold)
+
+    def predict(self, points):
+        # Scalar rules: the per-frame path shouldn't pay for batch masks
+        return classify_hand(points, self.threshold)
+
+class NearestCentroidClassifier(GestureClassifier):
+    """Nearest class centroid over normalized landmark vectors.
+
+    Hands farther than `reject_distance` from every centroid are labelled
+    NONE, so unfamiliar poses don't trigger navigation.
+    """
+
+    def __init__(self, centroids=None, labels=None, reject_distance=np.inf):
+        self.centroids = None if centroids is None else np.asarray(centroids, dtype=np.float32)  # (classes, 63)
+        self.labels = None if labels is None else np.asarray(labels)  # Gesture name for each centroid
+        self.reject_distance = float(reject_distance)
+        self._update_norms()
+
+    def _update_norms(self):
+        self._centroid_norms = None if self.centroids is None else (self.centroids ** 2).sum(axis=1)
+
+    def fit(self, points, labels, reject_quantile=0.99):
+        """Fit centroids to (N, 21, 3) hands and their gesture names"""
+        features = normalize_landmarks(points)
+        labels = np.asarray(labels)
+        self.labels = np.array([name for name in GESTURES if np.any(labels == name)])
+        self.centroids = np.stack([features[labels == name].mean(axis=0) for name in self.labels])
+        self._update_norms()
+
+        # Reject anything farther out than nearly all training samples of any class
+        distances = np.sqrt(self._squared_distances(features).min(axis=1))
+        self.reject_distance = float(np.quantile(distances, reject_quantile)) if reject_quantile else np.inf
+        return self
+
+    def _squared_distances(self, features):
+        # |x - c|^2 = |x|^2 - 2 x.c + |c|^2, one matrix product for the whole batch
+        return (features ** 2).sum(axis=1)[:, np.newaxis] - 2 * features @ self.centroids.T + self._centroid_norms
+
+    def predict_batch(self, points):
+        distances = self._squared_distances(normalize_landmarks(points))
+        nearest = distances.argmin(axis=1)
+        names = self.labels[nearest]
+        rejected = distances[np.arange(len(nearest)), nearest] > self.reject_distance ** 2
+        return np.where(rejected, "NONE", names)
+
+    def save(self, path):
+        np.savez(path, kind="nearest_centroid", centroids=self.centroids, labels=self.labels,
+                 reject_distance=self.reject_distance)
+
+def load_classifier(path):
+    """Load a classifier saved by a GestureClassifier subclass's save()"""
+    data = np.load(path, allow_pickle=False)
+    kind = str(data["kind"])
+    if kind == "nearest_centroid":
+        return NearestCentroidClassifier(data["centroids"], data["labels"], data["reject_distance"])
+    raise ValueError(f"Unknown classifier kind in {path}: {kind}")
@@ -0,0 +1,116 @@
+import time
+from collections import deque
+import numpy as np
+from gesture_features import GESTURES
+from config import (
+    GESTURE_WINDOW, GESTURE_RECENCY_DECAY, GESTURE_ENTER_SCORE, GESTURE_EXIT_SCORE,
+    GESTURE_ENTER_SCORES, GESTURE_EXIT_SCORES, GESTURE_REPEAT_DELAY, GESTURE_REPEAT_RATES,
+)
+
+class GestureDecisionEngine:
+    """Turns per-frame classifications into gesture commands.
+
+    Recent classifications sit in a fixed-size ring buffer and vote with
+    weights that decay with age. A gesture becomes active once its share of
+    the vote reaches its enter score and stays active until it falls below
+    its lower exit score, so a single misread frame neither triggers nor
+    interrupts it; each gesture can have its own pair of scores. An active
+    gesture fires once on entry and then repeats at its configured rate for
+    as long as it is held.
+    """
+
+    def __init__(self, window=GESTURE_WINDOW, decay=GESTURE_RECENCY_DECAY, enter_score=GESTURE_ENTER_SCORE,
+                 exit_score=GESTURE_EXIT_SCORE, repeat_delay=GESTURE_REPEAT_DELAY, repeat_rates=None,
+                 enter_scores=None, exit_scores=None):
+        self.window = window
+        self.enter_score = enter_score  # Defaults for gestures without their own scores
+        self.exit_score = exit_score
+        # Per-gesture thresholds, indexed like GESTURES; NONE never enters
+        self._enter_scores = np.full(len(GESTURES), enter_score, dtype=np.float64)
+        self._exit_scores = np.full(len(GESTURES), exit_score, dtype=np.float64)
+        for scores, overrides in ((self._enter_scores, GESTURE_ENTER_SCORES if enter_scores is None else enter_scores),
+                                  (self._exit_scores, GESTURE_EXIT_SCORES if exit_scores is None else exit_scores)):
+            for name, score in overrides.items():
+                scores[list(GESTURES).index(name)] = score
+        for name, enter, exit_ in zip(GESTURES[1:], self._enter_scores[1:], self._exit_scores[1:]):
+            if exit_ > enter:
+                raise ValueError(f"Exit score of {name} must not be above its enter score")
+        self.repeat_delay = repeat_delay  # Seconds a gesture must be held before it starts repeating
+        self.repeat_rates = dict(GESTURE_REPEAT_RATES if repeat_rates is None else repeat_rates)  # Repeats per second
+
+        self._labels = np.zeros(window, dtype=np.int64)  # Ring buffer of indices into GESTURES
+        self._pos = 0
+        self._filled = 0
+        self._decay = decay ** np.arange(window, dtype=np.float64)  # Weight by age, newest first
+        self._index = {name: i for i, name in enumerate(GESTURES)}
+
+        self.active = None  # Name of the gesture currently held
+        self._next_repeat = None
+        self._run_label = 0  # Label of the current run of identical classifications
+        self._run_start = None  # Timestamp of that run's first frame
+        self.latencies = deque(maxlen=200)  # Seconds from gesture onset to its first command
+
+    def reset(self):
+        self._pos = 0
+        self._filled = 0
+        self.active = None
+        self._next_repeat = None
+        self._run_label = 0
+        self._run_start = None
+
+    def scores(self):
+        """Weighted vote share of every gesture over the current window"""
+        if self._filled == 0:
+            return np.zeros(len(GESTURES))
+        # Newest entry first, so it gets weight decay**0
+        order = (self._pos - 1 - np.arange(self._filled)) % self.window
+        totals = np.bincount(self._labels[order], weights=self._decay[:self._filled], minlength=len(GESTURES))
+        # Divide by the full window's weight so slots not filled yet count as NONE
+        return totals / self._decay.sum()
+
+    def update(self, gesture, timestamp=None):
+        """Add one frame's classification and return a gesture to act on, or None"""
+        now = time.monotonic() if timestamp is None else timestamp
+        label = self._index.get(gesture, 0)
+        self._labels[self._pos] = label
+        self._pos = (self._pos + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+
+        if label != self._run_label:
+            self._run_label = label
+            self._run_start = now
+
+        scores = self.scores()
+        if self.active is not None and scores[self._index[self.active]] < self._exit_scores[self._index[self.active]]:
+            self.active = None
+            self._next_repeat = None
+
+        if self.active is None:
+            # Strongest of the gestures that reached their own enter score
+            entering = np.where(scores >= self._enter_scores, scores, -1.0)
+            best = int(np.argmax(entering[1:])) + 1
+            if entering[best] >= 0:
+                self.active = str(GESTURES[best])
+                self._next_repeat = now + self.repeat_delay
+                onset = self._run_start if self._run_label == best else now
+                self.latencies.append(now - onset)
+                return self.active
+            return None
+
+        rate = self.repeat_rates.get(self.active, 0)
+        if rate > 0 and now >= self._next_repeat:
+            # Step from the previous deadline so the repeat rate doesn't drift with frame timing,
+            # but restart from now once a stall has left it behind, so repeats never burst
+            self._next_repeat += 1.0 / rate
+            if self._next_repeat <= now:
+                self._next_repeat = now + 1.0 / rate
+            return self.active
+        return None
+
+    def latency_summary(self):
+        """Decision latency in milliseconds: last, mean, p50 and p95"""
+        if not self.latencies:
+            return None
+        samples = np.asarray(self.latencies) * 1000
+        p50, p95 = np.percentile(samples, [50, 95])
+        return {"last_ms": float(samples[-1]), "mean_ms": float(samples.mean()), "p50_ms": float(p50), "p95_ms": float(p95)}
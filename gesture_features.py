@@ -0,0 +1,98 @@
+from itertools import chain
+from operator import attrgetter
+import numpy as np
+
+# MediaPipe hand landmark indices used by the gesture rules
+WRIST = 0
+THUMB_TIP = 4
+FINGER_MCPS = [5, 9, 13, 17]  # Index, middle, ring, pinky bases
+FINGER_TIPS = [8, 12, 16, 20]  # Index, middle, ring, pinky tips
+NUM_LANDMARKS = 21
+
+GESTURES = np.array(["NONE", "FORWARD", "BACKWARD", "UP", "DOWN", "LEFT", "RIGHT"])
+
+_xyz = attrgetter("x", "y", "z")
+
+def landmarks_to_array(hand_landmarks, out=None):
+    """Convert MediaPipe hand landmarks into a (21, 3) float array of x, y, z"""
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 3), dtype=np.float64)
+    # Stream the coordinates into one array instead of writing 63 elements one at a time
+    coords = np.fromiter(chain.from_iterable(map(_xyz, hand_landmarks.landmark)), np.float64, NUM_LANDMARKS * 3)
+    out[:] = coords.reshape(NUM_LANDMARKS, 3)
+    return out
+
+def gesture_indices(points, threshold):
+    """Classify a (N, 21, 3) batch of hands and return indices into GESTURES"""
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 2:
+        points = points[np.newaxis]
+
+    wrist = points[:, WRIST]
+    thumb_tip = points[:, THUMB_TIP]
+    tips_y = points[:, FINGER_TIPS, 1]
+    bases_y = points[:, FINGER_MCPS, 1]
+
+    # Finger extension and curl for all four fingers at once, shape (N, 4)
+    finger_threshold = threshold * 0.8  # Reduced threshold
+    extended = tips_y < bases_y - finger_threshold
+    pointing_down = tips_y > bases_y + finger_threshold
+    fist = ~extended.any(axis=1)
+    ring_pinky_closed = ~extended[:, 2] & ~extended[:, 3]
+
+    # FORWARD: Index and middle fingers extended, others closed (peace sign)
+    forward = (
+        extended[:, 0] & extended[:, 1] & ring_pinky_closed
+        & (tips_y[:, 0] < wrist[:, 1] - finger_threshold)
+    )
+
+    # BACKWARD: Index and middle fingers pointing down and roughly aligned
+    backward = (
+        pointing_down[:, 0] & pointing_down[:, 1] & ring_pinky_closed
+        & (np.abs(tips_y[:, 0] - tips_y[:, 1]) < threshold)
+    )
+
+    # Directional controls using thumb position relative to wrist
+    up = fist & (thumb_tip[:, 1] < wrist[:, 1] - threshold)
+    down = fist & (thumb_tip[:, 1] > wrist[:, 1] + threshold)
+    left = fist & (thumb_tip[:, 0] < wrist[:, 0] - threshold)
+    right = fist & (thumb_tip[:, 0] > wrist[:, 0] + threshold)
+
+    # np.select keeps the first matching rule, matching the original if-chain order
+    return np.select([forward, backward, up, down, left, right], [1, 2, 3, 4, 5, 6], 0)
+
+def classify_hand(points, threshold):
+    """Classify one (21, 3) hand and return its gesture name.
+
+    Same rules as gesture_indices, as scalar comparisons: for a single hand
+    that is far cheaper than building the (N, 4) masks and np.select.
+    """
+    (wrist_x, wrist_y), (thumb_x, thumb_y) = points[WRIST, :2].tolist(), points[THUMB_TIP, :2].tolist()
+    index_tip, middle_tip, ring_tip, pinky_tip = points[FINGER_TIPS, 1].tolist()
+    index_base, middle_base, ring_base, pinky_base = points[FINGER_MCPS, 1].tolist()
+
+    finger_threshold = threshold * 0.8  # Reduced threshold
+    index_extended = index_tip < index_base - finger_threshold
+    middle_extended = middle_tip < middle_base - finger_threshold
+    ring_pinky_closed = not (ring_tip < ring_base - finger_threshold) and not (pinky_tip < pinky_base - finger_threshold)
+
+    if index_extended and middle_extended and ring_pinky_closed and index_tip < wrist_y - finger_threshold:
+        return "FORWARD"
+    if (index_tip > index_base + finger_threshold and middle_tip > middle_base + finger_threshold
+            and ring_pinky_closed and abs(index_tip - middle_tip) < threshold):
+        return "BACKWARD"
+    if index_extended or middle_extended or not ring_pinky_closed:
+        return "NONE"  # The thumb gestures all need a fist
+    if thumb_y < wrist_y - threshold:
+        return "UP"
+    if thumb_y > wrist_y + threshold:
+        return "DOWN"
+    if thumb_x < wrist_x - threshold:
+        return "LEFT"
+    if thumb_x > wrist_x + threshold:
+        return "RIGHT"
+    return "NONE"
+
+def classify_batch(points, threshold):
+    """Classify a (N, 21, 3) batch of hands and return an array of gesture names"""
+    return GESTURES[gesture_indices(points, threshold)]
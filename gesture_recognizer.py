@@ -1,15 +1,31 @@
-import cv2
-import mediapipe as mp
 import numpy as np
-from PyQt5.QtCore import QThread, pyqtSignal
-
-class GestureRecognizer(QThread):
-    gesture_detected = pyqtSignal(str)
-    frame_ready = pyqtSignal(object)
-    status_changed = pyqtSignal(bool)
-
-    def __init__(self, threshold=0.1):  # Lowered threshold from 0.2 to 0.1
-        super().__init__()
+import gesture_features
+from gesture_classifier import RuleClassifier, load_classifier
+from config import GESTURE_CLASSIFIER_PATH
+
+class GestureRecognizer:
+    """MediaPipe hand model and gesture classifier; InferenceWorker drives it and owns debouncing"""
+
+    def __init__(self, threshold=0.1, classifier=None, load_model=True):  # Lowered threshold from 0.2 to 0.1
+        # MediaPipe is imported and Hands built by load(); pass load_model=False to do that later on another thread
+        self.mp_hands = None
+        self.hands = None
+        self.mp_drawing = None
+        if load_model:
+            self.load()
+        # Trained model from config.py if one is set, otherwise the threshold rules; threshold only applies to the rules
+        if classifier is None:
+            classifier = load_classifier(GESTURE_CLASSIFIER_PATH) if GESTURE_CLASSIFIER_PATH else RuleClassifier(threshold)
+        self.classifier = classifier
+        self._points = np.empty((21, 3), dtype=np.float64)  # Reused landmark array for per-frame classification
+        # Per-frame classifications before debouncing; a plain dict, read only when metrics are scraped
+        self.counts = dict.fromkeys(gesture_features.GESTURES.tolist(), 0)
+
+    def load(self):
+        """Import MediaPipe and build the Hands model, if not done yet; takes the better part of a second"""
+        if self.hands is not None:
+            return
+        import mediapipe as mp
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             static_image_mode=False, 
@@ -18,117 +34,45 @@ class GestureRecognizer(QThread):
             min_tracking_confidence=0.3    # Lowered from 0.5
         )
         self.mp_drawing = mp.solutions.drawing_utils
-        self.running = True
-        self.threshold = threshold
-        self.prev_gesture = None
-        self.gesture_count = 0
-        self.gesture_threshold = 2  # Lowered from 3 to require fewer consistent detections
-
-    def run(self):
-        try:
-            cap = cv2.VideoCapture(0)
-            if not cap.isOpened():
-                print("Error: Could not open camera.")
-                self.status_changed.emit(False)
-                return
-
-            while self.running:
-                success, frame = cap.read()
-                if not success:
-                    break
-
-                gesture = self.recognize_gesture(frame)
-                if gesture and gesture != "NONE":
-                    if gesture == self.prev_gesture:
-                        self.gesture_count += 1
-                    else:
-                        self.gesture_count = 1
-                    
-                    if self.gesture_count >= self.gesture_threshold:
-                        self.gesture_detected.emit(gesture)
-                        self.gesture_count = 0
-                    
-                    self.prev_gesture = gesture
 
-                if cv2.waitKey(5) & 0xFF == 27:  # Press 'Esc' to exit
-                    break
+    def recognize_gesture(self, frame, annotate=True):
+        import cv2  # Imported on first use, so building a recognizer on the GUI thread stays cheap
 
-            cap.release()
-            cv2.destroyAllWindows()
-            self.status_changed.emit(False)
-        except Exception as e:
-            print(f"Gesture Recognition Error: {e}")
-            self.status_changed.emit(False)
-
-    def stop(self):
-        self.running = False
-
-    def recognize_gesture(self, frame):
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         results = self.hands.process(rgb_frame)
         
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame, 
-                    hand_landmarks, 
-                    self.mp_hands.HAND_CONNECTIONS
-                )
+                if annotate:
+                    self.draw(frame, hand_landmarks)
                 return self.determine_gesture(hand_landmarks)
-        
-        return "NONE"
-
-    def determine_gesture(self, landmarks):
-        def get_landmark_coordinates(landmark):
-            return (landmark.x, landmark.y, landmark.z)
-
-        # Get key landmarks
-        wrist = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.WRIST])
-        thumb_tip = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP])
-        index_tip = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP])
-        middle_tip = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP])
-        ring_tip = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP])
-        pinky_tip = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP])
 
-        # Get finger base points for better angle calculation
-        index_base = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_MCP])
-        middle_base = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_MCP])
-        ring_base = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_MCP])
-        pinky_base = get_landmark_coordinates(landmarks.landmark[self.mp_hands.HandLandmark.PINKY_MCP])
+        return "NONE"
 
-        # Calculate if fingers are extended with lower threshold
-        thumb_open = thumb_tip[1] < wrist[1] - self.threshold
-        index_extended = index_tip[1] < index_base[1] - self.threshold * 0.8  # Reduced threshold
-        middle_extended = middle_tip[1] < middle_base[1] - self.threshold * 0.8  # Reduced threshold
-        ring_extended = ring_tip[1] < ring_base[1] - self.threshold * 0.8  # Reduced threshold
-        pinky_extended = pinky_tip[1] < pinky_base[1] - self.threshold * 0.8  # Reduced threshold
+    def infer(self, rgb_frame):
+        """Run hand detection on an RGB frame and return (landmarks, gesture)"""
+        results = self.hands.process(rgb_frame)
 
-        # FORWARD: Index and middle fingers extended, others closed (peace sign)
-        if index_extended and middle_extended and not ring_extended and not pinky_extended:
-            if index_tip[1] < wrist[1] - self.threshold * 0.8:  # Reduced threshold
-                return "FORWARD"
+        if results.multi_hand_landmarks:
+            hand_landmarks = results.multi_hand_landmarks[0]
+            return hand_landmarks, self.determine_gesture(hand_landmarks)
 
-        # BACKWARD: Index and middle fingers pointing down
-        if index_tip[1] > index_base[1] + self.threshold * 0.8 and middle_tip[1] > middle_base[1] + self.threshold * 0.8:
-            if not ring_extended and not pinky_extended:
-                if abs(index_tip[1] - middle_tip[1]) < self.threshold:  # Ensure fingers are roughly aligned
-                    return "BACKWARD"
+        return None, "NONE"
 
-        # Directional controls using thumb position relative to wrist
-        # UP: Thumb pointing up
-        if thumb_tip[1] < wrist[1] - self.threshold and not any([index_extended, middle_extended, ring_extended, pinky_extended]):
-            return "UP"
-        
-        # DOWN: Thumb pointing down
-        if thumb_tip[1] > wrist[1] + self.threshold and not any([index_extended, middle_extended, ring_extended, pinky_extended]):
-            return "DOWN"
-        
-        # LEFT: Thumb pointing left
-        if thumb_tip[0] < wrist[0] - self.threshold and not any([index_extended, middle_extended, ring_extended, pinky_extended]):
-            return "LEFT"
-        
-        # RIGHT: Thumb pointing right
-        if thumb_tip[0] > wrist[0] + self.threshold and not any([index_extended, middle_extended, ring_extended, pinky_extended]):
-            return "RIGHT"
+    def draw(self, frame, hand_landmarks):
+        """Draw hand landmarks onto a frame in place"""
+        self.mp_drawing.draw_landmarks(
+            frame,
+            hand_landmarks,
+            self.mp_hands.HAND_CONNECTIONS
+        )
 
-        return "NONE"
\ No newline at end of file
+    def determine_gesture(self, landmarks):
+        points = gesture_features.landmarks_to_array(landmarks, out=self._points)
+        gesture = self.classifier.predict(points)
+        self.counts[gesture] += 1
+        return gesture
+
+    def classify_batch(self, points):
+        """Label a (N, 21, 3) array of recorded hands in one call"""
+        return self.classifier.predict_batch(points)
@@ -0,0 +1,184 @@
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from config import INFERENCE_POOL_WORKERS, INFERENCE_POOL_SLOTS_PER_WORKER, GESTURE_CLASSIFIER_PATH
+
+def default_worker_count(cameras):
+    """One worker per camera, as far as spare cores allow"""
+    cores = os.cpu_count() or 1
+    # Leave a core for the GUI, camera threads and the web views
+    return max(1, min(cores - 1, cameras))
+
+class InferencePool:
+    """Hand inference in worker processes for hosts driving several cameras.
+
+    Each worker process owns its MediaPipe Hands models (one per camera it
+    serves) so inference runs outside the GUI process and its GIL. Frames are
+    copied once into a per-camera block of shared memory; only small task
+    tuples and the resulting (21, 3) landmark arrays cross process boundaries.
+    Results are tagged with camera id and frame sequence number.
+
+    Each camera is pinned to exactly one worker, so its Hands model sees
+    every submitted frame in order and keeps tracking the hand instead of
+    falling back to palm detection. Parallelism comes from cameras, not from
+    splitting one camera's frames; workers beyond the camera count would sit
+    idle, so there are never more workers than cameras.
+    """
+
+    def __init__(self, frame_shape, cameras=1, workers=INFERENCE_POOL_WORKERS,
+                 slots_per_worker=INFERENCE_POOL_SLOTS_PER_WORKER, threshold=0.1,
+                 classifier_path=GESTURE_CLASSIFIER_PATH):
+        self.frame_shape = tuple(frame_shape)
+        self.cameras = cameras
+        self.workers = min(workers or default_worker_count(cameras), cameras)
+        self.stats = {"submitted": 0, "dropped": 0, "completed": 0, "stale": 0}
+
+        # One worker per camera; with fewer workers than cameras, cameras share a worker
+        self._camera_worker = {c: c % self.workers for c in range(cameras)}
+        self._latest_seq = dict.fromkeys(range(cameras), -1)
+
+        frame_bytes = int(np.prod(self.frame_shape))
+        self._shm = {}
+        self._frames = {}
+        self._free_slots = {}
+        for camera_id in range(cameras):
+            slots = slots_per_worker
+            block = shared_memory.SharedMemory(create=True, size=slots * frame_bytes)
+            self._shm[camera_id] = block
+            self._frames[camera_id] = np.ndarray((slots,) + self.frame_shape, dtype=np.uint8, buffer=block.buf)
+            self._free_slots[camera_id] = list(range(slots))
+
+        context = multiprocessing.get_context("spawn")
+        self._results = context.Queue()
+        self._tasks = [context.Queue() for _ in range(self.workers)]
+        shm_specs = {camera_id: (block.name, len(self._free_slots[camera_id])) for camera_id, block in self._shm.items()}
+        self._processes = [
+            context.Process(
+                target=_worker_main,
+                args=(worker_id, shm_specs, self.frame_shape, self._tasks[worker_id], self._results,
+                      threshold, classifier_path),
+                daemon=True,
+            )
+            for worker_id in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def free_slots(self, camera_id):
+        return len(self._free_slots[camera_id])
+
+    def submit(self, camera_id, seq, frame, timestamp=None):
+        """Queue a BGR frame for inference; returns False if the camera has no free slot"""
+        if frame.shape != self.frame_shape:
+            raise ValueError(f"Expected frames of shape {self.frame_shape}, got {frame.shape}")
+        free_slots = self._free_slots[camera_id]
+        if not free_slots:
+            # Workers are behind; dropping keeps latency bounded instead of queueing stale frames
+            self.stats["dropped"] += 1
+            return False
+
+        slot = free_slots.pop()
+        np.copyto(self._frames[camera_id][slot], frame)
+        worker_id = self._camera_worker[camera_id]
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self._tasks[worker_id].put((camera_id, seq, slot, timestamp))
+        self.stats["submitted"] += 1
+        return True
+
+    def get_result(self, timeout=None):
+        """Return the next result dict, or None on timeout. Results older than one
+        already delivered for the same camera are discarded."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                camera_id, seq, slot, landmarks, gesture, timestamp, infer_ms, worker_id = self._results.get(timeout=remaining)
+            except queue.Empty:
+                return None
+
+            self._free_slots[camera_id].append(slot)
+            self.stats["completed"] += 1
+            if seq < self._latest_seq[camera_id]:
+                self.stats["stale"] += 1
+                continue
+            self._latest_seq[camera_id] = seq
+            return {
+                "camera_id": camera_id,
+                "seq": seq,
+                "landmarks": landmarks,  # (21, 3) float32 array, or None when no hand was found
+                "gesture": gesture,
+                "timestamp": timestamp,
+                "infer_ms": infer_ms,
+                "worker_id": worker_id,
+            }
+
+    def close(self):
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._frames.clear()
+        for block in self._shm.values():
+            block.close()
+            block.unlink()
+        self._shm.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _worker_main(worker_id, shm_specs, frame_shape, tasks, results, threshold, classifier_path):
+    """Worker process loop: one Hands model per camera, frames read from shared memory"""
+    import cv2
+    import mediapipe as mp
+    from gesture_classifier import RuleClassifier, load_classifier
+
+    blocks = {}
+    frames = {}
+    for camera_id, (name, slots) in shm_specs.items():
+        # Spawned workers share the parent's resource tracker, and the parent unlinks the block
+        block = shared_memory.SharedMemory(name=name)
+        blocks[camera_id] = block
+        frames[camera_id] = np.ndarray((slots,) + tuple(frame_shape), dtype=np.uint8, buffer=block.buf)
+
+    classifier = load_classifier(classifier_path) if classifier_path else RuleClassifier(threshold)
+    hands = {}
+    points = np.empty((21, 3), dtype=np.float32)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            camera_id, seq, slot, timestamp = task
+            if camera_id not in hands:
+                hands[camera_id] = mp.solutions.hands.Hands(
+                    static_image_mode=False,
+                    max_num_hands=1,
+                    min_detection_confidence=0.3,
+                    min_tracking_confidence=0.3
+                )
+
+            start = time.perf_counter()
+            rgb_frame = cv2.cvtColor(frames[camera_id][slot], cv2.COLOR_BGR2RGB)
+            output = hands[camera_id].process(rgb_frame)
+            landmarks, gesture = None, "NONE"
+            if output.multi_hand_landmarks:
+                for i, landmark in enumerate(output.multi_hand_landmarks[0].landmark):
+                    points[i] = (landmark.x, landmark.y, landmark.z)
+                landmarks = points.copy()
+                gesture = classifier.predict(landmarks)
+            infer_ms = (time.perf_counter() - start) * 1000
+            results.put((camera_id, seq, slot, landmarks, gesture, timestamp, infer_ms, worker_id))
+    finally:
+        for hand_model in hands.values():
+            hand_model.close()
+        frames.clear()
+        for block in blocks.values():
+            block.close()
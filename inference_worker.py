@@ -0,0 +1,65 @@
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+from gesture_recognizer import GestureRecognizer
+from adaptive_frontend import AdaptiveFrontEnd
+from gesture_decision import GestureDecisionEngine
+from latency import latency_tracker, new_trace
+from startup import startup_timer
+from metrics import metrics
+
+errors = metrics.counter("errors_total", "Errors caught and logged", ("where",))
+
+class InferenceWorker(QThread):
+    """Runs MediaPipe hand inference off the GUI thread"""
+    landmarks_ready = pyqtSignal(object)  # Hand landmarks, or None when no hand is visible
+    gesture_ready = pyqtSignal(str, object)  # Debounced gesture command and its latency trace
+    model_loaded = pyqtSignal()  # MediaPipe is ready and frames are being processed
+
+    def __init__(self, frame_consumer, gesture_recognizer=None):
+        super().__init__()
+        self.frame_consumer = frame_consumer  # FrameConsumer reading from the camera's FrameRing
+        self.gesture_recognizer = gesture_recognizer or GestureRecognizer()
+        self.front_end = AdaptiveFrontEnd(self.gesture_recognizer)
+        self.decision_engine = GestureDecisionEngine()
+        self.running = True
+
+    def run(self):
+        # A recognizer built with load_model=False loads MediaPipe here, off the GUI thread
+        with startup_timer.phase("mediapipe"):
+            self.gesture_recognizer.load()
+        self.model_loaded.emit()
+
+        while self.running:
+            # Block briefly instead of spinning so stop() is still noticed
+            seq, frame = self.frame_consumer.read(timeout=0.1)
+            if frame is None:
+                # A closed ring has no frames left; read() would return at once and spin
+                if self.frame_consumer.ring.closed:
+                    break
+                continue
+
+            try:
+                self.process_frame(frame, self.frame_consumer.ring.timestamp(seq), seq)
+            except Exception as e:
+                errors.inc(where="inference_worker")
+                print(f"Error in inference worker: {str(e)}")
+
+    def process_frame(self, frame, timestamp=None, seq=None):
+        trace = new_trace(timestamp)
+        latency_tracker.record_since("queue", trace["capture"])
+
+        hand_landmarks, gesture, inferred = self.front_end.process(frame)
+        # frame is a view into the ring; if the camera wrapped around to its slot meanwhile, the result is from a torn frame
+        if seq is not None and not self.frame_consumer.ring.is_valid(seq):
+            self.frame_consumer.discard()
+            return
+        decision = self.decision_engine.update(gesture, trace["capture"])
+
+        # The preview renders frames on its own timer; it only needs the landmarks
+        self.landmarks_ready.emit(hand_landmarks)
+        if decision is not None:
+            trace["decided"] = time.monotonic()
+            self.gesture_ready.emit(decision, trace)
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# Pipeline stages from camera capture to the panorama update, in order
+STAGES = (
+    "capture",           # cap.read() in CameraThread.run
+    "queue",             # Frame committed to the ring until the inference worker picks it up
+    "convert",           # Crop, resize and colour conversion
+    "process",           # Hands.process
+    "classify",          # determine_gesture
+    "handle_gesture",    # Decision in the worker until MainWindow.handle_gesture runs
+    "run_javascript",    # page().runJavaScript dispatch until the script has executed
+    "panorama_applied",  # Dispatch until the page confirms setPosition/setPov took effect
+    "total",             # Capture until the panorama update was confirmed
+)
+
+BUCKET_EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+class StageHistogram:
+    """Fixed-bucket histogram plus a window of recent samples for percentiles"""
+
+    def __init__(self, edges=BUCKET_EDGES_MS, recent=500):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(edges) + 1, dtype=np.int64)  # Last bucket is everything above the top edge
+        self.recent = deque(maxlen=recent)
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        self.counts[np.searchsorted(self.edges, ms, side="left")] += 1
+        self.recent.append(ms)
+        self.total_ms += ms
+
+    def summary(self):
+        count = int(self.counts.sum())
+        if count == 0:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(np.asarray(self.recent), [50, 95, 99])
+        return {
+            "count": count,
+            "mean_ms": self.total_ms / count,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "buckets": {f"le_{edge:g}": int(c) for edge, c in zip(self.edges, np.cumsum(self.counts[:-1]))},
+        }
+
+class LatencyTracker:
+    """Thread-safe per-stage latency histograms, queryable while the kiosk runs"""
+
+    def __init__(self, stages=STAGES):
+        self._lock = threading.Lock()
+        self._histograms = {stage: StageHistogram() for stage in stages}
+
+    def record(self, stage, ms):
+        with self._lock:
+            self._histograms[stage].add(ms)
+
+    def record_since(self, stage, start, end=None):
+        """Record the time from a monotonic start timestamp to end (default: now)"""
+        end = time.monotonic() if end is None else end
+        self.record(stage, (end - start) * 1000)
+
+    def summary(self):
+        with self._lock:
+            return {stage: histogram.summary() for stage, histogram in self._histograms.items()}
+
+    def histograms(self):
+        """Per stage (bucket edges, bucket counts, total ms), copied so they can be read without the lock"""
+        with self._lock:
+            return {stage: (h.edges, h.counts.copy(), h.total_ms) for stage, h in self._histograms.items()}
+
+    def reset(self):
+        with self._lock:
+            for stage in self._histograms:
+                self._histograms[stage] = StageHistogram()
+
+    def overlay_lines(self):
+        lines = []
+        for stage, summary in self.summary().items():
+            if summary["count"]:
+                lines.append(f"{stage:<16}{summary['p50_ms']:6.1f} {summary['p95_ms']:6.1f}")
+        return lines
+
+# Shared tracker that every stage of the kiosk records into
+latency_tracker = LatencyTracker()
+
+def new_trace(capture_timestamp=None):
+    """Timestamps carried with a frame and the gesture decided from it"""
+    return {"capture": time.monotonic() if capture_timestamp is None else capture_timestamp}
+
+def draw_overlay(frame, lines, scale=None):
+    """Draw latency lines (stage, p50, p95 in ms) onto an RGB frame in place"""
+    import cv2
+
+    if not lines:
+        return
+    scale = scale or frame.shape[1] / 900
+    line_height = int(26 * scale) + 2
+    cv2.putText(frame, "stage           p50    p95 ms", (8, line_height), cv2.FONT_HERSHEY_SIMPLEX,
+                scale * 0.8, (26, 188, 156), max(1, int(scale * 2)), cv2.LINE_AA)
+    for i, line in enumerate(lines, start=2):
+        cv2.putText(frame, line, (8, i * line_height), cv2.FONT_HERSHEY_SIMPLEX,
+                    scale * 0.8, (236, 240, 241), max(1, int(scale * 2)), cv2.LINE_AA)
@@ -1,50 +1,134 @@
 import sys
+from startup import startup_timer  # First, so startup times count from here
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QSplitter, QLabel, QHBoxLayout, QMessageBox
-from PyQt5.QtCore import Qt, QObject, pyqtSlot, QTimer, QThread
-from PyQt5.QtGui import QImage, QPixmap
-from map_view import MapView
+from PyQt5.QtCore import Qt, QObject, pyqtSlot, pyqtSignal, QTimer, QThread
+from map_view import MapView  # QtWebEngine has to be imported before the QApplication exists
 from street_view import StreetView
-from gesture_recognizer import GestureRecognizer
-from config import WINDOW_TITLE, WINDOW_SIZE
-import cv2
-import queue
+from config import (
+    WINDOW_TITLE, WINDOW_SIZE, LATENCY_OVERLAY_ENABLED, GEO_CACHE_PATH, STARTUP_LOG_PATH,
+    CAMERA_INDEX, CAPTURE_PROFILE, CAPTURE_PROFILES, ANALOG_CONTROL_ENABLED, ANALOG_SEND_HZ,
+    METRICS_PORT, METRICS_HOST, METRICS_FILE_PATH, METRICS_FILE_INTERVAL, METRICS_FILE_MAX_BYTES, METRICS_FILE_BACKUPS,
+)
+from geo_cache import GeoCache
+from web_profile import cache_summary, report_cache_size
+from frame_ring import FrameRing
+from analog_control import AnalogViewControl
+from latency import latency_tracker
+from metrics import metrics, serve_metrics, MetricsFileWriter
+import numpy as np
 import time
 from styles import MAIN_STYLE, WELCOME_MESSAGE
+# cv2, MediaPipe and the modules that use them are imported on demand, once the window is up
+
+frames_captured = metrics.counter("frames_captured_total", "Frames read from the camera")
+capture_fps = metrics.gauge("capture_fps", "Frames captured per second, over the last second")
+frames_dropped = metrics.counter("frames_dropped_total", "Frames a consumer skipped because a newer one was ready, or lost when the camera recycled their slot mid-read", ("consumer",))
+inference_frames = metrics.counter("inference_frames_total", "Frames seen by the inference front end", ("result",))
+classifications = metrics.counter("classifications_total", "Per-frame hand classifications, before debouncing", ("gesture",))
+gestures = metrics.counter("gestures_total", "Gesture commands handled; rate() gives gestures per minute", ("gesture",))
+errors = metrics.counter("errors_total", "Errors caught and logged", ("where",))
 
 class CameraThread(QThread):
-    def __init__(self, frame_queue):
+    """Sole owner of the camera; fills a FrameRing shared by all frame consumers"""
+    capture_started = pyqtSignal(bool)  # First frame captured, or False if the camera could not be opened
+
+    def __init__(self, frame_ring, profile=CAPTURE_PROFILE, index=CAMERA_INDEX):
         super().__init__()
-        self.frame_queue = frame_queue
+        self.frame_ring = frame_ring
+        self.profile = profile  # Name in CAPTURE_PROFILES
+        self.index = index
+        self.negotiated = {}  # Settings the camera actually accepted
         self.running = True
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            raise RuntimeError("Could not open camera")
-        
+        self.cap = None  # Opened in run(), so a slow camera doesn't hold up the window
+
     def run(self):
+        startup_timer.begin("camera")
+        from camera_capture import open_capture  # Imports cv2
+        # Opened on this thread, which owns the device from here on
+        self.cap, self.negotiated, problems = open_capture(CAPTURE_PROFILES[self.profile], self.index)
+        for problem in problems:
+            print(f"Capture profile {self.profile}: {problem}")
+        if self.cap is None:
+            print("Error: Could not open camera")
+            self.frame_ring.close()
+            startup_timer.end("camera")
+            self.capture_started.emit(False)
+            return
+        print(f"Camera opened with profile {self.profile}: {self.negotiated}")
+        first_frame = True
+        fps_start, fps_frames = time.monotonic(), 0
+
         while self.running:
-            ret, frame = self.cap.read()
-            if ret:
-                if self.frame_queue.qsize() < 2:  # Prevent queue from growing too large
-                    self.frame_queue.put(frame)
-            time.sleep(0.01)  # Small sleep to prevent thread from hogging CPU
+            buffer = self.frame_ring.next_buffer()
+            start = time.monotonic()
+            if buffer is None:
+                # First frame decides the ring's buffer shape
+                ret, frame = self.cap.read()
+                captured = time.monotonic()
+                if ret:
+                    self.frame_ring.write(frame, captured)
+            else:
+                # Decode straight into the ring slot when the shape still matches
+                ret, frame = self.cap.read(buffer)
+                captured = time.monotonic()
+                if ret:
+                    if frame is buffer or np.shares_memory(frame, buffer):
+                        self.frame_ring.commit(captured)
+                    else:
+                        self.frame_ring.write(frame, captured)
+            if not ret:
+                time.sleep(0.01)  # Only back off when the camera fails; a good read already waits for the next frame
+                continue
+
+            latency_tracker.record_since("capture", start)
+            frames_captured.inc()
+            fps_frames += 1
+            if captured - fps_start >= 1.0:
+                capture_fps.set(fps_frames / (captured - fps_start))
+                fps_start, fps_frames = captured, 0
+            if first_frame:
+                first_frame = False
+                startup_timer.end("camera")
+                self.capture_started.emit(True)
+        self.frame_ring.close()
             
     def stop(self):
         self.running = False
-        self.cap.release()
+        self.wait()
+        if self.cap is not None:
+            self.cap.release()
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, camera_factory=CameraThread, gesture_recognizer=None, backend=None, geo_cache_path=GEO_CACHE_PATH,
+                 analog_control=ANALOG_CONTROL_ENABLED):
         super().__init__()
+        startup_timer.end("imports")
+        startup_timer.begin("window")
         self.setWindowTitle(WINDOW_TITLE)
         self.setGeometry(100, 100, *WINDOW_SIZE)
         self.setStyleSheet(MAIN_STYLE)
 
-        # Show welcome message
-        self.show_welcome_message()
+        # Startup is staged: this constructor only builds the widgets, then the camera,
+        # MediaPipe and both web views start together once the window is showing
+        startup_timer.expect("window", "camera", "mediapipe", "map_view", "street_view")
+        self.backend = backend  # Maps backend for both views; None uses MAPS_BACKEND
+        self.map_view = None
+        self.street_view = None
+        self.gesture_recognizer = gesture_recognizer  # Built in start_gesture_pipeline() unless given
+        self.inference_worker = None
+
+        # Analog control streams turn rates from hand position at a fixed rate instead of 10° steps
+        self.analog_control = None
+        self.sent_view_rate = (0.0, 0.0)
+        self.analog_timer = QTimer(self)
+        self.analog_timer.setInterval(int(1000 / ANALOG_SEND_HZ))
+        self.analog_timer.timeout.connect(self.send_view_rate)
+        self.set_analog_control(analog_control)
 
-        # Initialize frame queue and camera thread
-        self.frame_queue = queue.Queue(maxsize=2)
-        self.camera_thread = CameraThread(self.frame_queue)
+        # Initialize the shared frame ring and the camera thread that owns the device
+        self.frame_ring = FrameRing(capacity=8)
+        self.camera_thread = camera_factory(self.frame_ring)  # Benchmarks pass a frame feeder instead
+        self.camera_thread.capture_started.connect(lambda ok: self.finish_phase("camera"))
         self.camera_thread.start()
 
         central_widget = QWidget()
@@ -65,27 +149,24 @@ class MainWindow(QMainWindow):
         left_layout.addWidget(title_label)
 
         # Map and Street View splitter
-        splitter = QSplitter(Qt.Vertical)
-        splitter.setStyleSheet("""
+        self.splitter = QSplitter(Qt.Vertical)
+        self.splitter.setStyleSheet("""
             QSplitter::handle {
                 background-color: #1abc9c;
                 height: 2px;
             }
         """)
         
-        # Create splitter for map and street view
-        self.map_view = MapView()
-        splitter.addWidget(self.map_view)
-        self.street_view = StreetView()
-        splitter.addWidget(self.street_view)
-        
-        # Connect map view to street view
-        self.map_view.destination_selected.connect(
-            lambda streetLat, streetLng, destLat, destLng: 
-            self.street_view.calculate_route(streetLat, streetLng, destLat, destLng)
-        )
+        # Placeholders until the web views are created in load_web_views()
+        for text in ("Loading map...", "Loading street view..."):
+            placeholder = QLabel(text)
+            placeholder.setAlignment(Qt.AlignCenter)
+            self.splitter.addWidget(placeholder)
+
+        # Shared cache so repeat destinations skip directions and street view lookups
+        self.geo_cache = GeoCache(geo_cache_path) if geo_cache_path else None
 
-        left_layout.addWidget(splitter)
+        left_layout.addWidget(self.splitter)
         main_layout.addWidget(left_widget)
 
         # Right side - Controls and Info (30%)
@@ -104,7 +185,8 @@ class MainWindow(QMainWindow):
         gesture_title.setStyleSheet("font-size: 18px; font-weight: bold; color: #1abc9c;")
         gesture_layout.addWidget(gesture_title)
         
-        self.gesture_view = QLabel()  # Replace with actual class
+        self.gesture_view = QLabel("Starting camera...")
+        self.gesture_view.setAlignment(Qt.AlignCenter)
         self.gesture_view.setFixedSize(320, 240)
         gesture_layout.addWidget(self.gesture_view, alignment=Qt.AlignCenter)
         
@@ -136,63 +218,144 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(right_widget)
 
-        # Setup gesture recognizer with debouncing
-        self.gesture_recognizer = GestureRecognizer()
-        self.gesture_recognizer.gesture_detected.connect(self.handle_gesture)
-        self.last_gesture_time = 0
-        self.gesture_cooldown = 0.5  # Seconds between gesture processing
-        
-        # Setup timer for continuous camera feed updates with reduced frequency
-        self.camera_timer = QTimer()
-        self.camera_timer.timeout.connect(self.update_camera_feed)
-        self.camera_timer.start(50)  # Update every 50ms (20 fps) instead of 33ms
+        # Runs as soon as the event loop starts, i.e. right after the window is first shown
+        QTimer.singleShot(0, self.start_stages)
+        self.finish_phase("window")
+
+    def start_stages(self):
+        """Show the welcome message without blocking and start everything that loads slowly"""
+        self.show_welcome_message()
+        # MediaPipe first, so it loads on its thread while the GUI thread builds the web views
+        self.start_gesture_pipeline()
+        self.load_web_views()
+
+    def start_gesture_pipeline(self):
+        startup_timer.begin("gesture_setup")
+        from gesture_recognizer import GestureRecognizer
+        from inference_worker import InferenceWorker
+        from preview import PreviewRenderer, FrameNotifier
+
+        # Setup gesture recognizer; the model itself loads on the inference thread
+        if self.gesture_recognizer is None:
+            self.gesture_recognizer = GestureRecognizer(load_model=False)
+
+        # Hand inference and the gesture decision engine run on their own thread; the GUI thread only paints
+        self.latest_landmarks = None
+        self.inference_worker = InferenceWorker(self.frame_ring.consumer(), self.gesture_recognizer)
+        self.inference_worker.gesture_ready.connect(self.handle_gesture)
+        self.inference_worker.landmarks_ready.connect(self.on_landmarks_ready)
+        self.inference_worker.model_loaded.connect(lambda: self.finish_phase("mediapipe"))
+        self.inference_worker.start()
+        stats = self.inference_worker.front_end.stats
+        inference_frames.set_function(lambda: stats["inferences"], result="inferred")
+        inference_frames.set_function(lambda: stats["skipped"], result="skipped_no_motion")
+        counts = self.gesture_recognizer.counts
+        for gesture in counts:
+            classifications.set_function(lambda gesture=gesture: counts[gesture], gesture=gesture)
+
+        # The preview has its own frame cursor and timer, independent of inference cadence
+        self.preview_consumer = self.frame_ring.consumer()
+        for name, consumer in (("inference", self.inference_worker.frame_consumer), ("preview", self.preview_consumer)):
+            frames_dropped.set_function(lambda consumer=consumer: consumer.dropped, consumer=name)
+        self.preview_renderer = PreviewRenderer(self.gesture_view, (240, 180), self.gesture_recognizer)
+        if LATENCY_OVERLAY_ENABLED:
+            self.preview_renderer.show_latency_lines = latency_tracker.overlay_lines
+        # Render each new frame as soon as it's committed; no polling timer, and a busy GUI only skips to the newest
+        self.frame_notifier = FrameNotifier(self.frame_ring)
+        self.frame_notifier.frame_available.connect(self.update_camera_feed)
+        self.finish_phase("gesture_setup")
+
+    def load_web_views(self):
+        """Create both web views; their pages, and the Maps API in each, load concurrently"""
+        startup_timer.begin("map_view")
+        self.map_view = MapView(self.geo_cache, self.backend)
+        self.map_view.loadFinished.connect(lambda ok: self.finish_phase("map_view"))
+        self.splitter.replaceWidget(0, self.map_view).deleteLater()
+
+        startup_timer.begin("street_view")
+        self.street_view = StreetView(self.geo_cache, self.backend)
+        self.street_view.loadFinished.connect(lambda ok: self.finish_phase("street_view"))
+        self.splitter.replaceWidget(1, self.street_view).deleteLater()
+
+        # Connect map view to street view
+        self.map_view.destination_selected.connect(
+            lambda streetLat, streetLng, destLat, destLng: 
+            self.street_view.calculate_route(streetLat, streetLng, destLat, destLng)
+        )
+        # Map overlays follow the street view's route and clear once the journey is over
+        self.street_view.route_loaded.connect(self.map_view.show_route)
+        self.street_view.destination_reached.connect(self.map_view.reset)
+
+    def finish_phase(self, name):
+        """End a startup phase and report once the last one is done"""
+        startup_timer.end(name)
+        if startup_timer.complete():
+            report = startup_timer.report()
+            for line in startup_timer.lines(report):
+                print(line)
+            summary = cache_summary()
+            print(f"Web cache: {summary}")
+            report_cache_size(summary["path"])
+            if STARTUP_LOG_PATH:
+                startup_timer.save(STARTUP_LOG_PATH, report)
 
     def update_camera_feed(self):
+        """Render the newest camera frame, with the latest landmarks, into the gesture view"""
+        self.frame_notifier.acknowledge()
         try:
-            if self.frame_queue.empty():
+            seq, frame = self.preview_consumer.read(timeout=0)
+            if frame is None:
                 return
+            self.preview_renderer.render(frame, self.latest_landmarks)
 
-            frame = self.frame_queue.get_nowait()
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            height, width, channel = rgb_frame.shape
-            bytes_per_line = 3 * width
-
-            # Process frame and update gesture view
-            processed_frame = rgb_frame.copy()
-            
-            # Only process gestures if enough time has passed
-            current_time = time.time()
-            if current_time - self.last_gesture_time >= self.gesture_cooldown:
-                if hasattr(self.gesture_recognizer, 'hands') and self.gesture_recognizer.hands:
-                    results = self.gesture_recognizer.hands.process(rgb_frame)
-                    if results.multi_hand_landmarks:
-                        for hand_landmarks in results.multi_hand_landmarks:
-                            self.gesture_recognizer.mp_drawing.draw_landmarks(
-                                processed_frame,
-                                hand_landmarks,
-                                self.gesture_recognizer.mp_hands.HAND_CONNECTIONS
-                            )
-                            gesture = self.gesture_recognizer.determine_gesture(hand_landmarks)
-                            if gesture != "NONE":
-                                self.handle_gesture(gesture)
-                                self.last_gesture_time = current_time
-
-            # Convert and display the processed frame
-            processed_q_image = QImage(processed_frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
-            processed_pixmap = QPixmap.fromImage(processed_q_image)
-            scaled_processed_pixmap = processed_pixmap.scaled(240, 180, Qt.KeepAspectRatio, Qt.FastTransformation)
-            self.gesture_view.setPixmap(scaled_processed_pixmap)
-            
-        except queue.Empty:
-            pass
         except Exception as e:
+            errors.inc(where="camera_feed")
             print(f"Error in camera feed update: {str(e)}")
 
+    def on_landmarks_ready(self, hand_landmarks):
+        self.latest_landmarks = hand_landmarks
+        if self.analog_control is not None:
+            from gesture_features import landmarks_to_array
+            points = None if hand_landmarks is None else landmarks_to_array(hand_landmarks)
+            self.analog_control.update(points, time.monotonic())
+
+    def set_analog_control(self, enabled):
+        """Switch between analog turning from hand position and the discrete turn gestures"""
+        if enabled:
+            if self.analog_control is None:
+                self.analog_control = AnalogViewControl()
+            self.analog_timer.start()
+        else:
+            self.analog_timer.stop()
+            self.analog_control = None
+            self.send_view_rate()  # Stops any turn still in progress
+
+    def send_view_rate(self):
+        """Stream the current turn rate to the street view; a rate of zero is sent once, not every tick"""
+        if self.street_view is None:
+            return
+        rate = (0.0, 0.0) if self.analog_control is None else tuple(self.analog_control.rates)
+        if rate == (0.0, 0.0) and self.sent_view_rate == rate:
+            return
+        # Non-zero rates are resent every tick: the page stops turning if they stop arriving
+        self.street_view.set_view_rate(*rate)
+        self.sent_view_rate = rate
+
     def on_destination_selected(self, lat, lng):
         print(f"Destination selected: {lat}, {lng}")
         self.street_view.set_position(lat, lng, is_destination=True)
 
-    def handle_gesture(self, gesture):
+    def handle_gesture(self, gesture, trace=None):
+        if self.street_view is None:
+            return  # Still starting up
+        if self.analog_control is not None and gesture in ("UP", "DOWN", "LEFT", "RIGHT"):
+            return  # The hand's position already turns the view
+        if trace is not None:
+            latency_tracker.record_since("handle_gesture", trace["decided"])
+            # Hand the trace to StreetView so its JavaScript round trip is measured too
+            self.street_view.set_trace(trace)
+
+        gestures.inc(gesture=gesture)
         print(f"Gesture detected: {gesture}")
         self.current_gesture_label.setText(f"Current Gesture: {gesture}")
         
@@ -210,18 +373,40 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         print("Closing application...")
-        self.camera_timer.stop()
-        
+        if self.inference_worker is not None:
+            self.frame_notifier.frame_available.disconnect(self.update_camera_feed)
+
+        # Stop the inference worker before its frame source goes away
+        if self.inference_worker is not None:
+            self.inference_worker.stop()
+            self.inference_worker.wait()
+            print("Inference worker stopped")
+            print(f"Inference front end: {self.inference_worker.front_end.summary()}")
+            for name, consumer in (("inference", self.inference_worker.frame_consumer), ("preview", self.preview_consumer)):
+                print(f"Frames to {name}: {consumer.consumed} read, {consumer.dropped} skipped or recycled")
+            print(f"Gesture decision latency: {self.inference_worker.decision_engine.latency_summary()}")
+            for stage, summary in latency_tracker.summary().items():
+                if summary["count"]:
+                    print(f"Latency {stage}: p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms")
+
         # Stop and clean up camera thread
+        self.analog_timer.stop()
         if hasattr(self, 'camera_thread'):
             self.camera_thread.stop()
             self.camera_thread.wait()
             print("Camera thread stopped")
-            
-        # Stop gesture recognizer
-        self.gesture_recognizer.stop()
-        self.gesture_recognizer.wait()
-        print("Gesture recognizer stopped")
+
+        if self.street_view is not None:
+            print(f"Panorama prefetch: {self.street_view.prefetcher.summary()}")
+        if not startup_timer.completed:
+            print("Closed before startup finished:")
+            for line in startup_timer.lines():
+                print(line)
+
+        print(f"Web cache: {cache_summary()}")
+        if self.geo_cache is not None:
+            print(f"Geo cache: {self.geo_cache.summary()}")
+            self.geo_cache.close()
         super().closeEvent(event)
 
     def show_welcome_message(self):
@@ -245,10 +430,31 @@ class MainWindow(QMainWindow):
                 background-color: #16a085;
             }
         """)
-        msg.exec_()
+        # Not exec_(): the message must not hold up the rest of startup
+        self.welcome_message = msg
+        msg.open()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    # Fleet monitoring: Prometheus text on a local port and/or periodic snapshots to a rolling file
+    # Both are off unless configured
+    metrics_server = None
+    if METRICS_PORT:
+        try:
+            metrics_server = serve_metrics(METRICS_PORT, METRICS_HOST)
+            print(f"Serving metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            print(f"Error starting metrics endpoint on port {METRICS_PORT}: {e}")
+    metrics_file = None
+    if METRICS_FILE_PATH:
+        metrics_file = MetricsFileWriter(METRICS_FILE_PATH, METRICS_FILE_INTERVAL, METRICS_FILE_MAX_BYTES,
+                                         METRICS_FILE_BACKUPS).start()
     window = MainWindow()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    status = app.exec_()
+    if metrics_server is not None:
+        metrics_server.shutdown()
+        metrics_server.server_close()
+    if metrics_file is not None:
+        metrics_file.stop()
+    sys.exit(status)
\ No newline at end of file
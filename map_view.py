@@ -1,31 +1,75 @@
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import pyqtSignal, QUrl, QTimer, pyqtSlot
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 from PyQt5.QtWebChannel import QWebChannel
-from config import GOOGLE_MAPS_API_KEY
+import json
+from maps_backend import get_backend
+from web_profile import use_shared_profile
+
+class MapBridge(QObject):
+    """Channel object for the map page: clicks come in through slots, updates go out as signals"""
+    # Updates the page applies to its existing map and overlays
+    centerRequested = pyqtSignal(float, float, int)
+    routeRequested = pyqtSignal(str)  # JSON [[lat, lng], ...]; '[]' hides the route
+    resetRequested = pyqtSignal()
+
+    def __init__(self, map_view):
+        super().__init__()
+        self._map_view = map_view
+
+    @pyqtSlot(float, float, float, float)
+    def destinationSelected(self, streetLat, streetLng, destLat, destLng):
+        """Slot to receive destination coordinates from JavaScript"""
+        print(f"Destination selected: {streetLat}, {streetLng} to {destLat}, {destLng}")
+        self._map_view.destination_selected.emit(streetLat, streetLng, destLat, destLng)
+
+    @pyqtSlot(float, float, result=str)
+    def cachedPanorama(self, lat, lng):
+        """Cached street view lookup for a clicked point as JSON, or '' on a miss"""
+        geo_cache = self._map_view.geo_cache
+        if geo_cache is None:
+            return ""
+        cached = geo_cache.get_panorama(lat, lng, 50, "outdoor")
+        return json.dumps(cached) if cached is not None else ""
+
+    @pyqtSlot(float, float, str, float, float)
+    def panoramaFound(self, lat, lng, pano_id, streetLat, streetLng):
+        """Slot to store a street view lookup made by the page"""
+        geo_cache = self._map_view.geo_cache
+        if geo_cache is not None:
+            geo_cache.put_panorama(lat, lng, 50, {"pano": pano_id, "lat": streetLat, "lng": streetLng}, "outdoor")
 
 class MapView(QWebEngineView):
     destination_selected = pyqtSignal(float, float, float, float)
 
-    def __init__(self):
+    def __init__(self, geo_cache=None, backend=None):
         super().__init__()
+        use_shared_profile(self)  # Disk HTTP cache shared with the other view and across launches
+        self.geo_cache = geo_cache  # GeoCache for street view lookups on click, or None
+        self.backend = backend or get_backend()  # Where the Maps JavaScript API comes from
         # Stony Brook University coordinates
         self.default_lat = 40.9156
         self.default_lng = -73.1228
-        
+        self.default_zoom = 15
+
         # Setup web channel for communication
         self.channel = QWebChannel()
         self.page().setWebChannel(self.channel)
-        self.channel.registerObject('mapBridge', self)
-        
-        # Add a timer to throttle map updates
-        self.update_timer = QTimer()
-        self.update_timer.setSingleShot(True)
-        self.update_timer.setInterval(100)  # 100ms throttle
-        self.update_timer.timeout.connect(self.load_map)
-        
-        # Initial map load
+        self.bridge = MapBridge(self)
+        self.channel.registerObject('mapBridge', self.bridge)
+
+        # The page is loaded once; later updates go through the bridge and reuse its overlays
         self.load_map()
-        self.destination_selected_flag = False
+
+    def set_center(self, lat, lng, zoom=None):
+        self.bridge.centerRequested.emit(lat, lng, self.default_zoom if zoom is None else zoom)
+
+    def show_route(self, points):
+        """Draw a route ([[lat, lng], ...]) over the map, replacing any previous one"""
+        self.bridge.routeRequested.emit(json.dumps([[round(lat, 7), round(lng, 7)] for lat, lng in points]))
+
+    def reset(self):
+        """Clear the destination and route and recenter, ready for the next user"""
+        self.bridge.resetRequested.emit()
 
     def load_map(self):
         html = f"""
@@ -33,7 +77,7 @@ class MapView(QWebEngineView):
         <html>
         <head>
             <title>Map</title>
-            <script async defer src="https://maps.googleapis.com/maps/api/js?key={GOOGLE_MAPS_API_KEY}&libraries=geometry&callback=initMap"></script>
+            <script async defer src="{self.backend.script_url(callback='initMap')}"></script>
             <style>
                 #map {{ height: 100%; width: 100%; }}
                 html, body {{ height: 100%; margin: 0; padding: 0; }}
@@ -43,21 +87,38 @@ class MapView(QWebEngineView):
             <div id="map"></div>
             <script>
                 var map;
-                var marker;
                 var streetViewService;
                 var clickTimeout = null;
-                
+                var mapBridge = null;
+                var destinationSelected = false;
+
+                // Overlays are created once and then moved, shown or hidden, never recreated
+                var destinationMarker;
+                var startMarker;
+                var destinationLine;
+                var routeLine;
+
                 async function initMap() {{
                     try {{
                         await loadQWebChannel();
-                        
+
                         map = new google.maps.Map(document.getElementById('map'), {{
                             center: {{lat: {self.default_lat}, lng: {self.default_lng}}},
-                            zoom: 15,
+                            zoom: {self.default_zoom},
                             gestureHandling: 'cooperative'  // Improve scrolling behavior
                         }});
 
                         streetViewService = new google.maps.StreetViewService();
+                        createOverlays();
+
+                        new QWebChannel(qt.webChannelTransport, function(channel) {{
+                            mapBridge = channel.objects.mapBridge;
+                            mapBridge.centerRequested.connect(setCenter);
+                            mapBridge.routeRequested.connect(function(routeJson) {{
+                                showRoute(JSON.parse(routeJson));
+                            }});
+                            mapBridge.resetRequested.connect(resetMap);
+                        }});
 
                         // Throttle click events
                         map.addListener('click', function(e) {{
@@ -73,80 +134,129 @@ class MapView(QWebEngineView):
                     }}
                 }}
 
+                function createOverlays() {{
+                    destinationMarker = new google.maps.Marker({{
+                        map: null,
+                        position: map.getCenter(),
+                        title: 'Destination'
+                    }});
+
+                    // Street view start marker
+                    startMarker = new google.maps.Marker({{
+                        map: null,
+                        position: map.getCenter(),
+                        icon: {{
+                            path: google.maps.SymbolPath.CIRCLE,
+                            scale: 8,
+                            fillColor: '#4285F4',
+                            fillOpacity: 1,
+                            strokeColor: '#ffffff',
+                            strokeWeight: 2
+                        }},
+                        title: 'Street View Start'
+                    }});
+
+                    // Straight line from street view to destination, until the walking route arrives
+                    destinationLine = new google.maps.Polyline({{
+                        path: [],
+                        geodesic: true,
+                        strokeColor: '#4285F4',
+                        strokeOpacity: 1.0,
+                        strokeWeight: 2,
+                        map: null
+                    }});
+
+                    routeLine = new google.maps.Polyline({{
+                        path: [],
+                        strokeColor: '#1abc9c',
+                        strokeOpacity: 0.9,
+                        strokeWeight: 4,
+                        map: null
+                    }});
+                }}
+
+                function setCenter(lat, lng, zoom) {{
+                    map.setCenter({{lat: lat, lng: lng}});
+                    map.setZoom(zoom);
+                }}
+
+                function showRoute(points) {{
+                    routeLine.setPath(points.map(p => ({{lat: p[0], lng: p[1]}})));
+                    routeLine.setMap(points.length ? map : null);
+                    if (points.length) {{
+                        destinationLine.setMap(null);
+                    }}
+                }}
+
+                function resetMap() {{
+                    destinationSelected = false;
+                    [destinationMarker, startMarker, destinationLine, routeLine].forEach(o => o.setMap(null));
+                    setCenter({self.default_lat}, {self.default_lng}, {self.default_zoom});
+                }}
+
                 function findNearestStreetView(latLng) {{
-                    if (window.destinationSelected) {{
+                    if (destinationSelected) {{
                         console.log('Destination already selected');
                         return;
                     }}
-                    
+
+                    // Ask the Python-side cache first; only misses go to StreetViewService
+                    if (mapBridge) {{
+                        mapBridge.cachedPanorama(latLng.lat(), latLng.lng(), function(cached) {{
+                            if (cached) {{
+                                const panorama = JSON.parse(cached);
+                                useStreetView(latLng, panorama.lat, panorama.lng);
+                            }} else {{
+                                lookupStreetView(latLng);
+                            }}
+                        }});
+                    }} else {{
+                        lookupStreetView(latLng);
+                    }}
+                }}
+
+                function lookupStreetView(latLng) {{
                     streetViewService.getPanorama({{
                         location: latLng,
                         radius: 50,
                         source: google.maps.StreetViewSource.OUTDOOR
                     }}, function(data, status) {{
                         if (status === google.maps.StreetViewStatus.OK) {{
-                            window.destinationSelected = true;  // Set flag
                             const nearestLatLng = data.location.latLng;
-                            requestAnimationFrame(() => {{
-                                setDestination(latLng.lat(), latLng.lng(), nearestLatLng.lat(), nearestLatLng.lng());
-                            }});
+                            if (mapBridge) {{
+                                mapBridge.panoramaFound(latLng.lat(), latLng.lng(), data.location.pano,
+                                                        nearestLatLng.lat(), nearestLatLng.lng());
+                            }}
+                            useStreetView(latLng, nearestLatLng.lat(), nearestLatLng.lng());
                         }} else {{
                             console.error('Street View not available at this location');
                         }}
                     }});
                 }}
 
+                function useStreetView(latLng, streetLat, streetLng) {{
+                    destinationSelected = true;  // Set flag
+                    requestAnimationFrame(() => {{
+                        setDestination(latLng.lat(), latLng.lng(), streetLat, streetLng);
+                    }});
+                }}
+
                 function setDestination(destLat, destLng, streetLat, streetLng) {{
-                    // Remove existing marker if any
-                    if (marker) {{
-                        marker.setMap(null);
-                    }}
-                    
                     try {{
-                        // Create markers using traditional Marker API for now
-                        marker = new google.maps.Marker({{
-                            map: map,
-                            position: {{lat: destLat, lng: destLng}},
-                            title: 'Destination'
-                        }});
-
-                        // Street view start marker
-                        new google.maps.Marker({{
-                            map: map,
-                            position: {{lat: streetLat, lng: streetLng}},
-                            icon: {{
-                                path: google.maps.SymbolPath.CIRCLE,
-                                scale: 8,
-                                fillColor: '#4285F4',
-                                fillOpacity: 1,
-                                strokeColor: '#ffffff',
-                                strokeWeight: 2
-                            }},
-                            title: 'Street View Start'
-                        }});
-
-                        // Draw path from street view to destination
-                        new google.maps.Polyline({{
-                            path: [
-                                {{lat: streetLat, lng: streetLng}},
-                                {{lat: destLat, lng: destLng}}
-                            ],
-                            geodesic: true,
-                            strokeColor: '#4285F4',
-                            strokeOpacity: 1.0,
-                            strokeWeight: 2,
-                            map: map
-                        }});
+                        destinationMarker.setPosition({{lat: destLat, lng: destLng}});
+                        destinationMarker.setMap(map);
+                        startMarker.setPosition({{lat: streetLat, lng: streetLng}});
+                        startMarker.setMap(map);
+                        destinationLine.setPath([
+                            {{lat: streetLat, lng: streetLng}},
+                            {{lat: destLat, lng: destLng}}
+                        ]);
+                        destinationLine.setMap(map);
+                        routeLine.setMap(null);
 
                         // Notify Qt using the bridge
-                        if (typeof qt !== 'undefined' && qt.webChannelTransport) {{
-                            new QWebChannel(qt.webChannelTransport, function(channel) {{
-                                if (channel.objects.mapBridge && typeof channel.objects.mapBridge.destinationSelected === 'function') {{
-                                    channel.objects.mapBridge.destinationSelected(streetLat, streetLng, destLat, destLng);
-                                }} else {{
-                                    console.error('Bridge or destinationSelected function not available');
-                                }}
-                            }});
+                        if (mapBridge) {{
+                            mapBridge.destinationSelected(streetLat, streetLng, destLat, destLng);
                         }} else {{
                             console.error('Qt WebChannel not available');
                         }}
@@ -170,9 +280,3 @@ class MapView(QWebEngineView):
         </html>
         """
         self.setHtml(html)
-
-    @pyqtSlot(float, float, float, float)
-    def destinationSelected(self, streetLat, streetLng, destLat, destLng):
-        """Slot to receive destination coordinates from JavaScript"""
-        print(f"Destination selected: {streetLat}, {streetLng} to {destLat}, {destLng}")
-        self.destination_selected.emit(streetLat, streetLng, destLat, destLng)
\ No newline at end of file
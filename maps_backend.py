@@ -0,0 +1,31 @@
+from config import GOOGLE_MAPS_API_KEY, MAPS_BACKEND, MAPS_STANDIN_URL
+
+class GoogleMapsBackend:
+    """The Google Maps JavaScript API"""
+    name = "google"
+
+    def script_url(self, libraries="geometry", callback=None):
+        url = f"https://maps.googleapis.com/maps/api/js?key={GOOGLE_MAPS_API_KEY}&libraries={libraries}"
+        return f"{url}&callback={callback}" if callback else url
+
+class StandInMapsBackend:
+    """Local stand-in served by maps_standin.py: canned routes, panoramas and tiles, no network"""
+    name = "standin"
+
+    def __init__(self, base_url=MAPS_STANDIN_URL):
+        self.base_url = base_url.rstrip("/")
+
+    def script_url(self, libraries="geometry", callback=None):
+        url = f"{self.base_url}/maps/api/js?libraries={libraries}"
+        return f"{url}&callback={callback}" if callback else url
+
+BACKENDS = {
+    "google": GoogleMapsBackend,
+    "standin": StandInMapsBackend,
+}
+
+def get_backend(name=MAPS_BACKEND):
+    """Backend instance for a name from BACKENDS"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown maps backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
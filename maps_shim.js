@@ -0,0 +1,333 @@
+// Stand-in for the subset of the Google Maps JavaScript API that MapView and StreetView use.
+// Served by maps_standin.py, which answers directions, panorama and tile requests locally.
+(function() {
+    const scriptUrl = new URL(document.currentScript.src);
+    const base = scriptUrl.origin;
+    const callbackName = scriptUrl.searchParams.get('callback');
+    const EARTH_RADIUS = 6378137;
+
+    function request(path) {
+        return fetch(base + path).then(response => response.json());
+    }
+
+    function LatLng(lat, lng) {
+        if (typeof lat === 'object') {
+            lng = lat.lng;
+            lat = lat.lat;
+        }
+        this._lat = lat;
+        this._lng = lng;
+    }
+    LatLng.prototype.lat = function() { return this._lat; };
+    LatLng.prototype.lng = function() { return this._lng; };
+    LatLng.prototype.toJSON = function() { return {lat: this._lat, lng: this._lng}; };
+    LatLng.prototype.toString = function() { return '(' + this._lat + ', ' + this._lng + ')'; };
+
+    function toLatLng(point) {
+        return point instanceof LatLng ? point : new LatLng(point.lat, point.lng);
+    }
+
+    function fromPair(pair) {
+        return new LatLng(pair[0], pair[1]);
+    }
+
+    function toRadians(degrees) { return degrees * Math.PI / 180; }
+    function toDegrees(radians) { return radians * 180 / Math.PI; }
+
+    const spherical = {
+        computeHeading: function(from, to) {
+            from = toLatLng(from);
+            to = toLatLng(to);
+            const lat1 = toRadians(from.lat()), lat2 = toRadians(to.lat());
+            const dLng = toRadians(to.lng() - from.lng());
+            const heading = toDegrees(Math.atan2(
+                Math.sin(dLng) * Math.cos(lat2),
+                Math.cos(lat1) * Math.sin(lat2) - Math.sin(lat1) * Math.cos(lat2) * Math.cos(dLng)
+            ));
+            return ((heading + 540) % 360) - 180;
+        },
+        computeOffset: function(from, distance, heading) {
+            from = toLatLng(from);
+            const angle = distance / EARTH_RADIUS;
+            const bearing = toRadians(heading);
+            const lat1 = toRadians(from.lat()), lng1 = toRadians(from.lng());
+            const lat2 = Math.asin(Math.sin(lat1) * Math.cos(angle) + Math.cos(lat1) * Math.sin(angle) * Math.cos(bearing));
+            const lng2 = lng1 + Math.atan2(Math.sin(bearing) * Math.sin(angle) * Math.cos(lat1),
+                                           Math.cos(angle) - Math.sin(lat1) * Math.sin(lat2));
+            return new LatLng(toDegrees(lat2), toDegrees(lng2));
+        },
+        computeDistanceBetween: function(from, to) {
+            from = toLatLng(from);
+            to = toLatLng(to);
+            const lat1 = toRadians(from.lat()), lat2 = toRadians(to.lat());
+            const a = Math.pow(Math.sin((lat2 - lat1) / 2), 2) +
+                      Math.cos(lat1) * Math.cos(lat2) * Math.pow(Math.sin(toRadians(to.lng() - from.lng()) / 2), 2);
+            return 2 * EARTH_RADIUS * Math.asin(Math.sqrt(a));
+        }
+    };
+
+    class Events {
+        addListener(event, handler) {
+            this._listeners = this._listeners || {};
+            (this._listeners[event] = this._listeners[event] || []).push(handler);
+            return {remove: () => {
+                this._listeners[event] = this._listeners[event].filter(h => h !== handler);
+            }};
+        }
+        trigger(event, ...args) {
+            ((this._listeners || {})[event] || []).slice().forEach(handler => handler.apply(this, args));
+        }
+    }
+
+    // Web Mercator world coordinates at zoom 0, as in the real API
+    function project(latLng) {
+        const sin = Math.min(Math.max(Math.sin(toRadians(latLng.lat())), -0.9999), 0.9999);
+        return {x: 256 * (0.5 + latLng.lng() / 360), y: 256 * (0.5 - Math.log((1 + sin) / (1 - sin)) / (4 * Math.PI))};
+    }
+
+    function unproject(point) {
+        const n = Math.PI - 2 * Math.PI * point.y / 256;
+        return new LatLng(toDegrees(Math.atan(Math.sinh(n))), point.x / 256 * 360 - 180);
+    }
+
+    class Map extends Events {
+        constructor(div, options) {
+            super();
+            this.div = div;
+            this.center = toLatLng(options.center);
+            this.zoom = options.zoom || 15;
+            this.overlays = new Set();
+            div.style.position = 'relative';
+            div.style.overflow = 'hidden';
+            div.style.background = '#e5e3df';
+            this.svg = document.createElementNS('http://www.w3.org/2000/svg', 'svg');
+            this.svg.setAttribute('style', 'position:absolute;left:0;top:0;width:100%;height:100%;pointer-events:none');
+            div.appendChild(this.svg);
+            div.addEventListener('click', event => {
+                const rect = div.getBoundingClientRect();
+                this.trigger('click', {latLng: this.fromPixel(event.clientX - rect.left, event.clientY - rect.top)});
+            });
+        }
+        getCenter() { return this.center; }
+        setCenter(center) { this.center = toLatLng(center); this.redraw(); }
+        panTo(center) { this.setCenter(center); }
+        getZoom() { return this.zoom; }
+        setZoom(zoom) { this.zoom = zoom; this.redraw(); }
+        toPixel(latLng) {
+            const scale = Math.pow(2, this.zoom);
+            const point = project(toLatLng(latLng)), center = project(this.center);
+            return {x: (point.x - center.x) * scale + this.div.clientWidth / 2,
+                    y: (point.y - center.y) * scale + this.div.clientHeight / 2};
+        }
+        fromPixel(x, y) {
+            const scale = Math.pow(2, this.zoom), center = project(this.center);
+            return unproject({x: center.x + (x - this.div.clientWidth / 2) / scale,
+                              y: center.y + (y - this.div.clientHeight / 2) / scale});
+        }
+        redraw() {
+            this.overlays.forEach(overlay => overlay.draw());
+        }
+    }
+
+    class Marker extends Events {
+        constructor(options) {
+            super();
+            this.position = toLatLng(options.position);
+            this.title = options.title || '';
+            this.element = document.createElement('div');
+            const size = options.icon ? 2 * (options.icon.scale || 8) : 14;
+            this.element.setAttribute('style', 'position:absolute;border-radius:50%;border:2px solid #fff;' +
+                'width:' + size + 'px;height:' + size + 'px;margin:' + (-size / 2) + 'px;' +
+                'background:' + (options.icon ? options.icon.fillColor || '#4285F4' : '#ea4335'));
+            this.element.title = this.title;
+            this.map = null;
+            this.setMap(options.map || null);
+        }
+        getMap() { return this.map; }
+        setMap(map) {
+            if (this.map) {
+                this.map.overlays.delete(this);
+                this.element.remove();
+            }
+            this.map = map;
+            if (map) {
+                map.overlays.add(this);
+                map.div.appendChild(this.element);
+                this.draw();
+            }
+        }
+        getPosition() { return this.position; }
+        setPosition(position) { this.position = toLatLng(position); this.draw(); }
+        draw() {
+            if (!this.map) return;
+            const pixel = this.map.toPixel(this.position);
+            this.element.style.left = pixel.x + 'px';
+            this.element.style.top = pixel.y + 'px';
+        }
+    }
+
+    class Polyline extends Events {
+        constructor(options) {
+            super();
+            this.path = (options.path || []).map(toLatLng);
+            this.element = document.createElementNS('http://www.w3.org/2000/svg', 'polyline');
+            this.element.setAttribute('fill', 'none');
+            this.element.setAttribute('stroke', options.strokeColor || '#4285F4');
+            this.element.setAttribute('stroke-width', options.strokeWeight || 2);
+            this.map = null;
+            this.setMap(options.map || null);
+        }
+        getMap() { return this.map; }
+        setMap(map) {
+            if (this.map) {
+                this.map.overlays.delete(this);
+                this.element.remove();
+            }
+            this.map = map;
+            if (map) {
+                map.overlays.add(this);
+                map.svg.appendChild(this.element);
+                this.draw();
+            }
+        }
+        getPath() { return {getArray: () => this.path.slice(), getLength: () => this.path.length}; }
+        setPath(path) { this.path = path.map(toLatLng); this.draw(); }
+        draw() {
+            if (!this.map) return;
+            this.element.setAttribute('points', this.path.map(p => {
+                const pixel = this.map.toPixel(p);
+                return pixel.x + ',' + pixel.y;
+            }).join(' '));
+        }
+    }
+
+    function panoramaResult(data) {
+        return {location: {latLng: new LatLng(data.lat, data.lng), pano: data.pano, description: data.pano}, links: [], tiles: {}};
+    }
+
+    class StreetViewService {
+        getPanorama(options, callback) {
+            let path;
+            if (options.pano) {
+                path = '/panorama?pano=' + encodeURIComponent(options.pano);
+            } else {
+                const location = toLatLng(options.location);
+                path = '/panorama?lat=' + location.lat() + '&lng=' + location.lng() +
+                       '&radius=' + (options.radius || 50) + '&source=' + (options.source || 'default');
+            }
+            return request(path).then(data => {
+                const result = data.status === 'OK' ? panoramaResult(data) : null;
+                if (callback) callback(result, data.status);
+                return {data: result};
+            });
+        }
+    }
+
+    class StreetViewPanorama extends Events {
+        constructor(div, options) {
+            super();
+            options = options || {};
+            this.div = div;
+            this.pano = null;
+            this.position = null;
+            this.pov = {heading: 0, pitch: 0};
+            this.zoom = options.zoom || 1;
+            this.visible = options.visible !== false;
+            this.service = new StreetViewService();
+            if (div) {
+                div.style.overflow = 'hidden';
+                div.style.background = '#000';
+                this.image = document.createElement('img');
+                this.image.setAttribute('style', 'width:200%;height:100%;object-fit:cover');
+                div.appendChild(this.image);
+            }
+            if (options.pov) this.setPov(options.pov);
+            if (options.pano) {
+                this.setPano(options.pano);
+            } else if (options.position) {
+                this.setPosition(options.position);
+            }
+        }
+        getPano() { return this.pano; }
+        getPosition() { return this.position; }
+        getPov() { return {heading: this.pov.heading, pitch: this.pov.pitch}; }
+        getZoom() { return this.zoom; }
+        setZoom(zoom) { this.zoom = zoom; this.trigger('zoom_changed'); }
+        getVisible() { return this.visible; }
+        setVisible(visible) { this.visible = visible; this.trigger('visible_changed'); }
+        setPosition(position) {
+            this.service.getPanorama({location: toLatLng(position), radius: 50}, (data, status) => {
+                if (status === 'OK') this.show(data.location);
+            });
+        }
+        setPano(pano) {
+            this.service.getPanorama({pano: pano}, (data, status) => {
+                if (status === 'OK') this.show(data.location);
+            });
+        }
+        setPov(pov) {
+            this.pov = {heading: pov.heading, pitch: pov.pitch};
+            if (this.image) {
+                // Pan the stand-in tile as the heading changes so the view visibly turns
+                const offset = ((this.pov.heading % 360) + 360) % 360 / 360 * 50;
+                this.image.style.transform = 'translate(' + (-offset) + '%, ' + (this.pov.pitch / 2) + '%)';
+            }
+            this.trigger('pov_changed');
+        }
+        show(location) {
+            const changed = location.pano !== this.pano;
+            this.pano = location.pano;
+            this.position = location.latLng;
+            if (this.image) this.image.src = base + '/tile/' + encodeURIComponent(location.pano) + '.jpg';
+            if (changed) this.trigger('pano_changed');
+            this.trigger('position_changed');
+        }
+    }
+
+    class DirectionsService {
+        route(options, callback) {
+            const origin = toLatLng(options.origin), destination = toLatLng(options.destination);
+            return request('/directions?origin=' + origin.lat() + ',' + origin.lng() +
+                           '&destination=' + destination.lat() + ',' + destination.lng()).then(data => {
+                const response = data.status !== 'OK' ? null : {routes: [{legs: [{
+                    start_location: fromPair(data.steps[0].start),
+                    end_location: fromPair(data.end),
+                    steps: data.steps.map(step => ({start_location: fromPair(step.start), path: step.path.map(fromPair)}))
+                }]}]};
+                if (callback) callback(response, data.status);
+                return response;
+            });
+        }
+    }
+
+    window.google = {maps: {
+        LatLng: LatLng,
+        Map: Map,
+        Marker: Marker,
+        Polyline: Polyline,
+        SymbolPath: {CIRCLE: 0, FORWARD_CLOSED_ARROW: 1},
+        StreetViewPanorama: StreetViewPanorama,
+        StreetViewService: StreetViewService,
+        StreetViewStatus: {OK: 'OK', ZERO_RESULTS: 'ZERO_RESULTS', UNKNOWN_ERROR: 'UNKNOWN_ERROR'},
+        StreetViewSource: {DEFAULT: 'default', OUTDOOR: 'outdoor'},
+        StreetViewPreference: {NEAREST: 'nearest', BEST: 'best'},
+        DirectionsService: DirectionsService,
+        DirectionsStatus: {OK: 'OK', ZERO_RESULTS: 'ZERO_RESULTS'},
+        TravelMode: {WALKING: 'WALKING', DRIVING: 'DRIVING'},
+        geometry: {spherical: spherical},
+        event: {
+            addListener: (target, event, handler) => target.addListener(event, handler),
+            trigger: (target, event, ...args) => target.trigger(event, ...args)
+        }
+    }};
+
+    if (callbackName) {
+        // Like the real loader, call back only once the page's own scripts have been parsed
+        const run = () => window[callbackName]();
+        if (document.readyState === 'loading') {
+            document.addEventListener('DOMContentLoaded', run);
+        } else {
+            setTimeout(run, 0);
+        }
+    }
+})();
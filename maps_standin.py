@@ -0,0 +1,202 @@
+"""Local stand-in for the Google Maps services the kiosk uses.
+
+    python maps_standin.py --port 8765 --latency-ms 40 --jitter-ms 10
+
+Set MAPS_BACKEND = "standin" in config.py to load both views against it.
+It serves a JS shim of the Maps API subset we use (maps_shim.js), canned
+walking directions, panoramas on a fixed grid and generated tiles, with
+configurable latency, so end-to-end runs need no network and repeat exactly.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import cv2
+import numpy as np
+from route import haversine_m
+
+SHIM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps_shim.js")
+METERS_PER_DEGREE = 111320.0
+
+class StandIn:
+    """Deterministic directions, panorama metadata and tiles.
+
+    Panoramas sit on a square grid `grid_m` meters apart; a lookup returns
+    the nearest grid point, or ZERO_RESULTS if that is beyond the radius.
+    Directions come from `routes` (keyed like GeoCache route keys) or are
+    an L-shaped walk: north/south first, then east/west, sampled every
+    `path_step_m` with each step's start repeated like DirectionsService.
+    """
+
+    def __init__(self, latency_ms=None, jitter_ms=0.0, seed=0, grid_m=8.0, path_step_m=12.0, routes=None):
+        self.latency_ms = dict(latency_ms or {})  # Per endpoint: directions, panorama, tile
+        self.jitter_ms = jitter_ms
+        self.grid_m = grid_m
+        self.path_step_m = path_step_m
+        self.routes = dict(routes or {})
+        self.stats = {"script": 0, "directions": 0, "panorama": 0, "tile": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tiles = {}
+
+    def delay(self, endpoint):
+        with self._lock:
+            self.stats[endpoint] += 1
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        delay_ms = self.latency_ms.get(endpoint, 0.0) + jitter
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def pano_position(self, row, col):
+        lat = row * self.grid_m / METERS_PER_DEGREE
+        lng = col * self.grid_m / (METERS_PER_DEGREE * math.cos(math.radians(lat)))
+        return lat, lng
+
+    def panorama(self, lat, lng, radius):
+        row = round(lat * METERS_PER_DEGREE / self.grid_m)
+        snapped_lat = row * self.grid_m / METERS_PER_DEGREE
+        col = round(lng * METERS_PER_DEGREE * math.cos(math.radians(snapped_lat)) / self.grid_m)
+        pano_lat, pano_lng = self.pano_position(row, col)
+        if haversine_m(lat, lng, pano_lat, pano_lng) > radius:
+            return {"status": "ZERO_RESULTS"}
+        return {"status": "OK", "pano": f"pano_{row}_{col}", "lat": pano_lat, "lng": pano_lng}
+
+    def panorama_by_id(self, pano_id):
+        try:
+            _, row, col = pano_id.split("_")
+            lat, lng = self.pano_position(int(row), int(col))
+        except ValueError:
+            return {"status": "ZERO_RESULTS"}
+        return {"status": "OK", "pano": pano_id, "lat": lat, "lng": lng}
+
+    def _path(self, start, end):
+        count = max(1, int(math.ceil(haversine_m(*start, *end) / self.path_step_m)))
+        return [[start[0] + (end[0] - start[0]) * t, start[1] + (end[1] - start[1]) * t]
+                for t in np.linspace(0.0, 1.0, count + 1)]
+
+    def directions(self, origin, destination):
+        key = f"{origin[0]:.4f},{origin[1]:.4f}|{destination[0]:.4f},{destination[1]:.4f}"
+        if key in self.routes:
+            points = self.routes[key]
+            return {"status": "OK", "steps": [{"start": points[0], "path": points}], "end": points[-1]}
+        corner = [destination[0], origin[1]]
+        steps = [
+            {"start": list(origin), "path": self._path(origin, corner)},
+            {"start": corner, "path": self._path(corner, destination)},
+        ]
+        return {"status": "OK", "steps": steps, "end": list(destination)}
+
+    def tile(self, pano_id):
+        """A JPEG per panorama: a colour from the id with the id written on it"""
+        with self._lock:
+            if pano_id not in self._tiles:
+                seed = zlib.crc32(pano_id.encode())
+                image = np.empty((256, 512, 3), dtype=np.uint8)
+                image[:] = (seed & 0xFF, (seed >> 8) & 0xFF, (seed >> 16) & 0xFF)
+                image[::32] = 255  # Grid lines so panning is visible
+                image[:, ::32] = 255
+                cv2.putText(image, pano_id, (16, 140), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2, cv2.LINE_AA)
+                self._tiles[pano_id] = cv2.imencode(".jpg", image)[1].tobytes()
+            return self._tiles[pano_id]
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # One line per tile request is too noisy for benchmarks
+
+    def send_body(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")  # Pages are loaded with setHtml, so fetches are cross-origin
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data):
+        self.send_body(json.dumps(data).encode(), "application/json")
+
+    def do_GET(self):
+        standin = self.server.standin
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        try:
+            if url.path == "/maps/api/js":
+                standin.delay("script")
+                with open(SHIM_PATH, "rb") as f:
+                    self.send_body(f.read(), "application/javascript")
+            elif url.path == "/directions":
+                standin.delay("directions")
+                origin = [float(v) for v in query["origin"].split(",")]
+                destination = [float(v) for v in query["destination"].split(",")]
+                self.send_json(standin.directions(origin, destination))
+            elif url.path == "/panorama":
+                standin.delay("panorama")
+                if "pano" in query:
+                    self.send_json(standin.panorama_by_id(query["pano"]))
+                else:
+                    self.send_json(standin.panorama(float(query["lat"]), float(query["lng"]), float(query.get("radius", 50))))
+            elif url.path.startswith("/tile/") and url.path.endswith(".jpg"):
+                standin.delay("tile")
+                self.send_body(standin.tile(url.path[len("/tile/"):-len(".jpg")]), "image/jpeg")
+            elif url.path == "/stats":
+                self.send_json(standin.stats)
+            else:
+                self.send_body(b"Not found", "text/plain", 404)
+        except (KeyError, ValueError) as e:
+            self.send_body(f"Bad request: {e}".encode(), "text/plain", 400)
+
+def serve(standin, host="127.0.0.1", port=8765):
+    """Create a threaded server for a StandIn; call serve_forever() or use serve_in_background"""
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.standin = standin
+    return server
+
+def serve_in_background(standin, host="127.0.0.1", port=0):
+    """Start a server on a daemon thread; port 0 picks a free port. Returns (server, base_url)"""
+    server = serve(standin, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added to every directions, panorama and tile request")
+    parser.add_argument("--directions-ms", type=float, help="Override the latency for directions")
+    parser.add_argument("--panorama-ms", type=float, help="Override the latency for panorama lookups")
+    parser.add_argument("--tile-ms", type=float, help="Override the latency for tiles")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on each request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--grid-m", type=float, default=8.0, help="Spacing of the panorama grid")
+    parser.add_argument("--routes", help="JSON file of canned routes: {\"lat,lng|lat,lng\": [[lat, lng], ...]}")
+    args = parser.parse_args(argv)
+
+    latency = {
+        endpoint: args.latency_ms if override is None else override
+        for endpoint, override in (("directions", args.directions_ms), ("panorama", args.panorama_ms), ("tile", args.tile_ms))
+    }
+    routes = None
+    if args.routes:
+        with open(args.routes) as f:
+            routes = json.load(f)
+    standin = StandIn(latency, args.jitter_ms, args.seed, args.grid_m, routes=routes)
+    server = serve(standin, args.host, args.port)
+    print(f"Maps stand-in on http://{args.host}:{server.server_address[1]} (latency {latency}, jitter {args.jitter_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from latency import latency_tracker
+
+PREFIX = "gesture_path_"  # Every exported metric name starts with this
+
+class Metric:
+    """One named metric with a value per label set; values may also come from a function read at scrape time"""
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = PREFIX + name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # Label values tuple -> number
+        self._functions = {}  # Label values tuple -> callable returning the number
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, function, **labels):
+        """Report function() as this metric's value for the given labels"""
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def _label_text(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            try:
+                values[key] = function()
+            except Exception as e:
+                print(f"Error reading metric {self.name}: {e}")
+        return [(self.name + self._label_text(key), value) for key, value in sorted(values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name} {float(value)!r}" for name, value in self.samples()]
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class LatencyCollector:
+    """Exports the shared LatencyTracker's stage histograms, so stages aren't timed twice"""
+
+    def __init__(self, name, help_text, tracker=latency_tracker):
+        self.name = PREFIX + name
+        self.help_text = help_text
+        self.tracker = tracker
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for stage, (edges, counts, total_ms) in self.tracker.histograms().items():
+            cumulative = np.cumsum(counts)
+            for edge, count in zip(edges, cumulative[:-1]):
+                lines.append(f'{self.name}_bucket{{stage="{stage}",le="{edge:g}"}} {int(count)}')
+            lines.append(f'{self.name}_bucket{{stage="{stage}",le="+Inf"}} {int(cumulative[-1])}')
+            lines.append(f'{self.name}_sum{{stage="{stage}"}} {float(total_ms)!r}')
+            lines.append(f'{self.name}_count{{stage="{stage}"}} {int(cumulative[-1])}')
+        return lines
+
+class MetricsRegistry:
+    """Named metrics shared by every thread of the kiosk, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            # Asking twice for the same name returns the metric made the first time
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+def resident_memory_bytes():
+    """Current RSS from /proc, or the peak RSS where /proc isn't available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# Shared registry that every part of the kiosk records into
+metrics = MetricsRegistry()
+metrics.register(LatencyCollector("stage_latency_ms", "Per-stage latency from capture to panorama update (latency.py STAGES)"))
+metrics.gauge("process_resident_memory_bytes", "Resident set size of the kiosk process").set_function(resident_memory_bytes)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # A scrape every few seconds would flood the console
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve_metrics(port, host="127.0.0.1", registry=metrics):
+    """Serve /metrics from a daemon thread; returns the server so it can be shut down"""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class MetricsFileWriter:
+    """Appends a timestamped snapshot of the registry to a file every `interval` seconds.
+
+    When the file grows past max_bytes it is renamed to path.1 (older
+    snapshots shift to path.2 and so on, up to `backups`) and a new one starts.
+    """
+
+    def __init__(self, path, interval=15.0, max_bytes=1024 * 1024, backups=3, registry=metrics):
+        self.path = path
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.registry = registry
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.write()  # Final snapshot on shutdown
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self):
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                self.rotate()
+            with open(self.path, "a") as f:
+                f.write(f"# snapshot {time.time():.3f}\n")
+                f.write(self.registry.render())
+        except OSError as e:
+            print(f"Error writing metrics file: {e}")
+
+    def rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
@@ -0,0 +1,78 @@
+from config import PREFETCH_LOOKAHEAD, PREFETCH_MAX_IN_FLIGHT
+
+class PanoramaPrefetcher:
+    """Resolves panorama ids for the next few points of the active route.
+
+    After each step the next `lookahead` points in the direction of travel
+    are looked up, at most `max_in_flight` at a time. Stepping onto a point
+    whose id is known is a setPano instead of a nearest-panorama search, and
+    the next point's panorama can be warmed in a hidden view beforehand.
+    """
+
+    def __init__(self, lookahead=PREFETCH_LOOKAHEAD, max_in_flight=PREFETCH_MAX_IN_FLIGHT):
+        self.lookahead = lookahead
+        self.max_in_flight = max_in_flight
+        self.stats = {"hits": 0, "misses": 0, "requested": 0, "resolved": 0, "failed": 0, "stale": 0}
+        self.generation = 0  # Bumped per route so lookups for an old route are ignored
+        self._route = None
+        self._in_flight = set()
+        self._failed = set()
+        self._index = 0
+        self._backward = False
+
+    def reset(self, route):
+        """Start prefetching for a new (or re-indexed) route"""
+        self.generation += 1
+        self._route = route
+        self._in_flight.clear()
+        self._failed.clear()
+        self._index = 0
+        self._backward = False
+
+    def lookup(self, index):
+        """Panorama id for a point being stepped onto, or None if it isn't resolved yet"""
+        pano_id = self._route.pano_ids[index]
+        self.stats["hits" if pano_id else "misses"] += 1
+        return pano_id
+
+    def next_pano(self):
+        """Resolved panorama id of the point after the current one, for warming"""
+        index = self._index + (-1 if self._backward else 1)
+        if 0 <= index < len(self._route):
+            return self._route.pano_ids[index]
+        return None
+
+    def wanted(self, index, backward=False):
+        """Points to look up now: unresolved points ahead, nearest first, within the in-flight limit"""
+        self._index, self._backward = index, backward
+        if self._route is None:
+            return []
+        step = -1 if backward else 1
+        ahead = range(index + step, index + step * (self.lookahead + 1), step)
+        todo = [
+            i for i in ahead
+            if 0 <= i < len(self._route) and self._route.pano_ids[i] is None
+            and i not in self._in_flight and i not in self._failed
+        ]
+        todo = todo[:max(0, self.max_in_flight - len(self._in_flight))]
+        self._in_flight.update(todo)
+        self.stats["requested"] += len(todo)
+        return todo
+
+    def on_resolved(self, generation, index, pano_id):
+        """Record a lookup result and return the points to look up next"""
+        if generation != self.generation:
+            self.stats["stale"] += 1
+            return []
+        self._in_flight.discard(index)
+        if pano_id:
+            self._route.pano_ids[index] = pano_id
+            self.stats["resolved"] += 1
+        else:
+            self._failed.add(index)  # No panorama nearby; stepping there falls back to setPosition
+            self.stats["failed"] += 1
+        return self.wanted(self._index, self._backward)
+
+    def summary(self):
+        steps = self.stats["hits"] + self.stats["misses"]
+        return dict(self.stats, hit_rate=self.stats["hits"] / steps if steps else None)
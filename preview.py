@@ -0,0 +1,91 @@
+import threading
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+from latency import draw_overlay
+
+class FrameNotifier(QObject):
+    """Wakes a GUI-thread slot when the camera commits a frame, instead of polling on a timer.
+
+    At most one wakeup is queued at a time: frames committed while one is
+    pending only make the frame it will read newer. The slot calls
+    acknowledge() before reading, so a frame committed during the read
+    queues the next wakeup.
+    """
+    frame_available = pyqtSignal()
+
+    def __init__(self, frame_ring):
+        super().__init__()
+        self.wakeups = 0
+        self.coalesced = 0  # Commits that found a wakeup already queued
+        self._pending = threading.Event()
+        frame_ring.subscribe(self._on_commit)
+
+    def _on_commit(self, seq):
+        if self._pending.is_set():
+            self.coalesced += 1
+            return
+        self._pending.set()
+        self.wakeups += 1
+        self.frame_available.emit()  # Queued to the GUI thread, since this runs on the camera thread
+
+    def acknowledge(self):
+        self._pending.clear()
+
+class PreviewRenderer:
+    """Renders camera frames into a QLabel through preallocated buffers.
+
+    Frames are shrunk to the preview size with OpenCV before any colour
+    conversion or drawing, and the RGB buffer, the QImage wrapping it and
+    two alternating QPixmaps are all reused. In steady state nothing
+    frame-sized is allocated per frame.
+    """
+
+    def __init__(self, label, size=(240, 180), gesture_recognizer=None):
+        self.label = label
+        self.max_size = size  # (width, height) the preview must fit into
+        self.gesture_recognizer = gesture_recognizer  # Used to draw hand landmarks, if given
+        self.show_latency_lines = None  # Callable returning overlay lines, or None for no overlay
+        self.frames_rendered = 0
+
+        self._source_shape = None
+        self._small = None  # Resized BGR frame
+        self._rgb = None  # Resized RGB frame the QImage points at
+        self._image = None
+        # QLabel keeps a shallow copy of the pixmap it shows; alternating two
+        # pixmaps means the one being written to is never shared, so it never detaches
+        self._pixmaps = [QPixmap(), QPixmap()]
+        self._next_pixmap = 0
+
+    def _allocate(self, shape):
+        height, width = shape[:2]
+        max_w, max_h = self.max_size
+        scale = min(max_w / width, max_h / height)
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        self._source_shape = shape
+        self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self._rgb = np.empty_like(self._small)
+        self._image = QImage(self._rgb.data, size[0], size[1], 3 * size[0], QImage.Format_RGB888)
+        self._pixmaps = [QPixmap(*size), QPixmap(*size)]
+
+    def render(self, frame, hand_landmarks=None):
+        """Draw a BGR frame, annotated with landmarks if any, into the label"""
+        import cv2  # Imported on first use, by which time the camera thread has usually loaded it
+
+        if frame.shape != self._source_shape:
+            self._allocate(frame.shape)
+
+        cv2.resize(frame, (self._small.shape[1], self._small.shape[0]), dst=self._small, interpolation=cv2.INTER_LINEAR)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+        if hand_landmarks is not None and self.gesture_recognizer is not None:
+            self.gesture_recognizer.draw(self._rgb, hand_landmarks)
+        if self.show_latency_lines is not None:
+            draw_overlay(self._rgb, self.show_latency_lines())
+
+        pixmap = self._pixmaps[self._next_pixmap]
+        self._next_pixmap ^= 1
+        pixmap.convertFromImage(self._image)
+        self.label.setPixmap(pixmap)
+        self.frames_rendered += 1
@@ -0,0 +1,135 @@
+import json
+import os
+import numpy as np
+from gesture_features import GESTURES, NUM_LANDMARKS
+from config import RECORDING_JPEG_QUALITY
+
+FORMAT_VERSION = 2  # Version 1 sessions (raw frames only) are still readable
+
+class SessionRecorder:
+    """Appends frames, landmarks and timestamps to a session directory.
+
+    Each array goes to its own flat binary file so a finished session can be
+    memory-mapped by `Recording` without loading it into RAM. Frames are
+    JPEG-encoded back to back in frames.bin, with the end offset of each in
+    frame_ends.bin; with jpeg_quality=None they are stored raw instead, at
+    about 27 MB/s for 640x480 at 30 fps. Sizes and shapes are written to
+    meta.json when the recorder is closed.
+    """
+
+    def __init__(self, path, label=None, jpeg_quality=RECORDING_JPEG_QUALITY):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.label = label  # Default ground-truth gesture for every frame, if known
+        self.jpeg_quality = jpeg_quality
+        self.count = 0
+        self.frame_shape = None
+        self._frame_bytes = 0
+        names = ["frames", "landmarks", "timestamps", "has_hand", "labels"]
+        if jpeg_quality is not None:
+            names.append("frame_ends")
+        self._files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name in names}
+        self._no_hand = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+
+    def add(self, frame, timestamp, landmarks=None, label=None):
+        """Record one BGR frame with its (21, 3) landmarks, or None if no hand was found"""
+        if self.frame_shape is None:
+            self.frame_shape = frame.shape
+        elif frame.shape != self.frame_shape:
+            raise ValueError(f"Frame shape changed from {self.frame_shape} to {frame.shape}")
+
+        label = label or self.label
+        if self.jpeg_quality is None:
+            self._files["frames"].write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+        else:
+            import cv2
+
+            ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                raise ValueError("Could not JPEG-encode frame")
+            self._files["frames"].write(encoded.tobytes())
+            self._frame_bytes += len(encoded)
+            self._files["frame_ends"].write(np.uint64(self._frame_bytes).tobytes())
+        self._files["timestamps"].write(np.float64(timestamp).tobytes())
+        self._files["has_hand"].write(np.uint8(landmarks is not None).tobytes())
+        hand = self._no_hand if landmarks is None else np.asarray(landmarks, dtype=np.float32)
+        self._files["landmarks"].write(hand.tobytes())
+        self._files["labels"].write(np.int8(label_index(label)).tobytes())
+        self.count += 1
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        meta = {
+            "version": FORMAT_VERSION,
+            "count": self.count,
+            "frame_shape": list(self.frame_shape or (0, 0, 3)),
+            "frame_encoding": "raw" if self.jpeg_quality is None else "jpeg",
+            "gestures": GESTURES.tolist(),
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class Recording:
+    """Read-only, memory-mapped view of a session written by SessionRecorder"""
+
+    def __init__(self, path):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["version"] not in (1, FORMAT_VERSION):
+            raise ValueError(f"Unsupported recording version {meta['version']}")
+
+        self.path = path
+        self.count = meta["count"]
+        self.frame_shape = tuple(meta["frame_shape"])
+        if meta.get("frame_encoding", "raw") == "jpeg":
+            self.frames = JpegFrames(self._map("frames", np.uint8, None), self._map("frame_ends", np.uint64, (self.count,)))
+        else:
+            self.frames = self._map("frames", np.uint8, (self.count,) + self.frame_shape)
+        self.landmarks = self._map("landmarks", np.float32, (self.count, NUM_LANDMARKS, 3))
+        self.timestamps = self._map("timestamps", np.float64, (self.count,))
+        self.has_hand = self._map("has_hand", np.uint8, (self.count,)).astype(bool)
+        self.labels = self._map("labels", np.int8, (self.count,))  # Index into GESTURES, -1 if unlabeled
+
+    def _map(self, name, dtype, shape):
+        if self.count == 0:
+            return np.empty(shape or 0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype, mode="r", shape=shape)
+
+    def __len__(self):
+        return self.count
+
+class JpegFrames:
+    """Sequence of BGR frames decoded on access from memory-mapped JPEG data"""
+
+    def __init__(self, data, ends):
+        self._data = data
+        self._ends = ends  # End offset of each frame's JPEG in data
+
+    def __len__(self):
+        return len(self._ends)
+
+    def __getitem__(self, i):
+        import cv2
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("frame index out of range")
+        start = int(self._ends[i - 1]) if i > 0 else 0
+        return cv2.imdecode(self._data[start:int(self._ends[i])], cv2.IMREAD_COLOR)
+
+def label_index(label):
+    """Map a gesture name to its index in GESTURES, or -1 for no label"""
+    if label is None:
+        return -1
+    matches = np.flatnonzero(GESTURES == label)
+    if len(matches) == 0:
+        raise ValueError(f"Unknown gesture label: {label}")
+    return int(matches[0])
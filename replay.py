@@ -0,0 +1,232 @@
+"""Record camera sessions and replay them through the gesture pipeline.
+
+    python replay.py record sessions/forward --label FORWARD --seconds 10
+    python replay.py run sessions/forward [--realtime] [--adaptive] [--json]
+    python replay.py run sessions/forward --landmarks-only --threshold 0.08
+
+Replay needs no camera or display, so it runs on a headless Linux box.
+"""
+import argparse
+import json
+import sys
+import time
+import cv2
+import numpy as np
+from gesture_features import GESTURES, landmarks_to_array
+from recording import Recording, SessionRecorder
+from adaptive_frontend import AdaptiveFrontEnd
+from gesture_decision import GestureDecisionEngine
+from gesture_classifier import RuleClassifier, confusion_matrix, load_classifier
+from config import CAMERA_INDEX, CAPTURE_PROFILE, CAPTURE_PROFILES
+
+STAGES = ("convert", "process", "classify", "total")
+
+def latency_summary(samples_ms):
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    if len(samples) == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": int(len(samples)),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(samples.max()),
+    }
+
+class ReplayRunner:
+    """Pushes a Recording through GestureRecognizer and times each stage"""
+
+    def __init__(self, gesture_recognizer, realtime=False, front_end=None):
+        self.gesture_recognizer = gesture_recognizer
+        self.realtime = realtime  # Sleep to reproduce the original capture pace
+        self.front_end = front_end  # Optional AdaptiveFrontEnd; only total latency is timed through it
+
+    def run(self, recording):
+        timings = {stage: np.empty(len(recording)) for stage in STAGES}
+        predicted = np.zeros(len(recording), dtype=np.int64)
+        gesture_index = {name: i for i, name in enumerate(GESTURES)}
+
+        wall_start = time.perf_counter()
+        first_timestamp = recording.timestamps[0] if len(recording) else 0.0
+        for i in range(len(recording)):
+            if self.realtime:
+                delay = (recording.timestamps[i] - first_timestamp) - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+
+            frame = recording.frames[i]
+            if self.front_end is not None:
+                t0 = time.perf_counter()
+                hand_landmarks, gesture, inferred = self.front_end.process(frame)
+                timings["total"][i] = (time.perf_counter() - t0) * 1000
+                predicted[i] = gesture_index[gesture]
+                continue
+
+            t0 = time.perf_counter()
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            t1 = time.perf_counter()
+            results = self.gesture_recognizer.hands.process(rgb_frame)
+            t2 = time.perf_counter()
+            gesture = "NONE"
+            if results.multi_hand_landmarks:
+                gesture = self.gesture_recognizer.determine_gesture(results.multi_hand_landmarks[0])
+            t3 = time.perf_counter()
+
+            timings["convert"][i] = (t1 - t0) * 1000
+            timings["process"][i] = (t2 - t1) * 1000
+            timings["classify"][i] = (t3 - t2) * 1000
+            timings["total"][i] = (t3 - t0) * 1000
+            predicted[i] = gesture_index[gesture]
+
+        elapsed = time.perf_counter() - wall_start
+        stages = STAGES[-1:] if self.front_end is not None else STAGES
+        report = self._report(recording, predicted, elapsed, {s: latency_summary(timings[s]) for s in stages})
+        if self.front_end is not None:
+            report["front_end"] = dict(self.front_end.stats)
+        return report
+
+    def run_landmarks(self, recording):
+        """Classify the stored landmarks only, skipping frames and MediaPipe entirely"""
+        start = time.perf_counter()
+        predicted = np.zeros(len(recording), dtype=np.int64)
+        hands = recording.has_hand
+        if hands.any():
+            names = self.gesture_recognizer.classify_batch(recording.landmarks[hands])
+            predicted[hands] = np.argmax(names[:, np.newaxis] == GESTURES[np.newaxis, :], axis=1)
+        elapsed = time.perf_counter() - start
+        return self._report(recording, predicted, elapsed, {})
+
+    def _report(self, recording, predicted, elapsed, stages):
+        labels = np.asarray(recording.labels, dtype=np.int64)
+        matrix = confusion_matrix(labels, predicted)
+        labelled = int(matrix.sum())
+
+        # Feed the per-frame labels through the decision engine at the recorded timestamps
+        decision_engine = GestureDecisionEngine()
+        commands = dict.fromkeys(GESTURES[1:].tolist(), 0)
+        for gesture, timestamp in zip(GESTURES[predicted], recording.timestamps):
+            decision = decision_engine.update(str(gesture), float(timestamp))
+            if decision is not None:
+                commands[decision] += 1
+
+        return {
+            "frames": len(recording),
+            "elapsed_s": elapsed,
+            "fps": len(recording) / elapsed if elapsed > 0 else 0.0,
+            "stages": stages,
+            "gestures": GESTURES.tolist(),
+            "confusion": matrix.tolist(),
+            "accuracy": float(np.trace(matrix) / labelled) if labelled else None,
+            "commands": commands,
+            "decision_latency": decision_engine.latency_summary(),
+        }
+
+def print_report(report):
+    print(f"{report['frames']} frames in {report['elapsed_s']:.2f} s ({report['fps']:.1f} fps)")
+    for stage, summary in report["stages"].items():
+        if summary["count"]:
+            print(
+                f"  {stage:<9} mean {summary['mean_ms']:7.2f}  p50 {summary['p50_ms']:7.2f}  "
+                f"p95 {summary['p95_ms']:7.2f}  p99 {summary['p99_ms']:7.2f} ms"
+            )
+
+    fired = ", ".join(f"{name}={count}" for name, count in report["commands"].items() if count)
+    print(f"  commands: {fired or 'none'}")
+    if report["decision_latency"]:
+        latency = report["decision_latency"]
+        print(f"  decision latency: mean {latency['mean_ms']:.1f} ms, p95 {latency['p95_ms']:.1f} ms")
+
+    if "front_end" in report:
+        stats = report["front_end"]
+        print(
+            f"  front end: {stats['inferences']} inferences for {stats['frames']} frames, "
+            f"{stats['skipped']} skipped, {stats['roi']} ROI crops, {stats['lost']} tracking losses"
+        )
+
+    if report["accuracy"] is None:
+        print("No labelled frames; skipping confusion matrix")
+        return
+
+    names = report["gestures"]
+    print(f"Accuracy {report['accuracy'] * 100:.1f}% (rows: label, columns: predicted)")
+    print(" " * 10 + "".join(f"{name:>10}" for name in names))
+    for name, row in zip(names, report["confusion"]):
+        if sum(row):
+            print(f"{name:>10}" + "".join(f"{count:>10}" for count in row))
+
+def record(args):
+    from gesture_recognizer import GestureRecognizer
+
+    from camera_capture import open_capture
+
+    gesture_recognizer = GestureRecognizer()
+    cap, negotiated, problems = open_capture(CAPTURE_PROFILES[args.profile], args.camera)
+    for problem in problems:
+        print(f"Capture profile {args.profile}: {problem}")
+    if cap is None:
+        print("Error: Could not open camera.")
+        return 1
+
+    points = np.empty((21, 3), dtype=np.float64)
+    deadline = time.monotonic() + args.seconds
+    with SessionRecorder(args.path, label=args.label) as recorder:
+        while time.monotonic() < deadline:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            timestamp = time.monotonic()
+            hand_landmarks, gesture = gesture_recognizer.infer(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            landmarks = None if hand_landmarks is None else landmarks_to_array(hand_landmarks, out=points)
+            recorder.add(frame, timestamp, landmarks)
+    cap.release()
+    print(f"Recorded {recorder.count} frames to {args.path}")
+    return 0
+
+def run(args):
+    from gesture_recognizer import GestureRecognizer
+
+    recording = Recording(args.path)
+    classifier = load_classifier(args.model) if args.model else RuleClassifier(args.threshold)
+    # Landmarks-only runs never touch frames, so MediaPipe isn't even imported
+    gesture_recognizer = GestureRecognizer(classifier=classifier, load_model=not args.landmarks_only)
+    front_end = AdaptiveFrontEnd(gesture_recognizer) if args.adaptive else None
+    runner = ReplayRunner(gesture_recognizer, realtime=args.realtime, front_end=front_end)
+    report = runner.run_landmarks(recording) if args.landmarks_only else runner.run(recording)
+
+    if args.json:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(report)
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record frames and landmarks from a camera")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--label", choices=GESTURES.tolist(), help="Ground-truth gesture for the session")
+    record_parser.add_argument("--seconds", type=float, default=10.0)
+    record_parser.add_argument("--camera", type=int, default=CAMERA_INDEX)
+    record_parser.add_argument("--profile", choices=sorted(CAPTURE_PROFILES), default=CAPTURE_PROFILE,
+                               help="Capture profile from config.py")
+    record_parser.set_defaults(func=record)
+
+    run_parser = subparsers.add_parser("run", help="Replay a recording through the recognizer")
+    run_parser.add_argument("path")
+    run_parser.add_argument("--realtime", action="store_true", help="Replay at the original capture pace")
+    run_parser.add_argument("--landmarks-only", action="store_true", help="Classify stored landmarks without MediaPipe")
+    run_parser.add_argument("--adaptive", action="store_true", help="Use ROI tracking and motion gating from config.py")
+    run_parser.add_argument("--threshold", type=float, default=0.1)
+    run_parser.add_argument("--model", help="Trained classifier (.npz) to use instead of the threshold rules")
+    run_parser.add_argument("--json", action="store_true", help="Print a machine-readable report")
+    run_parser.set_defaults(func=run)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
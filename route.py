@@ -0,0 +1,115 @@
+import json
+import numpy as np
+
+EARTH_RADIUS_M = 6371008.8  # Mean Earth radius, close to what google.maps.geometry uses
+DUPLICATE_M = 0.5  # Consecutive points closer than this are the same point
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in meters between points given in degrees (broadcasts over arrays)"""
+    lat1, lng1, lat2, lng2 = (np.radians(a) for a in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def initial_heading(lat1, lng1, lat2, lng2):
+    """Heading in degrees [-180, 180) from the first point towards the second, like computeHeading"""
+    lat1, lng1, lat2, lng2 = (np.radians(a) for a in (lat1, lng1, lat2, lng2))
+    d_lng = lng2 - lng1
+    y = np.sin(d_lng) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(d_lng)
+    heading = np.degrees(np.arctan2(y, x))
+    return (heading + 180.0) % 360.0 - 180.0
+
+def drop_duplicates(points):
+    """Remove consecutive points that repeat the previous one (DirectionsService repeats step starts)"""
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(points) < 2:
+        return points
+    steps = haversine_m(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1])
+    return points[np.concatenate(([True], steps >= DUPLICATE_M))]
+
+def resample(points, spacing):
+    """Evenly spaced points along a polyline, `spacing` meters apart or slightly less.
+
+    Both ends are kept. Points are interpolated by distance along the path,
+    so clusters of close vertices and long straight gaps both come out at
+    the same spacing.
+    """
+    points = drop_duplicates(points)
+    if len(points) < 2:
+        return points
+    lat, lng = points[:, 0], points[:, 1]
+    cumulative = np.concatenate(([0.0], np.cumsum(haversine_m(lat[:-1], lng[:-1], lat[1:], lng[1:]))))
+    count = max(1, int(np.ceil(cumulative[-1] / spacing - 1e-9)))
+    distances = np.linspace(0.0, cumulative[-1], count + 1)
+    return np.column_stack((np.interp(distances, cumulative, lat), np.interp(distances, cumulative, lng)))
+
+class Route:
+    """A walking route with per-point headings and distances, computed once when it arrives.
+
+    Stepping along the route is an index lookup: the point's position and
+    the heading to face are ready to send, and progress is measured by
+    distance walked rather than by point count.
+    """
+
+    def __init__(self, points, pano_ids=None):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)  # (N, 2) lat, lng in degrees
+        self.pano_ids = list(pano_ids) if pano_ids is not None else [None] * len(self.points)  # Known panorama per point
+        lat, lng = self.points[:, 0], self.points[:, 1]
+
+        self.segment_lengths = haversine_m(lat[:-1], lng[:-1], lat[1:], lng[1:])  # (N-1,) meters
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.segment_lengths)))  # (N,) meters from the start
+        self.length = float(self.cumulative[-1]) if len(self.points) else 0.0
+
+        # Heading to face at each point when walking forward (towards the next point) and
+        # backward (towards the previous one). End points keep the heading of their segment.
+        segment_headings = initial_heading(lat[:-1], lng[:-1], lat[1:], lng[1:])
+        reverse_headings = initial_heading(lat[1:], lng[1:], lat[:-1], lng[:-1])
+        if len(segment_headings):
+            self.headings = np.append(segment_headings, segment_headings[-1])
+            self.backward_headings = np.insert(reverse_headings, 0, reverse_headings[0])
+        else:
+            self.headings = np.full(len(self.points), np.nan)
+            self.backward_headings = np.full(len(self.points), np.nan)
+
+    @classmethod
+    def from_json(cls, route_points_json):
+        """Build a route from the [[lat, lng], ...] JSON the page sends"""
+        return cls(json.loads(route_points_json))
+
+    def resampled(self, spacing):
+        """A copy with duplicates removed and points `spacing` meters apart"""
+        return Route(resample(self.points, spacing))
+
+    def merged_by_panorama(self, pano_ids):
+        """Merge runs of consecutive points that resolve to the same panorama.
+
+        Returns the merged route and, for each of its points, the index of the
+        point it came from. Points without a panorama id are never merged.
+        """
+        pano_ids = list(pano_ids)
+        keep = [i for i, pano_id in enumerate(pano_ids)
+                if i == 0 or pano_id is None or pano_id != pano_ids[i - 1]]
+        kept = np.asarray(keep, dtype=np.int64)
+        return Route(self.points[kept], [pano_ids[i] for i in keep]), kept
+
+    def __len__(self):
+        return len(self.points)
+
+    def position(self, index):
+        lat, lng = self.points[index]
+        return float(lat), float(lng)
+
+    def heading(self, index, backward=False):
+        """Heading to face at a point, or None if the route has no segments"""
+        heading = (self.backward_headings if backward else self.headings)[index]
+        return None if np.isnan(heading) else float(heading)
+
+    def progress(self, index):
+        """Fraction of the route's distance covered on reaching a point"""
+        if self.length == 0:
+            return 1.0 if index >= len(self.points) - 1 else 0.0
+        return float(self.cumulative[index] / self.length)
+
+    def remaining(self, index):
+        """Meters left to the destination from a point"""
+        return self.length - float(self.cumulative[index])
@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+class StartupTimer:
+    """Start and end times of the startup phases, which run on several threads at once.
+
+    Times are seconds since the timer was created, which for the shared
+    `startup_timer` is when main.py started importing. Startup is complete
+    once every phase passed to expect() has ended.
+    """
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.phases = {}  # name -> [start, end], end is None while running
+        self.expected = set()
+        self.completed = False
+        self._lock = threading.Lock()
+
+    def now(self):
+        return time.monotonic() - self.origin
+
+    def expect(self, *names):
+        """Phases that must end before startup counts as complete"""
+        with self._lock:
+            self.expected.update(names)
+
+    def begin(self, name):
+        with self._lock:
+            self.phases[name] = [self.now(), None]
+
+    def end(self, name):
+        with self._lock:
+            if name not in self.phases:
+                self.phases[name] = [0.0, None]
+            if self.phases[name][1] is None:
+                self.phases[name][1] = self.now()
+
+    def complete(self):
+        """True for the first call made after every expected phase has ended"""
+        with self._lock:
+            if self.completed or any(self.phases.get(n, (0, None))[1] is None for n in self.expected):
+                return False
+            self.completed = True
+            return True
+
+    @contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def report(self):
+        with self._lock:
+            phases = {name: {"start_ms": start * 1000, "end_ms": None if end is None else end * 1000,
+                             "duration_ms": None if end is None else (end - start) * 1000}
+                      for name, (start, end) in sorted(self.phases.items(), key=lambda item: item[1][0])}
+        ends = [phase["end_ms"] for phase in phases.values() if phase["end_ms"] is not None]
+        return {"time": time.time(), "total_ms": max(ends) if ends else 0.0, "phases": phases}
+
+    def lines(self, report=None):
+        report = report or self.report()
+        lines = [f"Startup took {report['total_ms']:.0f} ms"]
+        for name, phase in report["phases"].items():
+            if phase["end_ms"] is None:
+                lines.append(f"  {name:<14} {phase['start_ms']:7.0f} ms  ->  (running)")
+            else:
+                lines.append(f"  {name:<14} {phase['start_ms']:7.0f} ms  -> {phase['end_ms']:7.0f} ms"
+                             f"  ({phase['duration_ms']:.0f} ms)")
+        return lines
+
+    def save(self, path, report=None):
+        """Append the report as one JSON line, so launches can be compared over time"""
+        try:
+            with open(path, "a") as f:
+                f.write(json.dumps(report or self.report()) + "\n")
+        except OSError as e:
+            print(f"Error saving startup report: {e}")
+
+startup_timer = StartupTimer()  # Shared by main.py and the threads it starts
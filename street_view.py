@@ -1,9 +1,250 @@
 import sys
+import json
+import time
+import numpy as np
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QProgressBar, QMessageBox, QLabel
 from PyQt5.QtWebEngineWidgets import QWebEngineView
 from PyQt5.QtWebChannel import QWebChannel
-from PyQt5.QtCore import QUrl, QObject, pyqtSlot, Qt
-from config import GOOGLE_MAPS_API_KEY
+from PyQt5.QtCore import QUrl, QObject, pyqtSignal, pyqtSlot, Qt
+from config import (
+    ROUTE_SPACING_M, ROUTE_MERGE_PANORAMAS, ROUTE_RESOLVE_IN_FLIGHT, ROUTE_PANORAMA_RADIUS,
+    POV_MAX_LEAD_DEG, POV_MAX_COMMAND_AGE_MS,
+)
+from latency import latency_tracker
+from route import Route
+from maps_backend import get_backend
+from web_profile import use_shared_profile
+from panorama_prefetch import PanoramaPrefetcher
+from metrics import metrics
+
+route_steps = metrics.counter("route_steps_total", "Steps taken along the active route", ("direction",))
+destinations_reached = metrics.counter("destinations_reached_total", "Routes walked to the end")
+
+# Navigation controller loaded once with the page. Gestures call it with short
+# commands such as nav.rotate(-10) instead of sending a whole script each time.
+NAV_CONTROLLER_JS = """
+const nav = {
+    pending: null,      // {token, event} of the last timed command
+    targetPov: null,        // POV that rotate/pitch animate towards
+    animationFrame: null,   // requestAnimationFrame id while the view is off target
+    lastFrameTime: null,
+    smoothing: 0.35,        // Share of the remaining turn covered per frame (~10 frames to settle)
+    maxLead: 45,            // Degrees the target may run ahead of the view
+    maxCommandAge: 300,     // ms after which a queued rotate/pitch command is dropped
+    droppedCommands: 0,
+    velocity: {heading: 0, pitch: 0},  // Degrees per second from analog control
+    velocityUntil: 0,       // Animation time after which the velocity lapses unless refreshed
+    velocityHold: 250,      // ms a velocity lasts without an update, so a stalled stream stops turning
+
+    // Report the next `event` from the panorama back to Python as `token` (0 for untimed commands)
+    expect: function(token, event) {
+        this.pending = token ? {token: token, event: event} : null;
+    },
+
+    applied: function(event) {
+        if (this.pending && this.pending.event === event && window.bridge) {
+            window.bridge.navigationApplied(this.pending.token);
+            this.pending = null;
+        }
+    },
+
+    // Step ~10 meters to the nearest panorama; direction is +1 forward, -1 backward
+    walk: function(direction) {
+        if (!panorama) return;
+        const heading = (panorama.getPov().heading + (direction < 0 ? 180 : 0)) % 360;
+        const target = google.maps.geometry.spherical.computeOffset(panorama.getPosition(), 10, heading);
+        streetViewService.getPanorama({
+            location: target,
+            radius: 50,
+            preference: google.maps.StreetViewPreference.NEAREST
+        }, function(data, status) {
+            if (status === 'OK') {
+                panorama.setPosition(data.location.latLng);
+            }
+        });
+    },
+
+    // Jump to a route point; heading is precomputed in Python, null keeps the current one.
+    // With a prefetched panorama id the panorama is set directly instead of searched for.
+    goTo: function(lat, lng, heading, panoId) {
+        if (!panorama) return;
+        const pov = panorama.getPov();
+        if (panoId) {
+            panorama.setPano(panoId);
+        } else {
+            panorama.setPosition(new google.maps.LatLng(lat, lng));
+        }
+        panorama.setPov({heading: heading === null ? pov.heading : heading, pitch: pov.pitch});
+    },
+
+    // Look up the panoramas of [index, lat, lng] route points and report each id to Python
+    prefetch: function(generation, points, radius) {
+        points.forEach(point => {
+            streetViewService.getPanorama({
+                location: new google.maps.LatLng(point[1], point[2]),
+                radius: radius,
+                preference: google.maps.StreetViewPreference.NEAREST
+            }, function(data, status) {
+                if (window.bridge) {
+                    if (status === 'OK') {
+                        const position = data.location.latLng;
+                        window.bridge.panoramaPrefetched(generation, point[0], data.location.pano, position.lat(), position.lng());
+                    } else {
+                        window.bridge.panoramaPrefetched(generation, point[0], '', 0, 0);
+                    }
+                }
+            });
+        });
+    },
+
+    // Load a panorama in a hidden view so its tiles are cached before the user steps onto it
+    warmView: null,
+    warm: function(panoId) {
+        if (!this.warmView) {
+            this.warmView = new google.maps.StreetViewPanorama(
+                document.getElementById('warm-view'), {visible: true, disableDefaultUI: true}
+            );
+        }
+        if (this.warmView.getPano() !== panoId) {
+            this.warmView.setPano(panoId);
+        }
+    },
+
+    // Look up the panorama nearest each [lat, lng] point, at most maxInFlight at a time,
+    // then pass the ids (null where none was found) to done
+    resolvePanoramas: function(points, radius, maxInFlight, done) {
+        const ids = new Array(points.length).fill(null);
+        let next = 0;
+        let finished = 0;
+        const launch = () => {
+            if (next >= points.length) return;
+            const i = next++;
+            streetViewService.getPanorama({
+                location: new google.maps.LatLng(points[i][0], points[i][1]),
+                radius: radius,
+                preference: google.maps.StreetViewPreference.NEAREST
+            }, function(data, status) {
+                if (status === 'OK') {
+                    ids[i] = data.location.pano;
+                }
+                finished++;
+                if (finished === points.length) {
+                    done(ids);
+                } else {
+                    launch();
+                }
+            });
+        };
+        if (points.length === 0) {
+            done(ids);
+        }
+        for (let i = 0; i < maxInFlight; i++) {
+            launch();
+        }
+    },
+
+    // Rotate/pitch commands carry the wall-clock time Python sent them at, in ms
+    rotate: function(degrees, sentAt) {
+        this.turn(degrees, 0, sentAt);
+    },
+
+    pitch: function(degrees, sentAt) {
+        this.turn(0, degrees, sentAt);
+    },
+
+    // Commands move one shared target POV; a single requestAnimationFrame loop eases the
+    // view towards it and stops once it arrives
+    turn: function(headingDelta, pitchDelta, sentAt) {
+        if (!panorama) return;
+        if (sentAt && Date.now() - sentAt > this.maxCommandAge) {
+            this.droppedCommands++;  // Sat in a queue too long to still mean anything
+            return;
+        }
+        const current = panorama.getPov();
+        const from = this.targetPov || current;
+        // Bound how far queued commands can run the target ahead of what is on screen
+        const lead = this.wrap(from.heading + headingDelta - current.heading);
+        const heading = current.heading + Math.max(-this.maxLead, Math.min(this.maxLead, lead));
+        const pitch = Math.max(current.pitch - this.maxLead, Math.min(current.pitch + this.maxLead, from.pitch + pitchDelta));
+        this.targetPov = {
+            heading: (heading + 360) % 360,
+            pitch: Math.max(-90, Math.min(90, pitch))
+        };
+        this.startAnimation();
+    },
+
+    // Analog control: turn continuously at these rates (degrees per second) until the next update
+    setVelocity: function(headingRate, pitchRate, sentAt) {
+        if (!panorama) return;
+        if (sentAt && Date.now() - sentAt > this.maxCommandAge) {
+            this.droppedCommands++;
+            return;
+        }
+        this.velocity = {heading: headingRate, pitch: pitchRate};
+        this.velocityUntil = performance.now() + this.velocityHold;
+        if (headingRate !== 0 || pitchRate !== 0) {
+            this.startAnimation();
+        }
+    },
+
+    startAnimation: function() {
+        if (this.animationFrame === null) {
+            this.lastFrameTime = null;
+            this.animationFrame = requestAnimationFrame(time => this.animate(time));
+        }
+    },
+
+    animate: function(time) {
+        // Close a fixed share of the gap per 60 Hz frame, whatever the real frame rate
+        const elapsed = this.lastFrameTime === null ? 16.7 : Math.min(time - this.lastFrameTime, 100);
+        this.lastFrameTime = time;
+        let pov = panorama.getPov();
+        let changed = false;
+
+        // Analog velocity moves the view directly, with no easing, so it tracks the hand
+        const spinning = time < this.velocityUntil && (this.velocity.heading !== 0 || this.velocity.pitch !== 0);
+        if (spinning) {
+            pov = {
+                heading: (pov.heading + this.velocity.heading * elapsed / 1000 + 360) % 360,
+                pitch: Math.max(-90, Math.min(90, pov.pitch + this.velocity.pitch * elapsed / 1000))
+            };
+            changed = true;
+        }
+
+        const target = this.targetPov;
+        if (target) {
+            const headingDelta = this.wrap(target.heading - pov.heading);
+            const pitchDelta = target.pitch - pov.pitch;
+            if (Math.abs(headingDelta) < 0.1 && Math.abs(pitchDelta) < 0.1) {
+                pov = target;
+                this.targetPov = null;
+            } else {
+                const share = 1 - Math.pow(1 - this.smoothing, elapsed / 16.7);
+                pov = {
+                    heading: (pov.heading + headingDelta * share + 360) % 360,
+                    pitch: pov.pitch + pitchDelta * share
+                };
+            }
+            changed = true;
+        }
+
+        if (changed) {
+            panorama.setPov(pov);
+        }
+        if (spinning || this.targetPov) {
+            this.animationFrame = requestAnimationFrame(time => this.animate(time));
+        } else {
+            this.animationFrame = null;
+        }
+    },
+
+    // Signed smallest angle in [-180, 180)
+    wrap: function(degrees) {
+        return ((degrees % 360) + 540) % 360 - 180;
+    }
+};
+"""
+
 
 class StreetViewBridge(QObject):
     def __init__(self, street_view):
@@ -18,19 +259,34 @@ class StreetViewBridge(QObject):
     def routeStatus(self, status):
         print(f"Route status: {status}")
 
-    @pyqtSlot(str)
-    def routeCalculated(self, route_points_json):
-        """Called when JavaScript has calculated a new route"""
-        import json
-        route_points = json.loads(route_points_json)
-        self._street_view.current_route = route_points
-        self._street_view.current_route_index = 0
-        self._street_view.has_active_route = True
-        print(f"Route calculated with {len(route_points)} points")
+    @pyqtSlot(int, str)
+    def routeCalculated(self, request_id, route_points_json):
+        """Called when JavaScript has calculated a new route for calculate_route() call request_id"""
+        self._street_view.on_route_calculated(request_id, json.loads(route_points_json))
+
+    @pyqtSlot(int, str)
+    def routePanoramasResolved(self, generation, pano_ids_json):
+        """Called with the panorama id of every route point, for merging"""
+        self._street_view.on_route_panoramas(generation, json.loads(pano_ids_json))
+
+    @pyqtSlot(int, int, str, float, float)
+    def panoramaPrefetched(self, generation, index, pano_id, lat, lng):
+        """Called with a looked-up route panorama id ('' if none was found) and its position"""
+        self._street_view.on_panorama_prefetched(generation, index, pano_id, lat, lng)
+
+    @pyqtSlot(int)
+    def navigationApplied(self, token):
+        """Called when the panorama reports a navigation command took effect"""
+        self._street_view.on_navigation_applied(token)
 
 class StreetView(QWebEngineView):
-    def __init__(self):
+    route_loaded = pyqtSignal(object)  # [[lat, lng], ...] of the route being followed
+    destination_reached = pyqtSignal()
+    def __init__(self, geo_cache=None, backend=None):
         super().__init__()
+        use_shared_profile(self)  # Disk HTTP cache shared with the other view and across launches
+        self.geo_cache = geo_cache  # GeoCache for routes and panorama lookups, or None
+        self.backend = backend or get_backend()  # Where the Maps JavaScript API comes from
         self.default_lat = 40.91439
         self.default_lng = -73.12453
         
@@ -38,6 +294,16 @@ class StreetView(QWebEngineView):
         self.current_route = []
         self.current_route_index = -1
         self.has_active_route = False
+        self._route_request = 0  # Id of the latest calculate_route() call; older responses are not followed
+        self._pending_routes = {}  # Request id -> (origin, destination) of routes being calculated, for caching
+        self._route_generation = 0  # Bumped per route so late panorama lookups for an old one are ignored
+        self.prefetcher = PanoramaPrefetcher()
+        self._warmed_pano = None
+
+        # Latency traces of navigation commands waiting for the page to confirm them
+        self._pending_trace = None
+        self._nav_token = 0
+        self._nav_traces = {}
         
         # Enable web channel
         self.channel = QWebChannel()
@@ -77,23 +343,30 @@ class StreetView(QWebEngineView):
             <meta charset="utf-8">
             <title>Street View</title>
             <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
-            <script src="https://maps.googleapis.com/maps/api/js?key={GOOGLE_MAPS_API_KEY}&libraries=geometry"></script>
+            <script src="{self.backend.script_url()}"></script>
             <style>
                 html, body {{ height: 100%; margin: 0; padding: 0; }}
                 #street-view {{ height: 100%; }}
+                #warm-view {{ position: absolute; left: -10000px; top: 0; width: 100%; height: 100%; }}
             </style>
         </head>
         <body>
             <div id="street-view"></div>
+            <div id="warm-view"></div>
+            <script>{NAV_CONTROLLER_JS}</script>
+            <script>
+                nav.maxLead = {POV_MAX_LEAD_DEG};
+                nav.maxCommandAge = {POV_MAX_COMMAND_AGE_MS};
+            </script>
             <script>
                 let panorama;
                 let directionsService;
-                let routePoints = [];
-                let currentRouteIndex = -1;
+                let streetViewService;
 
                 function initStreetView() {{
                     // Initialize services
                     directionsService = new google.maps.DirectionsService();
+                    streetViewService = new google.maps.StreetViewService();
                     
                     // Initialize panorama
                     panorama = new google.maps.StreetViewPanorama(
@@ -106,13 +379,21 @@ class StreetView(QWebEngineView):
                         }}
                     );
 
+                    // Confirm timed navigation commands once the panorama has applied them
+                    panorama.addListener('pano_changed', function() {{
+                        nav.applied('pano_changed');
+                    }});
+                    panorama.addListener('pov_changed', function() {{
+                        nav.applied('pov_changed');
+                    }});
+
                     // Setup WebChannel
                     new QWebChannel(qt.webChannelTransport, function(channel) {{
                         window.bridge = channel.objects.streetViewBridge;
                     }});
                 }}
 
-                function calculateRoute(startLat, startLng, destLat, destLng) {{
+                function calculateRoute(requestId, startLat, startLng, destLat, destLng) {{
                     const start = new google.maps.LatLng(startLat, startLng);
                     const end = new google.maps.LatLng(destLat, destLng);
 
@@ -124,7 +405,7 @@ class StreetView(QWebEngineView):
                         }},
                         function(response, status) {{
                             if (status === 'OK') {{
-                                routePoints = [];
+                                const routePoints = [];
                                 const route = response.routes[0];
                                 
                                 route.legs[0].steps.forEach(step => {{
@@ -135,11 +416,9 @@ class StreetView(QWebEngineView):
                                 }});
                                 routePoints.push(route.legs[0].end_location);
                                 
-                                currentRouteIndex = 0;
-                                
                                 // Send route to Python but don't move yet
                                 if (window.bridge) {{
-                                    window.bridge.routeCalculated(JSON.stringify(
+                                    window.bridge.routeCalculated(requestId, JSON.stringify(
                                         routePoints.map(p => [p.lat(), p.lng()])
                                     ));
                                 }}
@@ -148,30 +427,6 @@ class StreetView(QWebEngineView):
                     );
                 }}
 
-                function moveToRoutePoint(index) {{
-                    if (index >= 0 && index < routePoints.length) {{
-                        const point = routePoints[index];
-                        let heading = panorama.getPov().heading;
-                        
-                        if (index < routePoints.length - 1) {{
-                            heading = google.maps.geometry.spherical.computeHeading(
-                                point,
-                                routePoints[index + 1]
-                            );
-                        }}
-                        
-                        panorama.setPosition(point);
-                        panorama.setPov({{
-                            heading: heading,
-                            pitch: 0
-                        }});
-                        
-                        currentRouteIndex = index;
-                        return true;
-                    }}
-                    return false;
-                }}
-
                 // Initialize when page loads
                 window.onload = initStreetView;
             </script>
@@ -186,6 +441,23 @@ class StreetView(QWebEngineView):
         self.current_route = []
         self.current_route_index = -1
         self.has_active_route = False
+        self.progress_bar.show()
+        self.progress_bar.setValue(0)
+
+        # Every call gets an id, so a late response to an earlier call is cached under its own
+        # destination and does not replace the route asked for last
+        self._route_request += 1
+        request_id = self._route_request
+
+        # Repeat destinations load from the cache without a DirectionsService round trip
+        origin, destination = (self.default_lat, self.default_lng), (destLat, destLng)
+        if self.geo_cache is not None:
+            cached = self.geo_cache.get_route(origin, destination)
+            if cached is not None:
+                self.set_position(self.default_lat, self.default_lng)
+                self.load_route(cached, "cache")
+                return
+            self._pending_routes[request_id] = (origin, destination)
         
         # Calculate route from current position to destination
         js_code = f"""
@@ -195,7 +467,7 @@ class StreetView(QWebEngineView):
             let currentPov = panorama.getPov();
             
             // Calculate route
-            calculateRoute({self.default_lat}, {self.default_lng}, {destLat}, {destLng});
+            calculateRoute({request_id}, {self.default_lat}, {self.default_lng}, {destLat}, {destLng});
             
             // Return to original position after route calculation
             panorama.setPosition(new google.maps.LatLng({self.default_lat}, {self.default_lng}));
@@ -203,150 +475,166 @@ class StreetView(QWebEngineView):
         }}
         """
         self.page().runJavaScript(js_code)
-        self.progress_bar.show()
-        self.progress_bar.setValue(0)
+
+    def on_route_calculated(self, request_id, points):
+        """Route points from DirectionsService for calculate_route() call request_id, before resampling"""
+        key = self._pending_routes.pop(request_id, None)
+        if key is not None:
+            self.geo_cache.put_route(*key, points)
+        if request_id != self._route_request:
+            print(f"Ignoring route for superseded request {request_id}")
+            return
+        # Requests that failed in JavaScript never answer; nothing older is still wanted
+        self._pending_routes.clear()
+        self.load_route(points, "DirectionsService")
+
+    def load_route(self, points, source):
+        raw = Route(points)
+        route = raw.resampled(ROUTE_SPACING_M)
+        print(f"Route from {source} with {len(raw)} points, {route.length:.0f} m; resampled to {len(route)} points")
+        self.set_route(route)
+        self.route_loaded.emit(route.points.tolist())
+
+    def set_trace(self, trace):
+        """Attach a gesture's latency trace to the next navigation command"""
+        self._pending_trace = trace
+
+    def run_navigation(self, command, applied_event):
+        """Send a nav controller command and time it until the panorama fires applied_event"""
+        trace, self._pending_trace = self._pending_trace, None
+        if trace is None:
+            # Clear any older pending command so this one isn't mistaken for it
+            self.page().runJavaScript(f"nav.expect(0); {command};")
+            return
+
+        self._nav_token += 1
+        token = self._nav_token
+        dispatched = time.monotonic()
+        self._nav_traces[token] = (trace, dispatched)
+        if len(self._nav_traces) > 32:
+            # Commands the page never confirmed (e.g. no panorama nearby) are dropped
+            del self._nav_traces[next(iter(self._nav_traces))]
+
+        js_code = f"nav.expect({token}, '{applied_event}'); {command};"
+        self.page().runJavaScript(js_code, lambda result: latency_tracker.record_since("run_javascript", dispatched))
+
+    def on_navigation_applied(self, token):
+        entry = self._nav_traces.pop(token, None)
+        if entry is None:
+            return
+        trace, dispatched = entry
+        now = time.monotonic()
+        latency_tracker.record_since("panorama_applied", dispatched, now)
+        latency_tracker.record_since("total", trace["capture"], now)
+
+    def set_route(self, route):
+        """Start following a new route from its first point"""
+        self._route_generation += 1
+        self.current_route = route
+        self.current_route_index = 0
+        self.has_active_route = True
+        self.prefetcher.reset(route)
+        self.prefetch()
+        if ROUTE_MERGE_PANORAMAS and len(route) > 1:
+            points = json.dumps([[round(lat, 7), round(lng, 7)] for lat, lng in route.points.tolist()])
+            self.page().runJavaScript(
+                f"nav.resolvePanoramas({points}, {ROUTE_PANORAMA_RADIUS}, {ROUTE_RESOLVE_IN_FLIGHT}, "
+                f"ids => window.bridge.routePanoramasResolved({self._route_generation}, JSON.stringify(ids)));"
+            )
+
+    def on_route_panoramas(self, generation, pano_ids):
+        """Merge route points that share a panorama, keeping the user's place on the route"""
+        if generation != self._route_generation or len(pano_ids) != len(self.current_route):
+            return
+        route, kept = self.current_route.merged_by_panorama(pano_ids)
+        self.current_route_index = int(np.searchsorted(kept, self.current_route_index, side="right")) - 1
+        self.current_route = route
+        self.prefetcher.reset(route)
+        self.prefetch()
+        self.update_progress()
+        print(f"Route merged to {len(route)} panoramas")
+
+    def update_progress(self):
+        """Show route progress by distance walked, not by number of points"""
+        self.progress_bar.setValue(int(self.current_route.progress(self.current_route_index) * 100))
+
+    def go_to_route_point(self, index, backward=False):
+        """Move to a route point facing along the route in the direction of travel"""
+        lat, lng = self.current_route.position(index)
+        heading = self.current_route.heading(index, backward)
+        heading = "null" if heading is None else f"{heading:.2f}"
+        pano_id = self.prefetcher.lookup(index)
+        pano_id = "null" if pano_id is None else json.dumps(pano_id)
+        self.run_navigation(f"nav.goTo({lat:.7f}, {lng:.7f}, {heading}, {pano_id})", "pano_changed")
+        self.prefetch(backward)
+
+    def prefetch(self, backward=False):
+        """Look up panoramas ahead of the current route point and warm the next one"""
+        self.request_panoramas(self.prefetcher.wanted(self.current_route_index, backward))
+        self.warm_next()
+
+    def request_panoramas(self, indices):
+        lookups, cached = [], []
+        for i in indices:
+            lat, lng = self.current_route.position(i)
+            hit = self.geo_cache.get_panorama(lat, lng, ROUTE_PANORAMA_RADIUS) if self.geo_cache is not None else None
+            if hit is None:
+                lookups.append([i, lat, lng])
+            else:
+                cached.append((i, hit["pano"]))
+        if lookups:
+            self.page().runJavaScript(
+                f"nav.prefetch({self.prefetcher.generation}, {json.dumps(lookups)}, {ROUTE_PANORAMA_RADIUS});"
+            )
+        for i, pano_id in cached:
+            self.resolve_panorama(self.prefetcher.generation, i, pano_id)
+
+    def warm_next(self):
+        pano_id = self.prefetcher.next_pano()
+        if pano_id and pano_id != self._warmed_pano:
+            self._warmed_pano = pano_id
+            self.page().runJavaScript(f"nav.warm({json.dumps(pano_id)});")
+
+    def on_panorama_prefetched(self, generation, index, pano_id, lat, lng):
+        if pano_id and self.geo_cache is not None and generation == self.prefetcher.generation:
+            point_lat, point_lng = self.current_route.position(index)
+            self.geo_cache.put_panorama(point_lat, point_lng, ROUTE_PANORAMA_RADIUS, {"pano": pano_id, "lat": lat, "lng": lng})
+        self.resolve_panorama(generation, index, pano_id)
+
+    def resolve_panorama(self, generation, index, pano_id):
+        more = self.prefetcher.on_resolved(generation, index, pano_id)
+        if generation == self.prefetcher.generation:
+            self.request_panoramas(more)
+            self.warm_next()
 
     def move_forward(self):
         """Move forward along the street or route"""
         if self.has_active_route:
             if self.current_route_index < len(self.current_route) - 1:
                 self.current_route_index += 1
-                progress = int((self.current_route_index / (len(self.current_route) - 1)) * 100)
-                self.progress_bar.setValue(progress)
+                self.update_progress()
                 
                 # Check if destination reached
                 if self.current_route_index == len(self.current_route) - 1:
                     self.show_destination_reached()
                     
-                lat, lng = self.current_route[self.current_route_index]
-                js_code = f"""
-                if (panorama) {{
-                    let point = new google.maps.LatLng({lat}, {lng});
-                    let nextPoint = null;
-                    
-                    // Calculate heading towards next point if available
-                    if ({self.current_route_index} < {len(self.current_route) - 1}) {{
-                        let nextLat = {self.current_route[self.current_route_index + 1][0]};
-                        let nextLng = {self.current_route[self.current_route_index + 1][1]};
-                        nextPoint = new google.maps.LatLng(nextLat, nextLng);
-                    }}
-                    
-                    // Get current heading for smooth transition
-                    let currentPov = panorama.getPov();
-                    let newHeading = currentPov.heading;
-                    
-                    if (nextPoint) {{
-                        newHeading = google.maps.geometry.spherical.computeHeading(point, nextPoint);
-                    }}
-                    
-                    panorama.setPosition(point);
-                    panorama.setPov({{
-                        heading: newHeading,
-                        pitch: currentPov.pitch
-                    }});
-                }}
-                """
-                self.page().runJavaScript(js_code)
+                self.go_to_route_point(self.current_route_index)
+                route_steps.inc(direction="forward")
                 print(f"Moving forward to point {self.current_route_index}/{len(self.current_route)-1}")
         else:
-            js_code = """
-            if (panorama) {
-                let position = panorama.getPosition();
-                let pov = panorama.getPov();
-                let heading = pov.heading;
-                
-                // Calculate new position ~10 meters forward in current heading direction
-                let latLng = google.maps.geometry.spherical.computeOffset(
-                    position,
-                    10,  // meters
-                    heading
-                );
-                
-                // Create a Street View Service
-                let sv = new google.maps.StreetViewService();
-                
-                // Find nearest panorama
-                sv.getPanorama({
-                    location: latLng,
-                    radius: 50,
-                    preference: google.maps.StreetViewPreference.NEAREST
-                }, function(data, status) {
-                    if (status === 'OK') {
-                        panorama.setPosition(data.location.latLng);
-                    }
-                });
-            }
-            """
-            self.page().runJavaScript(js_code)
+            self.run_navigation("nav.walk(1)", "pano_changed")
 
     def move_backward(self):
         """Move backward along the street or route"""
         if self.has_active_route:
             if self.current_route_index > 0:
                 self.current_route_index -= 1
-                progress = int((self.current_route_index / (len(self.current_route) - 1)) * 100)
-                self.progress_bar.setValue(progress)
-                
-                lat, lng = self.current_route[self.current_route_index]
-                js_code = f"""
-                if (panorama) {{
-                    let point = new google.maps.LatLng({lat}, {lng});
-                    let nextPoint = null;
-                    
-                    // Calculate heading towards next point if available
-                    if ({self.current_route_index} > 0) {{
-                        let nextLat = {self.current_route[self.current_route_index - 1][0]};
-                        let nextLng = {self.current_route[self.current_route_index - 1][1]};
-                        nextPoint = new google.maps.LatLng(nextLat, nextLng);
-                    }}
-                    
-                    // Get current heading for smooth transition
-                    let currentPov = panorama.getPov();
-                    let newHeading = currentPov.heading;
-                    
-                    if (nextPoint) {{
-                        newHeading = google.maps.geometry.spherical.computeHeading(point, nextPoint);
-                    }}
-                    
-                    panorama.setPosition(point);
-                    panorama.setPov({{
-                        heading: newHeading,
-                        pitch: currentPov.pitch
-                    }});
-                }}
-                """
-                self.page().runJavaScript(js_code)
+                self.update_progress()
+                self.go_to_route_point(self.current_route_index, backward=True)
+                route_steps.inc(direction="backward")
                 print(f"Moving backward to point {self.current_route_index}/{len(self.current_route)-1}")
         else:
-            js_code = """
-            if (panorama) {
-                let position = panorama.getPosition();
-                let pov = panorama.getPov();
-                let heading = pov.heading;
-                
-                // Calculate new position ~10 meters backward (opposite of heading)
-                let latLng = google.maps.geometry.spherical.computeOffset(
-                    position,
-                    10,  // meters
-                    (heading + 180) % 360  // Opposite direction
-                );
-                
-                // Create a Street View Service
-                let sv = new google.maps.StreetViewService();
-                
-                // Find nearest panorama
-                sv.getPanorama({
-                    location: latLng,
-                    radius: 50,
-                    preference: google.maps.StreetViewPreference.NEAREST
-                }, function(data, status) {
-                    if (status === 'OK') {
-                        panorama.setPosition(data.location.latLng);
-                    }
-                });
-            }
-            """
-            self.page().runJavaScript(js_code)
+            self.run_navigation("nav.walk(-1)", "pano_changed")
 
     def set_position(self, lat, lng, is_destination=False):
         """Set the street view position - only if not a destination"""
@@ -358,123 +646,28 @@ class StreetView(QWebEngineView):
             """
             self.page().runJavaScript(js_code)
 
+    def set_view_rate(self, heading_rate, pitch_rate):
+        """Analog control: turn continuously at these rates in degrees per second until the next call"""
+        self.page().runJavaScript(f"nav.setVelocity({heading_rate:.1f}, {pitch_rate:.1f}, {int(time.time() * 1000)});")
+
     def move_up(self):
         """Adjust the camera pitch upward with smooth animation"""
-        js_code = """
-        if (panorama) {
-            let pov = panorama.getPov();
-            let targetPitch = Math.min(pov.pitch + 10, 90);
-            
-            // Animate the transition
-            let steps = 10;  // Number of animation steps
-            let pitchStep = (targetPitch - pov.pitch) / steps;
-            let currentStep = 0;
-            
-            function animate() {
-                if (currentStep < steps) {
-                    pov.pitch += pitchStep;
-                    panorama.setPov({
-                        heading: pov.heading,
-                        pitch: pov.pitch
-                    });
-                    currentStep++;
-                    requestAnimationFrame(animate);
-                }
-            }
-            
-            animate();
-        }
-        """
-        self.page().runJavaScript(js_code)
+        self.run_navigation(f"nav.pitch(10, {int(time.time() * 1000)})", "pov_changed")
 
     def move_down(self):
         """Adjust the camera pitch downward with smooth animation"""
-        js_code = """
-        if (panorama) {
-            let pov = panorama.getPov();
-            let targetPitch = Math.max(pov.pitch - 10, -90);
-            
-            // Animate the transition
-            let steps = 10;  // Number of animation steps
-            let pitchStep = (targetPitch - pov.pitch) / steps;
-            let currentStep = 0;
-            
-            function animate() {
-                if (currentStep < steps) {
-                    pov.pitch += pitchStep;
-                    panorama.setPov({
-                        heading: pov.heading,
-                        pitch: pov.pitch
-                    });
-                    currentStep++;
-                    requestAnimationFrame(animate);
-                }
-            }
-            
-            animate();
-        }
-        """
-        self.page().runJavaScript(js_code)
+        self.run_navigation(f"nav.pitch(-10, {int(time.time() * 1000)})", "pov_changed")
 
     def move_left(self):
         """Rotate the camera view left with smooth animation"""
-        js_code = """
-        if (panorama) {
-            let pov = panorama.getPov();
-            let targetHeading = (pov.heading - 10 + 360) % 360;
-            
-            // Animate the transition
-            let steps = 10;  // Number of animation steps
-            let headingStep = ((targetHeading - pov.heading + 180) % 360 - 180) / steps;
-            let currentStep = 0;
-            
-            function animate() {
-                if (currentStep < steps) {
-                    pov.heading = (pov.heading + headingStep + 360) % 360;
-                    panorama.setPov({
-                        heading: pov.heading,
-                        pitch: pov.pitch
-                    });
-                    currentStep++;
-                    requestAnimationFrame(animate);
-                }
-            }
-            
-            animate();
-        }
-        """
-        self.page().runJavaScript(js_code)
+        self.run_navigation(f"nav.rotate(-10, {int(time.time() * 1000)})", "pov_changed")
 
     def move_right(self):
         """Rotate the camera view right with smooth animation"""
-        js_code = """
-        if (panorama) {
-            let pov = panorama.getPov();
-            let targetHeading = (pov.heading + 10) % 360;
-            
-            // Animate the transition
-            let steps = 10;  // Number of animation steps
-            let headingStep = ((targetHeading - pov.heading + 180) % 360 - 180) / steps;
-            let currentStep = 0;
-            
-            function animate() {
-                if (currentStep < steps) {
-                    pov.heading = (pov.heading + headingStep + 360) % 360;
-                    panorama.setPov({
-                        heading: pov.heading,
-                        pitch: pov.pitch
-                    });
-                    currentStep++;
-                    requestAnimationFrame(animate);
-                }
-            }
-            
-            animate();
-        }
-        """
-        self.page().runJavaScript(js_code)
+        self.run_navigation(f"nav.rotate(10, {int(time.time() * 1000)})", "pov_changed")
 
     def show_destination_reached(self):
+        destinations_reached.inc()
         msg = QMessageBox(self)
         msg.setWindowTitle("Destination Reached")
         msg.setText("""
@@ -500,4 +693,5 @@ class StreetView(QWebEngineView):
                 background-color: #16a085;
             }
         """)
-        msg.exec_()
\ No newline at end of file
+        msg.exec_()
+        self.destination_reached.emit()
\ No newline at end of file
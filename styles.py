@@ -0,0 +1,54 @@
+MAIN_STYLE = """
+    QMainWindow, QWidget {
+        background-color: #2c3e50;
+        color: #ecf0f1;
+        font-family: Arial, sans-serif;
+    }
+    QLabel {
+        font-size: 14px;
+    }
+    QLabel[class="title-label"] {
+        font-size: 28px;
+        font-weight: bold;
+        color: #1abc9c;
+        padding: 10px;
+    }
+    QWidget[class="info-panel"] {
+        background-color: #34495e;
+        border-radius: 10px;
+        min-width: 300px;
+        max-width: 360px;
+    }
+    QWidget[class="gesture-view"] {
+        background-color: #2c3e50;
+        border: 2px solid #1abc9c;
+        border-radius: 10px;
+    }
+    QLabel[class="current-gesture"] {
+        font-size: 20px;
+        font-weight: bold;
+        color: #ecf0f1;
+        background-color: rgba(26, 188, 156, 0.2);
+        border-radius: 8px;
+        padding: 12px;
+    }
+    QProgressBar {
+        border: 1px solid #1abc9c;
+        border-radius: 4px;
+        background-color: #34495e;
+        text-align: center;
+        color: #ecf0f1;
+    }
+    QProgressBar::chunk {
+        background-color: #1abc9c;
+    }
+"""
+
+WELCOME_MESSAGE = """Welcome to the Virtual Street Explorer!
+
+Click a destination on the map to plan a walking route, then use hand gestures in front of the camera:
+
+• Two fingers up: move forward
+• Two fingers down: move backward
+• Thumb up / down: look up / down
+• Thumb left / right: turn left / right"""
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from adaptive_frontend import AdaptiveFrontEnd
+
+pytest.importorskip("cv2")
+
+WIDTH, HEIGHT = 320, 240
+
+def hand(x0, y0, x1, y1):
+    """21 landmarks spread over a box, normalized to whatever image MediaPipe was given"""
+    xs, ys = np.linspace(x0, x1, 21), np.linspace(y0, y1, 21)
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=0.1) for x, y in zip(xs, ys)])
+
+class FakeHands:
+    """Stands in for MediaPipe Hands: finds a hand in the middle of every image it gets, or none"""
+
+    def __init__(self):
+        self.shapes = []
+        self.visible = True
+
+    def process(self, rgb):
+        self.shapes.append(rgb.shape)
+        if not self.visible:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        return SimpleNamespace(multi_hand_landmarks=[hand(0.4, 0.4, 0.6, 0.6)])
+
+class FakeRecognizer:
+    def __init__(self):
+        self.hands = FakeHands()
+
+    def determine_gesture(self, hand_landmarks):
+        return "FORWARD"
+
+def front_end(**kwargs):
+    settings = dict(roi_enabled=False, margin=0.25, max_side=96, min_fraction=0.2, motion_enabled=False,
+                    motion_threshold=2.0, max_skip=3, latency=None)
+    settings.update(kwargs)
+    return AdaptiveFrontEnd(FakeRecognizer(), **settings)
+
+def frame(value=0):
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frame[:, :WIDTH // 2] = value
+    return frame
+
+def test_full_frames_without_gating_or_tracking():
+    adaptive = front_end()
+    for _ in range(3):
+        landmarks, gesture, inferred = adaptive.process(frame())
+        assert gesture == "FORWARD" and inferred
+    assert adaptive.stats == {"frames": 3, "inferences": 3, "skipped": 0, "roi": 0, "full": 3, "lost": 0}
+    assert adaptive.gesture_recognizer.hands.shapes == [(HEIGHT, WIDTH, 3)] * 3
+
+def test_still_frames_reuse_the_last_result_up_to_max_skip():
+    adaptive = front_end(motion_enabled=True)
+    first = adaptive.process(frame())
+    results = [adaptive.process(frame()) for _ in range(4)]
+    assert [inferred for _, _, inferred in results] == [False, False, False, True]
+    assert results[0][:2] == first[:2]
+    assert adaptive.stats["skipped"] == 3
+    assert adaptive.stats["inferences"] == 2
+
+def test_motion_triggers_inference():
+    adaptive = front_end(motion_enabled=True)
+    adaptive.process(frame(0))
+    assert adaptive.process(frame(200))[2]
+    assert not adaptive.process(frame(200))[2]
+    assert adaptive.stats["skipped"] == 1
+
+def test_tracks_the_hand_with_a_smaller_crop():
+    adaptive = front_end(roi_enabled=True)
+    adaptive.process(frame())
+    assert adaptive.roi is not None
+    x0, y0, x1, y1 = adaptive.roi
+    assert 0 <= x0 < 0.4 * WIDTH and 0.6 * WIDTH < x1 <= WIDTH
+    assert 0 <= y0 < 0.4 * HEIGHT and 0.6 * HEIGHT < y1 <= HEIGHT
+
+    landmarks, _, _ = adaptive.process(frame())
+    crop_shape = adaptive.gesture_recognizer.hands.shapes[-1]
+    assert max(crop_shape[:2]) <= 96
+    assert adaptive.stats["roi"] == 1
+    # Crop-normalized landmarks come back in full-frame coordinates
+    xs = [landmark.x for landmark in landmarks.landmark]
+    assert x0 / WIDTH < min(xs) and max(xs) < x1 / WIDTH
+
+def test_lost_hand_retries_the_full_frame():
+    adaptive = front_end(roi_enabled=True)
+    adaptive.process(frame())
+    adaptive.gesture_recognizer.hands.visible = False
+    landmarks, gesture, _ = adaptive.process(frame())
+    assert (landmarks, gesture) == (None, "NONE")
+    assert adaptive.roi is None
+    assert adaptive.stats["lost"] == 1
+    assert adaptive.stats["full"] == 2
+    assert adaptive.gesture_recognizer.hands.shapes[-1] == (HEIGHT, WIDTH, 3)
+
+def test_summary_reports_the_share_skipped():
+    adaptive = front_end(motion_enabled=True)
+    for _ in range(4):
+        adaptive.process(frame())
+    assert adaptive.summary() == ("4 frames, 1 inferences (3 skipped for no motion, 75.0% saved), "
+                                  "0 ROI crops, 1 full frames, 0 tracking losses")
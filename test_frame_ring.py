@@ -0,0 +1,117 @@
+import threading
+import numpy as np
+import pytest
+from frame_ring import FrameRing, FrameConsumer
+
+def frame(value, shape=(4, 6, 3)):
+    return np.full(shape, value, dtype=np.uint8)
+
+def test_needs_two_slots():
+    with pytest.raises(ValueError):
+        FrameRing(capacity=1)
+
+def test_consumer_sees_only_new_frames():
+    ring = FrameRing(capacity=4)
+    ring.write(frame(1))
+    consumer = ring.consumer()
+    assert consumer.read(timeout=0) == (None, None)
+    seq = ring.write(frame(2))
+    read_seq, view = consumer.read(timeout=0)
+    assert read_seq == seq
+    assert view[0, 0, 0] == 2
+
+def test_views_are_read_only_and_not_copies():
+    ring = FrameRing(capacity=4)
+    consumer = ring.consumer()
+    ring.write(frame(7))
+    _, view = consumer.read(timeout=0)
+    assert not view.flags.writeable
+    assert np.shares_memory(view, ring._buffers)
+
+def test_latest_policy_counts_skipped_frames_as_dropped():
+    ring = FrameRing(capacity=8)
+    consumer = ring.consumer(FrameConsumer.LATEST)
+    for value in range(5):
+        ring.write(frame(value))
+    seq, view = consumer.read(timeout=0)
+    assert seq == 4 and view[0, 0, 0] == 4
+    assert consumer.consumed == 1
+    assert consumer.dropped == 4
+
+def test_sequential_policy_reads_every_frame_in_order():
+    ring = FrameRing(capacity=8)
+    consumer = ring.consumer(FrameConsumer.SEQUENTIAL)
+    for value in range(3):
+        ring.write(frame(value))
+    assert [consumer.read(timeout=0)[0] for _ in range(3)] == [0, 1, 2]
+    assert consumer.dropped == 0
+
+def test_sequential_policy_drops_frames_the_ring_no_longer_holds():
+    ring = FrameRing(capacity=4)
+    consumer = ring.consumer(FrameConsumer.SEQUENTIAL)
+    for value in range(10):
+        ring.write(frame(value))
+    # Slots hold 6..9; 6 is the next one the producer overwrites, so reading starts at 7
+    seq, view = consumer.read(timeout=0)
+    assert seq == 7 and view[0, 0, 0] == 7
+    assert consumer.dropped == 7
+
+def test_consumers_keep_independent_cursors():
+    ring = FrameRing(capacity=4)
+    fast, slow = ring.consumer(), ring.consumer()
+    for value in range(3):
+        ring.write(frame(value))
+        fast.read(timeout=0)
+    slow.read(timeout=0)
+    assert (fast.consumed, fast.dropped) == (3, 0)
+    assert (slow.consumed, slow.dropped) == (1, 2)
+
+def test_slot_is_invalid_once_the_producer_wraps_around():
+    ring = FrameRing(capacity=4)
+    consumer = ring.consumer()
+    seq = ring.write(frame(1))
+    consumer.read(timeout=0)
+    for value in range(2, 5):
+        ring.write(frame(value))
+    assert ring.is_valid(seq)
+    ring.next_buffer()  # Invalidated as soon as the producer starts writing into it
+    assert not ring.is_valid(seq)
+    assert ring.timestamp(seq) is None
+
+def test_discard_moves_a_read_frame_to_dropped():
+    ring = FrameRing(capacity=4)
+    consumer = ring.consumer()
+    ring.write(frame(1))
+    consumer.read(timeout=0)
+    consumer.discard()
+    assert (consumer.consumed, consumer.dropped) == (0, 1)
+
+def test_shape_change_reallocates():
+    ring = FrameRing(capacity=4)
+    ring.write(frame(1))
+    seq = ring.write(frame(2, shape=(8, 8, 3)))
+    consumer = ring.consumer()
+    ring.write(frame(3, shape=(8, 8, 3)))
+    assert consumer.read(timeout=0)[1].shape == (8, 8, 3)
+    assert ring.is_valid(seq)
+
+def test_read_times_out_and_close_wakes_readers():
+    ring = FrameRing(capacity=4)
+    consumer = ring.consumer()
+    assert consumer.read(timeout=0.01) == (None, None)
+
+    results = []
+    reader = threading.Thread(target=lambda: results.append(consumer.read(timeout=5)))
+    reader.start()
+    ring.close()
+    reader.join(timeout=1)
+    assert not reader.is_alive()
+    assert results == [(None, None)]
+
+def test_listeners_get_each_committed_seq():
+    ring = FrameRing(capacity=4)
+    seen = []
+    ring.subscribe(seen.append)
+    for value in range(3):
+        ring.write(frame(value))
+    assert seen == [0, 1, 2]
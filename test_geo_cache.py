@@ -0,0 +1,99 @@
+import sqlite3
+import time
+from types import SimpleNamespace
+import pytest
+import geo_cache
+from geo_cache import GeoCache
+
+class Clock:
+    """Stands in for time.time() so TTL and access order don't depend on the wall clock"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    # Only geo_cache sees the fake clock; monotonic() still drives access-time flushes
+    monkeypatch.setattr(geo_cache, "time", SimpleNamespace(time=clock, monotonic=time.monotonic))
+    return clock
+
+def make_cache(tmp_path, **kwargs):
+    settings = dict(ttl=100.0, max_entries=3, precision=4, flush_interval=3600.0)
+    settings.update(kwargs)
+    return GeoCache(str(tmp_path / "geo.sqlite3"), **settings)
+
+def stored_keys(cache):
+    return sorted(key for (key,) in cache._db.execute("SELECT key FROM entries"))
+
+def test_round_trip_and_stats(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    assert cache.get("route", "a") is None
+    cache.put("route", "a", [[1.0, 2.0]])
+    assert cache.get("route", "a") == [[1.0, 2.0]]
+    summary = cache.summary()
+    assert summary["route"]["hits"] == 1 and summary["route"]["misses"] == 1
+    assert summary["route"]["hit_rate"] == 0.5
+    assert summary["entries"] == 1
+
+def test_nearby_points_share_an_entry(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put_route((1.00001, 2.00001), (3.0, 4.0), [[1.0, 2.0]])
+    assert cache.get_route((1.00002, 2.0), (3.00003, 4.0)) == [[1.0, 2.0]]
+    assert cache.get_route((1.001, 2.0), (3.0, 4.0)) is None
+    cache.put_panorama(1.0, 2.0, 50, {"pano": "p"})
+    assert cache.get_panorama(1.0, 2.0, 50) == {"pano": "p"}
+    assert cache.get_panorama(1.0, 2.0, 50, source="outdoor") is None
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put("panorama", "a", {"pano": "p"})
+    clock.now += 100.0
+    assert cache.get("panorama", "a") == {"pano": "p"}
+    clock.now += 0.5
+    assert cache.get("panorama", "a") is None
+    assert cache.stats["panorama"]["expired"] == 1
+    assert stored_keys(cache) == []
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    for key in "abc":
+        cache.put("route", key, key)
+        clock.now += 1.0
+    cache.get("route", "a")  # Now b is the least recently used
+    clock.now += 1.0
+    cache.put("route", "d", "d")
+    assert stored_keys(cache) == ["a", "c", "d"]
+    assert cache.evictions == 1
+
+def test_hits_are_written_in_batches(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put("route", "a", "a")
+    clock.now += 5.0
+    cache.get("route", "a")
+    (accessed,) = cache._db.execute("SELECT accessed FROM entries").fetchone()
+    assert accessed == 1000.0  # Kept in memory until a flush
+    cache.flush()
+    (accessed,) = cache._db.execute("SELECT accessed FROM entries").fetchone()
+    assert accessed == 1005.0
+
+def test_entries_survive_reopening(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put("route", "a", [1, 2, 3])
+    cache.get("route", "a")
+    cache.close()
+    reopened = make_cache(tmp_path)
+    assert reopened.get("route", "a") == [1, 2, 3]
+    reopened.close()
+
+def test_close_flushes_access_times(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put("route", "a", "a")
+    clock.now += 5.0
+    cache.get("route", "a")
+    cache.close()
+    with sqlite3.connect(str(tmp_path / "geo.sqlite3")) as db:
+        assert db.execute("SELECT accessed FROM entries").fetchone() == (1005.0,)
@@ -0,0 +1,87 @@
+import pytest
+from gesture_decision import GestureDecisionEngine
+
+FRAME = 1 / 32  # Seconds between frames; a power of two keeps the timestamps exact
+
+def engine(**kwargs):
+    # Explicit settings, so the tests don't move with config.py
+    settings = dict(window=6, decay=0.8, enter_score=0.45, exit_score=0.35, repeat_delay=0.6,
+                    repeat_rates={"FORWARD": 2.0, "LEFT": 0.0}, enter_scores={}, exit_scores={})
+    settings.update(kwargs)
+    return GestureDecisionEngine(**settings)
+
+def feed(engine, gestures, start=0.0):
+    """Feed one gesture per frame and return (timestamp, command) for every command"""
+    commands = []
+    for i, gesture in enumerate(gestures):
+        now = start + i * FRAME
+        command = engine.update(gesture, now)
+        if command is not None:
+            commands.append((now, command))
+    return commands
+
+def test_enters_on_the_second_consistent_frame():
+    commands = feed(engine(), ["NONE", "FORWARD", "FORWARD", "FORWARD"])
+    assert commands == [(2 * FRAME, "FORWARD")]
+
+def test_records_latency_from_gesture_onset():
+    decisions = engine()
+    feed(decisions, ["NONE", "FORWARD", "FORWARD"])
+    assert list(decisions.latencies) == [FRAME]
+
+def test_single_misread_frame_does_not_trigger():
+    assert feed(engine(), ["NONE"] * 3 + ["UP"] + ["NONE"] * 3) == []
+
+def test_single_misread_frame_does_not_interrupt():
+    decisions = engine()
+    feed(decisions, ["LEFT"] * 6)
+    assert decisions.active == "LEFT"
+    feed(decisions, ["NONE"], start=6 * FRAME)
+    assert decisions.active == "LEFT"
+    feed(decisions, ["NONE"] * 3, start=7 * FRAME)
+    assert decisions.active is None
+
+def test_repeats_after_the_delay_at_the_configured_rate():
+    commands = feed(engine(), ["FORWARD"] * 96)  # Three seconds held
+    times = [now for now, _ in commands]
+    entry = times[0]
+    assert times[1] - entry == pytest.approx(0.6, abs=FRAME)
+    # Deadlines step from the previous one, so frame timing doesn't make the rate drift
+    assert times[1:] == pytest.approx([entry + 0.6 + 0.5 * i for i in range(len(times) - 1)], abs=FRAME)
+    assert len(times) == 1 + 5
+
+def test_zero_rate_fires_once():
+    assert len(feed(engine(), ["LEFT"] * 96)) == 1
+
+def test_stall_gives_one_repeat_not_a_burst():
+    decisions = engine()
+    feed(decisions, ["FORWARD"] * 32)
+    # No frames for three seconds, then the hand is still there
+    commands = feed(decisions, ["FORWARD"] * 8, start=32 * FRAME + 3.0)
+    assert len(commands) == 1
+    resumed = commands[0][0]
+    later = feed(decisions, ["FORWARD"] * 24, start=resumed + 8 * FRAME)
+    assert later[0][0] - resumed == pytest.approx(0.5, abs=FRAME)
+
+def test_release_and_press_again_fires_again():
+    commands = feed(engine(), ["UP"] * 4 + ["NONE"] * 6 + ["UP"] * 4)
+    assert [command for _, command in commands] == ["UP", "UP"]
+
+def test_per_gesture_enter_score():
+    strict = engine(enter_scores={"UP": 0.7})
+    assert feed(strict, ["UP"] * 2) == []
+    assert feed(strict, ["UP"] * 2, start=2 * FRAME) == [(3 * FRAME, "UP")]
+    assert feed(engine(), ["UP"] * 2) == [(FRAME, "UP")]
+
+def test_exit_score_above_enter_score_is_rejected():
+    with pytest.raises(ValueError):
+        engine(exit_scores={"DOWN": 0.5})
+
+def test_unknown_labels_count_as_none():
+    assert feed(engine(), ["WAVE"] * 6) == []
+
+def test_reset_forgets_the_window():
+    decisions = engine()
+    feed(decisions, ["RIGHT"])
+    decisions.reset()
+    assert feed(decisions, ["RIGHT"], start=FRAME) == []
@@ -0,0 +1,61 @@
+from panorama_prefetch import PanoramaPrefetcher
+from route import Route
+
+def straight_route(points=10):
+    return Route([[0.0001 * i, 0.0] for i in range(points)])
+
+def prefetcher(route=None, lookahead=3, max_in_flight=2):
+    prefetch = PanoramaPrefetcher(lookahead=lookahead, max_in_flight=max_in_flight)
+    prefetch.reset(route or straight_route())
+    return prefetch
+
+def test_nothing_wanted_without_a_route():
+    assert PanoramaPrefetcher(lookahead=3, max_in_flight=2).wanted(0) == []
+
+def test_wants_nearest_points_ahead_within_the_in_flight_limit():
+    prefetch = prefetcher()
+    assert prefetch.wanted(0) == [1, 2]
+    assert prefetch.wanted(0) == []  # Both still in flight
+    assert prefetch.on_resolved(prefetch.generation, 1, "p1") == [3]
+    assert prefetch.stats["requested"] == 3
+
+def test_looks_behind_when_walking_backward():
+    prefetch = prefetcher(max_in_flight=5)
+    assert prefetch.wanted(5, backward=True) == [4, 3, 2]
+    assert prefetcher(max_in_flight=5).wanted(1, backward=True) == [0]
+
+def test_stops_at_the_end_of_the_route():
+    assert prefetcher(max_in_flight=5).wanted(8) == [9]
+
+def test_skips_resolved_and_failed_points():
+    prefetch = prefetcher(max_in_flight=1)
+    assert prefetch.wanted(0) == [1]
+    assert prefetch.on_resolved(prefetch.generation, 1, None) == [2]
+    assert prefetch.stats["failed"] == 1
+    assert prefetch.on_resolved(prefetch.generation, 2, "p2") == [3]
+    assert prefetch.wanted(0) == []
+    assert prefetch.lookup(2) == "p2"
+    assert prefetch.lookup(1) is None
+    assert prefetch.summary()["hit_rate"] == 0.5
+
+def test_results_for_an_old_route_are_ignored():
+    prefetch = prefetcher()
+    prefetch.wanted(0)
+    old_generation = prefetch.generation
+    new_route = straight_route()
+    prefetch.reset(new_route)
+    assert prefetch.on_resolved(old_generation, 1, "old") == []
+    assert prefetch.stats["stale"] == 1
+    assert new_route.pano_ids[1] is None
+    assert prefetch.wanted(0) == [1, 2]  # The new route's in-flight set starts empty
+
+def test_next_pano_follows_the_direction_of_travel():
+    route = straight_route()
+    route.pano_ids[3], route.pano_ids[5] = "p3", "p5"
+    prefetch = prefetcher(route)
+    prefetch.wanted(4)
+    assert prefetch.next_pano() == "p5"
+    prefetch.wanted(4, backward=True)
+    assert prefetch.next_pano() == "p3"
+    prefetch.wanted(9)
+    assert prefetch.next_pano() is None
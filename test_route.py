@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from route import Route, drop_duplicates, haversine_m, initial_heading, resample
+
+# About 111 m per 0.001 degree of latitude
+NORTH = [[0.0, 0.0], [0.001, 0.0], [0.003, 0.0]]
+L_SHAPE = [[0.0, 0.0], [0.001, 0.0], [0.001, 0.002]]
+
+def spacings(points):
+    points = np.asarray(points)
+    return haversine_m(points[:-1, 0], points[:-1, 1], points[1:, 0], points[1:, 1])
+
+def test_haversine_and_heading():
+    assert haversine_m(0.0, 0.0, 1.0, 0.0) == pytest.approx(111195, rel=1e-3)
+    assert initial_heading(0.0, 0.0, 1.0, 0.0) == pytest.approx(0.0)
+    assert initial_heading(0.0, 0.0, 0.0, 1.0) == pytest.approx(90.0)
+    assert initial_heading(0.0, 0.0, 0.0, -1.0) == pytest.approx(-90.0)
+    assert initial_heading(1.0, 0.0, 0.0, 0.0) == pytest.approx(-180.0)
+
+def test_drop_duplicates_keeps_the_first_of_a_run():
+    points = [[0.0, 0.0], [0.0, 0.000001], [0.001, 0.0], [0.001, 0.0], [0.002, 0.0]]
+    assert drop_duplicates(points).tolist() == [[0.0, 0.0], [0.001, 0.0], [0.002, 0.0]]
+
+@pytest.mark.parametrize("points", [NORTH, L_SHAPE])
+@pytest.mark.parametrize("spacing", [10.0, 25.0, 40.0])
+def test_resample_spaces_points_evenly(points, spacing):
+    resampled = resample(points, spacing)
+    steps = spacings(resampled)
+    assert resampled[0].tolist() == points[0]
+    assert resampled[-1] == pytest.approx(points[-1])
+    assert steps.max() <= spacing + 1e-6
+    # Even along the path: on a straight route every step is the same length
+    if points is NORTH:
+        assert steps == pytest.approx(np.full(len(steps), steps[0]), rel=1e-6)
+    # Corners cut a little, so the total length stays close to the route's
+    assert steps.sum() == pytest.approx(Route(points).length, rel=0.02)
+
+def test_resample_evens_out_clusters_and_gaps():
+    clustered = [[0.0, 0.0], [0.0001, 0.0], [0.00015, 0.0], [0.0002, 0.0], [0.002, 0.0]]
+    steps = spacings(resample(clustered, 20.0))
+    assert steps == pytest.approx(np.full(len(steps), steps[0]), rel=1e-6)
+    # As few points as the spacing allows: 222 m in 12 steps of 18.5 m
+    assert len(steps) == int(np.ceil(Route(clustered).length / 20.0))
+    assert steps[0] <= 20.0
+
+def test_resample_of_a_single_point():
+    assert resample([[1.0, 2.0], [1.0, 2.0]], 10.0).tolist() == [[1.0, 2.0]]
+
+def test_route_distances_and_progress():
+    route = Route(NORTH)
+    assert len(route) == 3
+    assert route.segment_lengths == pytest.approx([111.2, 222.4], rel=1e-3)
+    assert route.cumulative[0] == 0.0
+    assert route.length == pytest.approx(route.segment_lengths.sum())
+    assert route.progress(0) == 0.0
+    assert route.progress(1) == pytest.approx(1 / 3)
+    assert route.progress(2) == 1.0
+    assert route.remaining(1) == pytest.approx(route.segment_lengths[1])
+
+def test_route_headings_forward_and_backward():
+    route = Route(L_SHAPE)
+    assert route.heading(0) == pytest.approx(0.0)
+    assert route.heading(1) == pytest.approx(90.0)
+    assert route.heading(2) == pytest.approx(90.0)  # The last point keeps its segment's heading
+    assert route.heading(0, backward=True) == pytest.approx(-180.0)
+    assert route.heading(2, backward=True) == pytest.approx(-90.0)
+    assert route.position(2) == (0.001, 0.002)
+
+def test_single_point_route():
+    route = Route([[1.0, 2.0]])
+    assert route.length == 0.0
+    assert route.heading(0) is None
+    assert route.progress(0) == 1.0
+
+def test_from_json():
+    assert Route.from_json("[[0, 0], [0.001, 0]]").points.tolist() == [[0.0, 0.0], [0.001, 0.0]]
+
+def test_merged_by_panorama_keeps_the_first_point_of_each_run():
+    route = Route([[0.0, 0.0], [0.0001, 0.0], [0.0002, 0.0], [0.0003, 0.0], [0.0004, 0.0], [0.0005, 0.0]])
+    merged, kept = route.merged_by_panorama(["a", "a", "b", None, None, "b"])
+    assert kept.tolist() == [0, 2, 3, 4, 5]
+    assert merged.pano_ids == ["a", "b", None, None, "b"]
+    assert merged.points.tolist() == route.points[kept].tolist()
+    assert merged.length == pytest.approx(route.length)
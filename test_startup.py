@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+import startup
+from startup import StartupTimer
+
+class Clock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(startup, "time", SimpleNamespace(monotonic=clock, time=time.time))
+    return clock
+
+@pytest.fixture
+def timer(clock):
+    return StartupTimer()
+
+def test_phases_are_timed_from_creation(timer, clock):
+    clock.now += 0.1
+    with timer.phase("window"):
+        clock.now += 0.25
+    report = timer.report()
+    assert report["phases"]["window"]["start_ms"] == pytest.approx(100.0)
+    assert report["phases"]["window"]["duration_ms"] == pytest.approx(250.0)
+    assert report["total_ms"] == pytest.approx(350.0)
+
+def test_complete_once_every_expected_phase_ends(timer):
+    timer.expect("window", "mediapipe")
+    timer.begin("window")
+    timer.begin("mediapipe")
+    timer.end("window")
+    assert not timer.complete()
+    timer.end("mediapipe")
+    assert timer.complete()
+    assert not timer.complete()  # Only the first call reports completion
+
+def test_end_without_begin_and_double_end(timer, clock):
+    clock.now += 1.0
+    timer.end("maps")
+    assert timer.phases["maps"] == [0.0, pytest.approx(1.0)]
+    clock.now += 1.0
+    timer.end("maps")
+    assert timer.phases["maps"][1] == pytest.approx(1.0)
+
+def test_phase_ends_even_when_it_raises(timer):
+    with pytest.raises(RuntimeError):
+        with timer.phase("camera"):
+            raise RuntimeError("no camera")
+    assert timer.phases["camera"][1] is not None
+
+def test_report_orders_by_start_and_shows_running_phases(timer, clock):
+    clock.now += 0.2
+    timer.begin("late")
+    clock.now -= 0.1
+    timer.begin("early")
+    timer.end("early")
+    report = timer.report()
+    assert list(report["phases"]) == ["early", "late"]
+    assert report["phases"]["late"]["end_ms"] is None
+    lines = timer.lines(report)
+    assert lines[0] == "Startup took 100 ms"
+    assert lines[2].strip().endswith("(running)")
+
+def test_phases_from_several_threads(timer):
+    timer.expect(*(f"worker{i}" for i in range(8)))
+    threads = [threading.Thread(target=lambda i=i: timer.end(f"worker{i}")) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert timer.complete()
+
+def test_save_appends_one_json_line_per_launch(timer, tmp_path):
+    path = tmp_path / "startup.jsonl"
+    with timer.phase("window"):
+        pass
+    timer.save(str(path))
+    timer.save(str(path))
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert "window" in json.loads(lines[0])["phases"]
@@ -0,0 +1,93 @@
+import ast
+import json
+import os
+import shutil
+import subprocess
+import pytest
+
+NODE = shutil.which("node") or shutil.which("nodejs")
+pytestmark = pytest.mark.skipif(NODE is None, reason="needs node to run the page's nav controller")
+
+def nav_controller_js():
+    # Read the constant from the source, so the test doesn't need QtWebEngine to import street_view
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "street_view.py")) as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "NAV_CONTROLLER_JS" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise AssertionError("NAV_CONTROLLER_JS not found in street_view.py")
+
+# A panorama that records setPov calls and a requestAnimationFrame driven one 60 Hz frame at a time
+HARNESS = """
+let frameTime = 0;
+let callbacks = [];
+let maxLoops = 0;
+function requestAnimationFrame(callback) {
+    callbacks.push(callback);
+    maxLoops = Math.max(maxLoops, callbacks.length);
+    return callbacks.length;
+}
+function frames(count) {
+    for (let i = 0; i < count && callbacks.length; i++) {
+        frameTime += 16.7;
+        const due = callbacks;
+        callbacks = [];
+        due.forEach(callback => callback(frameTime));
+    }
+}
+let panorama = {
+    pov: {heading: 0, pitch: 0},
+    setPovCalls: 0,
+    getPov: function() { return {heading: this.pov.heading, pitch: this.pov.pitch}; },
+    setPov: function(pov) { this.pov = {heading: pov.heading, pitch: pov.pitch}; this.setPovCalls++; }
+};
+"""
+
+def run_nav(script):
+    """Run script after the nav controller and harness, and return what it prints as JSON"""
+    source = nav_controller_js() + HARNESS + script
+    result = subprocess.run([NODE, "-e", source], capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout)
+
+def test_rapid_turns_share_one_animation_loop_and_reach_the_sum():
+    result = run_nav("""
+        for (let i = 0; i < 5; i++) { nav.rotate(10, Date.now()); frames(2); }
+        frames(200);
+        console.log(JSON.stringify({heading: panorama.pov.heading, calls: panorama.setPovCalls,
+                                    loops: maxLoops, idle: nav.animationFrame === null}));
+    """)
+    assert result["heading"] == pytest.approx(50.0)
+    assert result["loops"] == 1
+    assert result["idle"]
+    assert result["calls"] < 50  # The old per-gesture loops made ten setPov calls per command
+
+def test_turns_wrap_through_north():
+    result = run_nav("""
+        panorama.pov.heading = 350;
+        nav.rotate(20, Date.now());
+        frames(200);
+        console.log(JSON.stringify({heading: panorama.pov.heading}));
+    """)
+    assert result["heading"] == pytest.approx(10.0)
+
+def test_target_lead_is_bounded():
+    result = run_nav("""
+        nav.maxLead = 45;
+        for (let i = 0; i < 10; i++) nav.rotate(10, Date.now());
+        const target = nav.targetPov.heading;
+        for (let i = 0; i < 20; i++) nav.pitch(10, Date.now());
+        console.log(JSON.stringify({heading: target, pitch: nav.targetPov.pitch}));
+    """)
+    assert result["heading"] == pytest.approx(45.0)
+    assert result["pitch"] == pytest.approx(45.0)
+
+def test_stale_commands_are_dropped():
+    result = run_nav("""
+        nav.maxCommandAge = 300;
+        nav.rotate(10, Date.now() - 1000);
+        frames(50);
+        console.log(JSON.stringify({dropped: nav.droppedCommands, heading: panorama.pov.heading,
+                                    calls: panorama.setPovCalls}));
+    """)
+    assert result == {"dropped": 1, "heading": 0, "calls": 0}
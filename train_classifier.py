@@ -0,0 +1,95 @@
+"""Train a gesture classifier from labelled recording sessions.
+
+    python replay.py record sessions/forward --label FORWARD --seconds 10
+    python train_classifier.py sessions/* --output models/gestures.npz
+
+Then set GESTURE_CLASSIFIER_PATH in config.py to the saved model.
+"""
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from gesture_features import GESTURES
+from gesture_classifier import NearestCentroidClassifier, RuleClassifier, confusion_matrix
+from recording import Recording
+
+def load_sessions(paths):
+    """Stack the labelled hands from every session: (N, 21, 3) landmarks and (N,) label indices"""
+    points, labels = [], []
+    for path in paths:
+        recording = Recording(path)
+        usable = recording.has_hand & (recording.labels >= 0)
+        points.append(np.asarray(recording.landmarks[usable]))
+        labels.append(np.asarray(recording.labels[usable], dtype=np.int64))
+    if not points:
+        return np.empty((0, 21, 3), dtype=np.float32), np.empty(0, dtype=np.int64)
+    return np.concatenate(points), np.concatenate(labels)
+
+def split_holdout(count, fraction, seed=0):
+    """Shuffled train and holdout index arrays"""
+    order = np.random.default_rng(seed).permutation(count)
+    holdout = int(round(count * fraction))
+    return order[holdout:], order[:holdout]
+
+def evaluate(classifier, points, labels):
+    predicted_names = classifier.predict_batch(points)
+    predicted = np.argmax(predicted_names[:, np.newaxis] == GESTURES[np.newaxis, :], axis=1)
+    matrix = confusion_matrix(labels, predicted)
+    return {
+        "count": int(len(labels)),
+        "accuracy": float(np.mean(predicted == labels)) if len(labels) else None,
+        "confusion": {str(GESTURES[i]): {str(GESTURES[j]): int(matrix[i, j]) for j in range(len(GESTURES))}
+                      for i in range(len(GESTURES)) if matrix[i].any()},
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", nargs="+", help="Session directories written by replay.py record")
+    parser.add_argument("--output", required=True, help="Where to save the model (.npz)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of hands kept back for evaluation")
+    parser.add_argument("--reject-quantile", type=float, default=0.99,
+                        help="Hands farther from every centroid than this quantile of training hands are NONE")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Threshold for the rule baseline")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    points, labels = load_sessions(args.sessions)
+    if len(labels) == 0:
+        print("No labelled frames with a detected hand in the given sessions")
+        return 1
+    train, holdout = split_holdout(len(labels), args.holdout)
+    if len(holdout) == 0:
+        holdout = train
+
+    classifier = NearestCentroidClassifier().fit(points[train], GESTURES[labels[train]], args.reject_quantile)
+    report = {
+        "train": int(len(train)),
+        "classes": [str(name) for name in classifier.labels],
+        "reject_distance": classifier.reject_distance,
+        "holdout": evaluate(classifier, points[holdout], labels[holdout]),
+        "rules": evaluate(RuleClassifier(args.threshold), points[holdout], labels[holdout]),
+    }
+
+    # Refit on everything before saving; the holdout numbers above are the estimate
+    classifier.fit(points, GESTURES[labels], args.reject_quantile)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    classifier.save(args.output)
+    report["output"] = args.output
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"Trained on {report['train']} hands, classes: {', '.join(report['classes'])}")
+    print(f"Reject distance: {report['reject_distance']:.3f}")
+    for name in ("holdout", "rules"):
+        result = report[name]
+        title = "nearest centroid" if name == "holdout" else "threshold rules"
+        print(f"{title:<18} accuracy {result['accuracy'] * 100:6.2f}% on {result['count']} holdout hands")
+        for truth, row in result["confusion"].items():
+            print(f"  {truth:<9}" + "  ".join(f"{predicted}={count}" for predicted, count in row.items() if count))
+    print(f"Saved {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import os
+import threading
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile, QWebEnginePage
+from config import WEB_PROFILE_NAME, WEB_CACHE_DIR, WEB_CACHE_MAX_MB
+
+_shared_profile = None
+
+def shared_profile():
+    """The one persistent profile both web views use, created on first call.
+
+    Its HTTP cache is on disk, so the Maps API, tiles and panorama imagery
+    fetched by either view are reused by the other and by the next launch.
+    With WEB_PROFILE_NAME set to None this is Qt's off-the-record default profile.
+    """
+    global _shared_profile
+    if _shared_profile is not None:
+        return _shared_profile
+    if not WEB_PROFILE_NAME:
+        _shared_profile = QWebEngineProfile.defaultProfile()
+        return _shared_profile
+
+    profile = QWebEngineProfile(WEB_PROFILE_NAME, QApplication.instance())  # Outlives every page using it
+    if WEB_CACHE_DIR:
+        cache_dir = os.path.abspath(WEB_CACHE_DIR)
+        profile.setCachePath(os.path.join(cache_dir, "cache"))
+        profile.setPersistentStoragePath(os.path.join(cache_dir, "storage"))
+    profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+    profile.setHttpCacheMaximumSize(int(WEB_CACHE_MAX_MB * 1024 * 1024))
+    _shared_profile = profile
+    return profile
+
+def use_shared_profile(view):
+    """Give a QWebEngineView a page on the shared profile; call before touching view.page()"""
+    view.setPage(QWebEnginePage(shared_profile(), view))
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass  # Chromium removes cache entries while we walk
+    return total
+
+def cache_summary(profile=None):
+    """Where the HTTP cache lives and its size limit; cheap enough for the GUI thread"""
+    profile = profile or shared_profile()
+    if profile.isOffTheRecord():
+        return {"path": None, "max_mb": None}
+    return {
+        "path": profile.cachePath(),
+        "max_mb": round(profile.httpCacheMaximumSize() / (1024 * 1024), 1) or None,  # 0 lets Chromium choose
+    }
+
+def report_cache_size(path):
+    """Print how much of the HTTP cache is used, from a daemon thread.
+
+    Walking a cache of thousands of files takes long enough to stall the GUI,
+    and the number is only informational, so it is never waited for.
+    """
+    if not path:
+        return
+
+    def report():
+        print(f"Web cache size: {directory_size(path) / (1024 * 1024):.1f} MB")
+
+    threading.Thread(target=report, name="web-cache-size", daemon=True).start()